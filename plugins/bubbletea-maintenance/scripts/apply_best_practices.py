@@ -6,10 +6,11 @@ Validates code against 11 expert tips from tip-bubbltea-apps.md.
 
 import os
 import re
-import json
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 
+from utils.json_output import dumps
+
 
 # Path to tips reference
 TIPS_FILE = Path("/Users/williamvansickleiii/charmtuitemplate/charm-tui-template/tip-bubbltea-apps.md")
@@ -503,4 +504,4 @@ if __name__ == "__main__":
     tips_file = sys.argv[2] if len(sys.argv) > 2 else None
 
     result = apply_best_practices(code_path, tips_file)
-    print(json.dumps(result, indent=2))
+    print(dumps(result))
@@ -5,7 +5,6 @@ Orchestrates all analysis functions for complete health check.
 """
 
 import sys
-import json
 from pathlib import Path
 from typing import Dict, List, Any
 
@@ -17,6 +16,7 @@ from apply_best_practices import apply_best_practices
 from debug_performance import debug_performance
 from suggest_architecture import suggest_architecture
 from fix_layout_issues import fix_layout_issues
+from utils.json_output import dumps
 
 
 def comprehensive_bubbletea_analysis(code_path: str, detail_level: str = "standard") -> Dict[str, Any]:
@@ -427,7 +427,7 @@ if __name__ == "__main__":
 
     # Save to file
     output_file = Path(code_path).parent / "bubbletea_analysis_report.json"
-    with open(output_file, 'w') as f:
-        json.dump(result, f, indent=2)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(dumps(result))
 
     print(f"Full report saved to: {output_file}\n")
@@ -6,18 +6,323 @@ Identifies bottlenecks in Update(), View(), and concurrent operations.
 
 import os
 import re
-import json
+import sys
+import bisect
+import heapq
+from collections import Counter
+from itertools import chain
+from functools import cached_property
+from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Iterator, Sequence
 
+from utils.analysis_cache import FileResultCache, cache_enabled, source_fingerprint
+from utils.go_files import MAX_GO_FILE_SIZE, collect_go_files
+from utils.go_scan import line_index, newline_offsets
+from utils.json_output import dumps
 
-def debug_performance(code_path: str, profile_data: str = "") -> Dict[str, Any]:
+
+# Below this many files, worker start-up costs more than it saves.
+_PARALLEL_MIN_FILES = 32
+
+# Files at least this large (typically generated code) are not split into a
+# list of lines up front; each line is sliced from the content when used.
+_LINE_VIEW_MIN_SIZE = 256 * 1024
+
+_SEVERITY_ORDER = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
+
+# Bottleneck fields that repeat across findings; interned so every record
+# with the same value shares one string object.
+_SHARED_FIELDS = ("severity", "category", "issue", "time_impact", "explanation", "fix_key")
+
+
+class _Bottleneck:
+    """
+    One finding, held in slots rather than a dict while findings are
+    collected, cached and sorted. _render_bottleneck turns it into the
+    dict returned to callers.
+    """
+
+    __slots__ = ("severity", "severity_rank", "category", "issue", "location",
+                 "time_impact", "explanation", "fix_key", "fix_params")
+
+    def __init__(self, severity: str, category: str, issue: str, location: str,
+                 time_impact: str, explanation: str, fix_key: str,
+                 fix_params: Optional[Dict[str, str]] = None):
+        self.severity = severity
+        self.severity_rank = _SEVERITY_ORDER.get(severity, 999)
+        self.category = category
+        self.issue = issue
+        self.location = location
+        self.time_impact = time_impact
+        self.explanation = explanation
+        self.fix_key = fix_key
+        self.fix_params = fix_params
+
+
+# Patterns are compiled once at import time; the checks below run them for
+# every line of every file, so avoiding the per-call cache lookup matters.
+# All regex and substring checks operate on bytes: Go source is scanned as
+# read from disk, with no decode pass.
+_RE_METHOD_DECL = re.compile(rb'func\s+\([^)]+\)\s+(\w+)\s*\(')
+_RE_FOR_RANGE = re.compile(rb'for[^\S\n]+.*range')
+_RE_STRING_CONCAT = re.compile(rb'(\w+\s*\+\s*"[^"]*"\s*\+\s*\w+|\w+\s*\+=\s*"[^"]*")')
+_RE_FILE_IO_VIEW = re.compile(rb'\b(os\.ReadFile|ioutil\.ReadFile|os\.Open)')
+_RE_GO_FUNC = re.compile(rb'\bgo\s+func')
+_RE_CMD_SIG = re.compile(rb'func\s+\w+\(\s*\)\s+tea\.Msg')
+_RE_UPDATE_SIG = re.compile(rb'func\s+\([^)]+\)\s+Update')
+_RE_VIEW_SIG = re.compile(rb'func\s+\([^)]+\)\s+View')
+
+# All blocking calls are found in one scan; the named group that matched
+# identifies the operation.
+_RE_BLOCKING = re.compile(
+    rb'(?P<http>\bhttp\.(?:Get|Post|Do)\s*\()'
+    rb'|(?P<sleep>\btime\.Sleep\s*\()'
+    rb'|(?P<file_io>\bos\.(?:Open|Read|Write))'
+    rb'|(?P<read_all>\bio\.ReadAll\s*\()'
+    rb'|(?P<command>\bexec\.Command\([^)]+\)\.Run\(\))'
+    rb'|(?P<database>\bdb\.(?:Query|Exec))'
+)
+
+_BLOCKING_OPERATIONS = {
+    "http": ("HTTP request", "CRITICAL"),
+    "sleep": ("Sleep call", "CRITICAL"),
+    "file_io": ("File I/O", "CRITICAL"),
+    "read_all": ("ReadAll", "CRITICAL"),
+    "command": ("Command execution", "CRITICAL"),
+    "database": ("Database operation", "CRITICAL"),
+}
+
+# Loop bodies are measured by balancing braces after the header rather than
+# with a DOTALL regex, which backtracked across the whole Update() body.
+_RE_LOOP_HEADER = re.compile(rb'\bfor[^\S\n]+[^\n]*?\brange\s+\w+\s*\{')
+_RE_BRACE = re.compile(rb'[{}]')
+_LARGE_LOOP_BODY = 100
+
+_COMPUTATION_PATTERNS = [
+    (re.compile(rb'json\.(Marshal|Unmarshal)'), "JSON processing", "MEDIUM"),
+    (re.compile(rb'regexp\.MustCompile\s*\('), "Regex compilation", "HIGH"),
+]
+
+_FILE_OPS = [
+    (re.compile(rb'os\.ReadFile'), b'os.ReadFile', "os.ReadFile"),
+    (re.compile(rb'ioutil\.ReadFile'), b'ioutil.ReadFile', "ioutil.ReadFile"),
+    (re.compile(rb'os\.Open'), b'os.Open', "os.Open"),
+    (re.compile(rb'io\.ReadAll'), b'io.ReadAll', "io.ReadAll"),
+]
+
+
+# Fix text and code example for each kind of bottleneck, keyed by "fix_key".
+# Bottlenecks carry only the key (plus any "fix_params") while they are
+# collected, sorted and cached; the text is filled in by _render_bottleneck.
+_FIX_TEMPLATES: Dict[str, Tuple[str, str]] = {
+    "blocking_call": (
+        "Move to tea.Cmd goroutine:\n\n" +
+        "func fetch{cmd_name}() tea.Msg {{\n" +
+        "    // Runs in background, doesn't block\n" +
+        "    result, err := /* your {operation} */\n" +
+        "    return resultMsg{{data: result, err: err}}\n" +
+        "}}\n\n" +
+        "// In Update():\n" +
+        "case tea.KeyMsg:\n" +
+        "    if key.String() == \"r\" {{\n" +
+        "        return m, fetch{cmd_name}  // Non-blocking\n" +
+        "    }}",
+        "return m, fetch{cmd_name}"
+    ),
+    "heavy_computation": (
+        "Optimize:\n" +
+        "- Cache compiled regexes (compile once, reuse)\n" +
+        "- Move heavy processing to tea.Cmd\n" +
+        "- Use incremental updates instead of full recalculation",
+        "var cachedRegex = regexp.MustCompile(`pattern`)  // Outside Update()"
+    ),
+    "view_string_concat": (
+        "Replace with strings.Builder:\n\n" +
+        "import \"strings\"\n\n" +
+        "func (m model) View() string {\n" +
+        "    var b strings.Builder\n" +
+        "    b.WriteString(\"header\")\n" +
+        "    b.WriteString(m.content)\n" +
+        "    b.WriteString(\"footer\")\n" +
+        "    return b.String()\n" +
+        "}",
+        "var b strings.Builder; b.WriteString(...)"
+    ),
+    "view_style_creation": (
+        "Cache styles in model:\n\n" +
+        "type model struct {\n" +
+        "    // ... other fields\n" +
+        "    headerStyle lipgloss.Style\n" +
+        "    contentStyle lipgloss.Style\n" +
+        "}\n\n" +
+        "func initialModel() model {\n" +
+        "    return model{\n" +
+        "        headerStyle: lipgloss.NewStyle().Bold(true).Foreground(lipgloss.Color(\"#FF00FF\")),\n" +
+        "        contentStyle: lipgloss.NewStyle().Padding(1),\n" +
+        "    }\n" +
+        "}\n\n" +
+        "func (m model) View() string {\n" +
+        "    return m.headerStyle.Render(\"Header\") + m.contentStyle.Render(m.content)\n" +
+        "}",
+        "m.headerStyle.Render(...)  // Use cached style"
+    ),
+    "view_file_io": (
+        "Load file in Update(), cache in model:\n\n" +
+        "type model struct {\n" +
+        "    fileContent string\n" +
+        "}\n\n" +
+        "func loadFile() tea.Msg {\n" +
+        "    content, err := os.ReadFile(\"file.txt\")\n" +
+        "    return fileLoadedMsg{content: string(content), err: err}\n" +
+        "}\n\n" +
+        "// In Update():\n" +
+        "case fileLoadedMsg:\n" +
+        "    m.fileContent = msg.content\n\n" +
+        "// In View():\n" +
+        "return m.fileContent  // Just return cached data",
+        "return m.cachedContent  // No I/O in View()"
+    ),
+    "view_join_vertical": (
+        "Batch related joins:\n\n" +
+        "// Instead of many small joins:\n" +
+        "// line1 := lipgloss.JoinHorizontal(...)\n" +
+        "// line2 := lipgloss.JoinHorizontal(...)\n" +
+        "// ...\n\n" +
+        "// Build all lines first, join once:\n" +
+        "lines := []string{\n" +
+        "    lipgloss.JoinHorizontal(...),\n" +
+        "    lipgloss.JoinHorizontal(...),\n" +
+        "    lipgloss.JoinHorizontal(...),\n" +
+        "}\n" +
+        "return lipgloss.JoinVertical(lipgloss.Left, lines...)",
+        "lipgloss.JoinVertical(lipgloss.Left, lines...)"
+    ),
+    "sprintf_in_loop": (
+        "Use strings.Builder:\n\n" +
+        "var b strings.Builder\n" +
+        "for _, item := range items {\n" +
+        "    fmt.Fprintf(&b, \"Item: %s\\n\", item)\n" +
+        "}\n" +
+        "result := b.String()",
+        "fmt.Fprintf(&builder, ...)"
+    ),
+    "regex_in_function": (
+        "Move to package level:\n\n" +
+        "// At package level (outside functions)\n" +
+        "var (\n" +
+        "    emailRegex = regexp.MustCompile(`^[a-z]+@[a-z]+\\.[a-z]+$`)\n" +
+        "    phoneRegex = regexp.MustCompile(`^\\d{3}-\\d{3}-\\d{4}$`)\n" +
+        ")\n\n" +
+        "// In function\n" +
+        "func validate(email string) bool {\n" +
+        "    return emailRegex.MatchString(email)  // Reuse compiled regex\n" +
+        "}",
+        "var emailRegex = regexp.MustCompile(...)  // Package level"
+    ),
+    "nested_loops": (
+        "Optimization strategies:\n" +
+        "1. Use map/set for O(1) lookups instead of nested loop\n" +
+        "2. Break early when possible\n" +
+        "3. Process data once, cache results\n" +
+        "4. Use channels/goroutines for parallel processing\n\n" +
+        "Example with map:\n" +
+        "// Instead of:\n" +
+        "for _, a := range listA {\n" +
+        "    for _, b := range listB {\n" +
+        "        if a.id == b.id { found = true }\n" +
+        "    }\n" +
+        "}\n\n" +
+        "// Use map:\n" +
+        "mapB := make(map[string]bool)\n" +
+        "for _, b := range listB {\n" +
+        "    mapB[b.id] = true\n" +
+        "}\n" +
+        "for _, a := range listA {\n" +
+        "    if mapB[a.id] { found = true }\n" +
+        "}",
+        "Use map for O(1) lookup"
+    ),
+    "append_without_prealloc": (
+        "Pre-allocate slice:\n\n" +
+        "// Instead of:\n" +
+        "var results []string\n" +
+        "for _, item := range items {\n" +
+        "    results = append(results, process(item))\n" +
+        "}\n\n" +
+        "// Pre-allocate:\n" +
+        "results := make([]string, 0, len(items))  // Pre-allocate capacity\n" +
+        "for _, item := range items {\n" +
+        "    results = append(results, process(item))  // No reallocation\n" +
+        "}",
+        "results := make([]string, 0, len(items))"
+    ),
+    "goroutine_lifecycle": (
+        "Use context for cancellation:\n\n" +
+        "type model struct {\n" +
+        "    ctx    context.Context\n" +
+        "    cancel context.CancelFunc\n" +
+        "}\n\n" +
+        "func initialModel() model {\n" +
+        "    ctx, cancel := context.WithCancel(context.Background())\n" +
+        "    return model{ctx: ctx, cancel: cancel}\n" +
+        "}\n\n" +
+        "func worker(ctx context.Context) tea.Msg {\n" +
+        "    for {\n" +
+        "        select {\n" +
+        "        case <-ctx.Done():\n" +
+        "            return nil  // Stop goroutine\n" +
+        "        case <-time.After(time.Second):\n" +
+        "            // Do work\n" +
+        "        }\n" +
+        "    }\n" +
+        "}\n\n" +
+        "// In Update() on quit:\n" +
+        "m.cancel()  // Stops all goroutines",
+        "ctx, cancel := context.WithCancel(context.Background())"
+    ),
+    "sync_io": (
+        "Move to tea.Cmd:\n\n" +
+        "func loadFileCmd() tea.Msg {{\n" +
+        "    data, err := {op_name}(\"file.txt\")\n" +
+        "    return fileLoadedMsg{{data: data, err: err}}\n" +
+        "}}\n\n" +
+        "// In Update():\n" +
+        "case tea.KeyMsg:\n" +
+        "    if key.String() == \"o\" {{\n" +
+        "        return m, loadFileCmd  // Non-blocking\n" +
+        "    }}",
+        "return m, loadFileCmd  // Async I/O"
+    ),
+}
+
+# Names of the checks validate_performance_debug reports, in order
+_VALIDATION_CHECKS = ("Has bottlenecks list", "Has metrics", "Has recommendations")
+
+
+def debug_performance(code_path: str, profile_data: str = "",
+                      use_cache: bool = True,
+                      max_bottlenecks: Optional[int] = None,
+                      include_generated: bool = False,
+                      max_file_size: Optional[int] = MAX_GO_FILE_SIZE,
+                      exclude: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Identify performance bottlenecks in Bubble Tea application.
 
     Args:
         code_path: Path to Go file or directory
         profile_data: Optional profiling data (pprof output, benchmark results)
+        use_cache: Reuse results for files unchanged since the last run
+        max_bottlenecks: Keep only this many of the most severe bottlenecks;
+            the summary, metrics and recommendations describe those kept
+        include_generated: Also analyze tests, generated code (*.pb.go etc.),
+            third_party/ and testdata/ when walking a directory
+        max_file_size: Skip files larger than this many bytes when walking
+            a directory (None for no limit)
+        exclude: Glob patterns for files to skip when walking a directory,
+            matched against paths relative to code_path
 
     Returns:
         Dictionary containing:
@@ -35,12 +340,9 @@ def debug_performance(code_path: str, profile_data: str = "") -> Dict[str, Any]:
         }
 
     # Collect all .go files
-    go_files = []
-    if path.is_file():
-        if path.suffix == '.go':
-            go_files = [path]
-    else:
-        go_files = list(path.glob('**/*.go'))
+    skipped = {}
+    go_files = collect_go_files(path, include_generated, max_file_size,
+                                exclude or (), skipped)
 
     if not go_files:
         return {
@@ -48,25 +350,27 @@ def debug_performance(code_path: str, profile_data: str = "") -> Dict[str, Any]:
             "validation": {"status": "error", "summary": "No Go files"}
         }
 
-    # Analyze performance for each file
-    all_bottlenecks = []
-    for go_file in go_files:
-        bottlenecks = _analyze_performance(go_file)
-        all_bottlenecks.extend(bottlenecks)
-
-    # Sort by severity
-    severity_order = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
-    all_bottlenecks.sort(key=lambda x: severity_order.get(x['severity'], 999))
+    # Analyze performance for each file, then sort by severity
+    findings = chain.from_iterable(_analyze_files(go_files, use_cache))
+    if max_bottlenecks is not None:
+        all_bottlenecks = heapq.nsmallest(max_bottlenecks, findings, key=attrgetter('severity_rank'))
+    else:
+        all_bottlenecks = sorted(findings, key=attrgetter('severity_rank'))
 
     # Generate recommendations
     recommendations = _generate_performance_recommendations(all_bottlenecks)
 
     # Estimate metrics
-    metrics = _estimate_metrics(all_bottlenecks, go_files)
+    metrics = _estimate_metrics(all_bottlenecks, go_files, skipped)
 
-    # Summary
-    critical_count = sum(1 for b in all_bottlenecks if b['severity'] == 'CRITICAL')
-    high_count = sum(1 for b in all_bottlenecks if b['severity'] == 'HIGH')
+    # Summary: tally severities and categories in one pass
+    severity_counts = Counter()
+    categories = set()
+    for b in all_bottlenecks:
+        severity_counts[b.severity] += 1
+        categories.add(b.category)
+    critical_count = severity_counts['CRITICAL']
+    high_count = severity_counts['HIGH']
 
     if critical_count > 0:
         summary = f"⚠️  Found {critical_count} critical performance issue(s)"
@@ -84,13 +388,13 @@ def debug_performance(code_path: str, profile_data: str = "") -> Dict[str, Any]:
         "checks": {
             "fast_update": critical_count == 0,
             "fast_view": high_count == 0,
-            "no_memory_leaks": not any(b['category'] == 'memory' for b in all_bottlenecks),
-            "efficient_rendering": not any(b['category'] == 'rendering' for b in all_bottlenecks)
+            "no_memory_leaks": 'memory' not in categories,
+            "efficient_rendering": 'rendering' not in categories
         }
     }
 
     return {
-        "bottlenecks": all_bottlenecks,
+        "bottlenecks": [_render_bottleneck(b) for b in all_bottlenecks],
         "metrics": metrics,
         "recommendations": recommendations,
         "summary": summary,
@@ -99,524 +403,589 @@ def debug_performance(code_path: str, profile_data: str = "") -> Dict[str, Any]:
     }
 
 
-def _analyze_performance(file_path: Path) -> List[Dict[str, Any]]:
-    """Analyze a single Go file for performance issues."""
-    bottlenecks = []
+def _analyze_files(go_files: List[Path], use_cache: bool = True) -> List[List[_Bottleneck]]:
+    """
+    Analyze every file, in worker processes when there are enough of them.
 
+    Files whose path, mtime and size match the on-disk cache are not re-read.
+    Each remaining file is independent and the checks are CPU-bound, so large
+    trees are spread across processes. Falls back to a serial loop if a pool
+    cannot be started (e.g. no semaphore support in the sandbox).
+    """
+    cache = None
+    if use_cache and cache_enabled():
+        cache = FileResultCache("perf", source_fingerprint(__file__))
+
+    results: List[Optional[List[_Bottleneck]]] = [None] * len(go_files)
+    pending = []
+    for i, go_file in enumerate(go_files):
+        if cache is not None:
+            results[i] = cache.get(go_file)
+        if results[i] is None:
+            pending.append(i)
+
+    pending_files = [go_files[i] for i in pending]
+    analyzed = None
+    if len(pending_files) > _PARALLEL_MIN_FILES:
+        try:
+            with ProcessPoolExecutor() as executor:
+                analyzed = list(executor.map(_analyze_performance, pending_files, chunksize=16))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass
+
+    if analyzed is None:
+        analyzed = [_analyze_performance(go_file) for go_file in pending_files]
+
+    for i, bottlenecks in zip(pending, analyzed):
+        results[i] = bottlenecks
+        if cache is not None:
+            cache.put(go_files[i], bottlenecks)
+
+    if cache is not None:
+        cache.save()
+
+    # Records from workers or the cache were unpickled with private copies
+    # of each string; collapse repeats onto one shared object.
+    for bottlenecks in results:
+        for bottleneck in bottlenecks:
+            for field in _SHARED_FIELDS:
+                setattr(bottleneck, field, sys.intern(getattr(bottleneck, field)))
+
+    return results
+
+
+def _analyze_performance(file_path: Path) -> List[_Bottleneck]:
+    """Analyze a single Go file for performance issues."""
     try:
-        content = file_path.read_text()
-    except Exception as e:
+        content = file_path.read_bytes()
+    except OSError:
         return []
 
-    lines = content.split('\n')
+    if len(content) < _LINE_VIEW_MIN_SIZE:
+        lines = content.split(b'\n')
+        index = _FileIndex(content, lines)
+    else:
+        nl_offsets = newline_offsets(content)
+        lines = _LineView(content, nl_offsets)
+        index = _FileIndex(content, lines, nl_offsets)
     rel_path = file_path.name
 
-    # Performance checks
-    bottlenecks.extend(_check_update_performance(content, lines, rel_path))
-    bottlenecks.extend(_check_view_performance(content, lines, rel_path))
-    bottlenecks.extend(_check_string_operations(content, lines, rel_path))
-    bottlenecks.extend(_check_regex_performance(content, lines, rel_path))
-    bottlenecks.extend(_check_loop_efficiency(content, lines, rel_path))
-    bottlenecks.extend(_check_allocation_patterns(content, lines, rel_path))
-    bottlenecks.extend(_check_concurrent_operations(content, lines, rel_path))
-    bottlenecks.extend(_check_io_operations(content, lines, rel_path))
+    # Performance checks, all sharing one set of line indexes. The result is
+    # materialised here because it is pickled back from workers and cached.
+    return [bottleneck for check in _CHECKS
+            for bottleneck in check(content, lines, rel_path, index)]
 
-    return bottlenecks
 
+class _FileIndex:
+    """
+    Line indexes over one file, shared by all checks.
 
-def _check_update_performance(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
-    """Check Update() function for performance issues."""
-    bottlenecks = []
+    Each index is built on first use with a single scan of the content, so a
+    check that needs it never repeats work another check already did, and
+    files that no check needs an index for never pay for it.
+    """
+
+    def __init__(self, content: bytes, lines: Sequence[bytes],
+                 nl_offsets: Optional[List[int]] = None):
+        self.content = content
+        self.lines = lines
+        if nl_offsets is not None:
+            self.nl_offsets = nl_offsets
+
+    @cached_property
+    def nl_offsets(self) -> List[int]:
+        return newline_offsets(self.content)
+
+    @cached_property
+    def functions(self) -> Dict[str, List[Tuple[int, int]]]:
+        return _locate_functions(self.lines)
+
+    @cached_property
+    def for_lines(self) -> List[int]:
+        """Lines containing 'for'."""
+        return _lines_containing(self.content, self.nl_offsets, b'for')
+
+    @cached_property
+    def range_lines(self) -> List[int]:
+        """Lines containing a for ... range loop header."""
+        return [i for i in self.for_lines if _RE_FOR_RANGE.search(self.lines[i])]
+
+
+class _LineView(Sequence):
+    """
+    Read-only sequence of a file's lines, sliced from the content on demand.
+
+    Stands in for the split list of lines on large files: a full split keeps a
+    second copy of every byte alive for the whole analysis, while a view only
+    holds the newline offsets.
+    """
+
+    def __init__(self, content: bytes, nl_offsets: List[int]):
+        self._content = content
+        self._nl_offsets = nl_offsets
+
+    def __len__(self) -> int:
+        return len(self._nl_offsets) + 1
+
+    def __getitem__(self, line):
+        if isinstance(line, slice):
+            return [self[i] for i in range(*line.indices(len(self)))]
+        if line < 0:
+            line += len(self)
+        if not 0 <= line < len(self):
+            raise IndexError("line index out of range")
+        return self._content[_line_start(self._nl_offsets, line):
+                             _line_end(self._nl_offsets, line, len(self._content))]
+
+    def __iter__(self) -> Iterator[bytes]:
+        start = 0
+        for end in self._nl_offsets:
+            yield self._content[start:end]
+            start = end + 1
+        yield self._content[start:]
+
+
+def _line_start(nl_offsets: List[int], line: int) -> int:
+    """Return the offset of the first character of a 0-based line."""
+    return nl_offsets[line - 1] + 1 if line > 0 else 0
+
+
+def _line_end(nl_offsets: List[int], line: int, size: int) -> int:
+    """Return the offset just past the last character of a 0-based line."""
+    return nl_offsets[line] if line < len(nl_offsets) else size
+
+
+def _lines_containing(content: bytes, nl_offsets: List[int], needle: bytes) -> List[int]:
+    """Return the distinct 0-based lines containing needle, in ascending order."""
+    hits = []
+    idx = content.find(needle)
+    while idx >= 0:
+        line = line_index(nl_offsets, idx)
+        hits.append(line)
+        idx = content.find(needle, _line_end(nl_offsets, line, len(content)))
+    return hits
+
+
+def _indent(line: bytes) -> int:
+    """Return the width of a line's leading whitespace."""
+    return len(line) - len(line.lstrip())
+
+
+def _locate_functions(lines: Sequence[bytes]) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Find every method declaration and its extent in a single pass.
 
-    # Find Update() function
-    update_start = -1
-    update_end = -1
+    Returns a mapping of method name to (start_line, end_line) pairs, 0-based
+    and inclusive. A method whose braces never balance runs to the last line.
+    """
+    functions = {}
+    current = None
+    start = -1
     brace_count = 0
 
     for i, line in enumerate(lines):
-        if re.search(r'func\s+\([^)]+\)\s+Update\s*\(', line):
-            update_start = i
-            brace_count = line.count('{') - line.count('}')
-        elif update_start >= 0:
-            brace_count += line.count('{') - line.count('}')
+        match = _RE_METHOD_DECL.search(line) if b'func' in line else None
+        if match:
+            if current is not None:
+                functions.setdefault(current, []).append((start, i - 1))
+            current = match.group(1).decode('utf-8', 'replace')
+            start = i
+            brace_count = line.count(b'{') - line.count(b'}')
+        elif current is not None:
+            brace_count += line.count(b'{') - line.count(b'}')
             if brace_count == 0:
-                update_end = i
-                break
+                functions.setdefault(current, []).append((start, i))
+                current = None
+
+    if current is not None:
+        functions.setdefault(current, []).append((start, len(lines) - 1))
+
+    return functions
+
+
+def _check_update_performance(content: bytes, lines: Sequence[bytes], file_path: str,
+                              index: Optional[_FileIndex] = None) -> Iterator[_Bottleneck]:
+    """Check Update() function for performance issues."""
+    if b'Update' not in content:
+        return
+    if index is None:
+        index = _FileIndex(content, lines)
+    nl_offsets = index.nl_offsets
+
+    for update_start, update_end in index.functions.get('Update', []):
+        # Scan Update() in place; match offsets stay absolute within content
+        code_start = _line_start(nl_offsets, update_start)
+        code_end = _line_end(nl_offsets, update_end, len(content))
+
+        # Check 1: Blocking I/O in Update(), reported grouped by operation
+        blocking = {group: [] for group in _BLOCKING_OPERATIONS}
+        for match in _RE_BLOCKING.finditer(content, code_start, code_end):
+            blocking[match.lastgroup].append(match.start())
+
+        for group, match_starts in blocking.items():
+            operation, severity = _BLOCKING_OPERATIONS[group]
+            for match_start in match_starts:
+                actual_line = line_index(nl_offsets, match_start)
+
+                yield _Bottleneck(
+                    severity=severity,
+                    category="performance",
+                    issue=f"Blocking {operation} in Update()",
+                    location=f"{file_path}:{actual_line+1}",
+                    time_impact="Blocks event loop (16ms+ delay)",
+                    explanation=f"{operation} blocks the event loop, freezing the UI",
+                    fix_key="blocking_call",
+                    fix_params={"cmd_name": operation.replace(' ', ''), "operation": operation.lower()}
+                )
+
+        # Check 2: Heavy computation in Update()
+        computations = [(loop_start, "Large loop", "HIGH")
+                        for loop_start in _find_large_loops(content, code_start, code_end)]
+        for pattern, operation, severity in _COMPUTATION_PATTERNS:
+            computations.extend((match.start(), operation, severity)
+                                for match in pattern.finditer(content, code_start, code_end))
+
+        for match_start, operation, severity in computations:
+            actual_line = line_index(nl_offsets, match_start)
+
+            yield _Bottleneck(
+                severity=severity,
+                category="performance",
+                issue=f"Heavy {operation} in Update()",
+                location=f"{file_path}:{actual_line+1}",
+                time_impact="May exceed 16ms budget",
+                explanation=f"{operation} can be expensive, consider optimizing",
+                fix_key="heavy_computation"
+            )
+
 
-    if update_start < 0:
-        return bottlenecks
-
-    update_lines = lines[update_start:update_end+1] if update_end > 0 else lines[update_start:]
-    update_code = '\n'.join(update_lines)
-
-    # Check 1: Blocking I/O in Update()
-    blocking_patterns = [
-        (r'\bhttp\.(Get|Post|Do)\s*\(', "HTTP request", "CRITICAL"),
-        (r'\btime\.Sleep\s*\(', "Sleep call", "CRITICAL"),
-        (r'\bos\.(Open|Read|Write)', "File I/O", "CRITICAL"),
-        (r'\bio\.ReadAll\s*\(', "ReadAll", "CRITICAL"),
-        (r'\bexec\.Command\([^)]+\)\.Run\(\)', "Command execution", "CRITICAL"),
-        (r'\bdb\.(Query|Exec)', "Database operation", "CRITICAL"),
-    ]
-
-    for pattern, operation, severity in blocking_patterns:
-        matches = re.finditer(pattern, update_code)
-        for match in matches:
-            # Find line number within Update()
-            line_offset = update_code[:match.start()].count('\n')
-            actual_line = update_start + line_offset
-
-            bottlenecks.append({
-                "severity": severity,
-                "category": "performance",
-                "issue": f"Blocking {operation} in Update()",
-                "location": f"{file_path}:{actual_line+1}",
-                "time_impact": "Blocks event loop (16ms+ delay)",
-                "explanation": f"{operation} blocks the event loop, freezing the UI",
-                "fix": f"Move to tea.Cmd goroutine:\n\n" +
-                       f"func fetch{operation.replace(' ', '')}() tea.Msg {{\n" +
-                       f"    // Runs in background, doesn't block\n" +
-                       f"    result, err := /* your {operation.lower()} */\n" +
-                       f"    return resultMsg{{data: result, err: err}}\n" +
-                       f"}}\n\n" +
-                       f"// In Update():\n" +
-                       f"case tea.KeyMsg:\n" +
-                       f"    if key.String() == \"r\" {{\n" +
-                       f"        return m, fetch{operation.replace(' ', '')}  // Non-blocking\n" +
-                       f"    }}",
-                "code_example": f"return m, fetch{operation.replace(' ', '')}"
-            })
-
-    # Check 2: Heavy computation in Update()
-    computation_patterns = [
-        (r'for\s+.*range\s+\w+\s*\{[^}]{100,}\}', "Large loop", "HIGH"),
-        (r'json\.(Marshal|Unmarshal)', "JSON processing", "MEDIUM"),
-        (r'regexp\.MustCompile\s*\(', "Regex compilation", "HIGH"),
-    ]
-
-    for pattern, operation, severity in computation_patterns:
-        matches = re.finditer(pattern, update_code, re.DOTALL)
-        for match in matches:
-            line_offset = update_code[:match.start()].count('\n')
-            actual_line = update_start + line_offset
-
-            bottlenecks.append({
-                "severity": severity,
-                "category": "performance",
-                "issue": f"Heavy {operation} in Update()",
-                "location": f"{file_path}:{actual_line+1}",
-                "time_impact": "May exceed 16ms budget",
-                "explanation": f"{operation} can be expensive, consider optimizing",
-                "fix": "Optimize:\n" +
-                       "- Cache compiled regexes (compile once, reuse)\n" +
-                       "- Move heavy processing to tea.Cmd\n" +
-                       "- Use incremental updates instead of full recalculation",
-                "code_example": "var cachedRegex = regexp.MustCompile(`pattern`)  // Outside Update()"
-            })
-
-    return bottlenecks
-
-
-def _check_view_performance(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+def _find_large_loops(content: bytes, start: int, end: int) -> Iterator[int]:
+    """
+    Yield the offset of each for-range loop in content[start:end] with a large body.
+
+    Braces are paired in one linear pass, so nested blocks count toward the
+    body's size. A loop inside a reported loop is not reported again.
+    """
+    header = _RE_LOOP_HEADER.search(content, start, end)
+    if not header:
+        return
+
+    # Offset of each '{' mapped to the offset of the '}' that balances it
+    closing = {}
+    open_braces = []
+    for brace in _RE_BRACE.finditer(content, start, end):
+        if brace.group() == b'{':
+            open_braces.append(brace.start())
+        elif open_braces:
+            closing[open_braces.pop()] = brace.start()
+
+    while header:
+        body_start = header.end()
+        body_end = closing.get(body_start - 1, -1)
+
+        if body_end - body_start >= _LARGE_LOOP_BODY:
+            yield header.start()
+            header = _RE_LOOP_HEADER.search(content, body_end + 1, end)
+        else:
+            header = _RE_LOOP_HEADER.search(content, body_start, end)
+
+
+def _check_view_performance(content: bytes, lines: Sequence[bytes], file_path: str,
+                            index: Optional[_FileIndex] = None) -> Iterator[_Bottleneck]:
     """Check View() function for performance issues."""
-    bottlenecks = []
+    if b'View' not in content:
+        return
+    if index is None:
+        index = _FileIndex(content, lines)
+    nl_offsets = index.nl_offsets
+
+    for view_start, view_end in index.functions.get('View', []):
+        code_start = _line_start(nl_offsets, view_start)
+        code_end = _line_end(nl_offsets, view_end, len(content))
+
+        # Check 1: String concatenation with +
+        if _RE_STRING_CONCAT.search(content, code_start, code_end):
+            matches = list(_RE_STRING_CONCAT.finditer(content, code_start, code_end))
+            if len(matches) > 5:  # Multiple concatenations
+                yield _Bottleneck(
+                    severity="HIGH",
+                    category="rendering",
+                    issue=f"String concatenation with + operator ({len(matches)} occurrences)",
+                    location=f"{file_path}:{view_start+1} (View function)",
+                    time_impact="Allocates many temporary strings",
+                    explanation="Using + for strings creates many allocations. Use strings.Builder.",
+                    fix_key="view_string_concat"
+                )
+
+        # Check 2: Recompiling lipgloss styles
+        style_count = content.count(b'lipgloss.NewStyle()', code_start, code_end)
+        if style_count > 3:
+            yield _Bottleneck(
+                severity="MEDIUM",
+                category="rendering",
+                issue=f"Creating lipgloss styles in View() ({style_count} times)",
+                location=f"{file_path}:{view_start+1} (View function)",
+                time_impact="Recreates styles on every render",
+                explanation="Style creation is relatively expensive. Cache styles in model.",
+                fix_key="view_style_creation"
+            )
 
-    # Find View() function
-    view_start = -1
-    view_end = -1
-    brace_count = 0
+        # Check 3: Reading files in View()
+        if _RE_FILE_IO_VIEW.search(content, code_start, code_end):
+            yield _Bottleneck(
+                severity="CRITICAL",
+                category="rendering",
+                issue="File I/O in View() function",
+                location=f"{file_path}:{view_start+1} (View function)",
+                time_impact="Massive delay (1-100ms per render)",
+                explanation="View() is called frequently. File I/O blocks rendering.",
+                fix_key="view_file_io"
+            )
+
+        # Check 4: Expensive lipgloss operations
+        join_vertical_count = content.count(b'lipgloss.JoinVertical', code_start, code_end)
+        if join_vertical_count > 10:
+            yield _Bottleneck(
+                severity="LOW",
+                category="rendering",
+                issue=f"Many lipgloss.JoinVertical calls ({join_vertical_count})",
+                location=f"{file_path}:{view_start+1} (View function)",
+                time_impact="Accumulates string operations",
+                explanation="Many join operations can add up. Consider batching.",
+                fix_key="view_join_vertical"
+            )
 
-    for i, line in enumerate(lines):
-        if re.search(r'func\s+\([^)]+\)\s+View\s*\(', line):
-            view_start = i
-            brace_count = line.count('{') - line.count('}')
-        elif view_start >= 0:
-            brace_count += line.count('{') - line.count('}')
-            if brace_count == 0:
-                view_end = i
-                break
 
-    if view_start < 0:
-        return bottlenecks
-
-    view_lines = lines[view_start:view_end+1] if view_end > 0 else lines[view_start:]
-    view_code = '\n'.join(view_lines)
-
-    # Check 1: String concatenation with +
-    string_concat_pattern = r'(\w+\s*\+\s*"[^"]*"\s*\+\s*\w+|\w+\s*\+=\s*"[^"]*")'
-    if re.search(string_concat_pattern, view_code):
-        matches = list(re.finditer(string_concat_pattern, view_code))
-        if len(matches) > 5:  # Multiple concatenations
-            bottlenecks.append({
-                "severity": "HIGH",
-                "category": "rendering",
-                "issue": f"String concatenation with + operator ({len(matches)} occurrences)",
-                "location": f"{file_path}:{view_start+1} (View function)",
-                "time_impact": "Allocates many temporary strings",
-                "explanation": "Using + for strings creates many allocations. Use strings.Builder.",
-                "fix": "Replace with strings.Builder:\n\n" +
-                       "import \"strings\"\n\n" +
-                       "func (m model) View() string {\n" +
-                       "    var b strings.Builder\n" +
-                       "    b.WriteString(\"header\")\n" +
-                       "    b.WriteString(m.content)\n" +
-                       "    b.WriteString(\"footer\")\n" +
-                       "    return b.String()\n" +
-                       "}",
-                "code_example": "var b strings.Builder; b.WriteString(...)"
-            })
-
-    # Check 2: Recompiling lipgloss styles
-    style_in_view = re.findall(r'lipgloss\.NewStyle\(\)', view_code)
-    if len(style_in_view) > 3:
-        bottlenecks.append({
-            "severity": "MEDIUM",
-            "category": "rendering",
-            "issue": f"Creating lipgloss styles in View() ({len(style_in_view)} times)",
-            "location": f"{file_path}:{view_start+1} (View function)",
-            "time_impact": "Recreates styles on every render",
-            "explanation": "Style creation is relatively expensive. Cache styles in model.",
-            "fix": "Cache styles in model:\n\n" +
-                   "type model struct {\n" +
-                   "    // ... other fields\n" +
-                   "    headerStyle lipgloss.Style\n" +
-                   "    contentStyle lipgloss.Style\n" +
-                   "}\n\n" +
-                   "func initialModel() model {\n" +
-                   "    return model{\n" +
-                   "        headerStyle: lipgloss.NewStyle().Bold(true).Foreground(lipgloss.Color(\"#FF00FF\")),\n" +
-                   "        contentStyle: lipgloss.NewStyle().Padding(1),\n" +
-                   "    }\n" +
-                   "}\n\n" +
-                   "func (m model) View() string {\n" +
-                   "    return m.headerStyle.Render(\"Header\") + m.contentStyle.Render(m.content)\n" +
-                   "}",
-            "code_example": "m.headerStyle.Render(...)  // Use cached style"
-        })
-
-    # Check 3: Reading files in View()
-    if re.search(r'\b(os\.ReadFile|ioutil\.ReadFile|os\.Open)', view_code):
-        bottlenecks.append({
-            "severity": "CRITICAL",
-            "category": "rendering",
-            "issue": "File I/O in View() function",
-            "location": f"{file_path}:{view_start+1} (View function)",
-            "time_impact": "Massive delay (1-100ms per render)",
-            "explanation": "View() is called frequently. File I/O blocks rendering.",
-            "fix": "Load file in Update(), cache in model:\n\n" +
-                   "type model struct {\n" +
-                   "    fileContent string\n" +
-                   "}\n\n" +
-                   "func loadFile() tea.Msg {\n" +
-                   "    content, err := os.ReadFile(\"file.txt\")\n" +
-                   "    return fileLoadedMsg{content: string(content), err: err}\n" +
-                   "}\n\n" +
-                   "// In Update():\n" +
-                   "case fileLoadedMsg:\n" +
-                   "    m.fileContent = msg.content\n\n" +
-                   "// In View():\n" +
-                   "return m.fileContent  // Just return cached data",
-            "code_example": "return m.cachedContent  // No I/O in View()"
-        })
-
-    # Check 4: Expensive lipgloss operations
-    join_vertical_count = len(re.findall(r'lipgloss\.JoinVertical', view_code))
-    if join_vertical_count > 10:
-        bottlenecks.append({
-            "severity": "LOW",
-            "category": "rendering",
-            "issue": f"Many lipgloss.JoinVertical calls ({join_vertical_count})",
-            "location": f"{file_path}:{view_start+1} (View function)",
-            "time_impact": "Accumulates string operations",
-            "explanation": "Many join operations can add up. Consider batching.",
-            "fix": "Batch related joins:\n\n" +
-                   "// Instead of many small joins:\n" +
-                   "// line1 := lipgloss.JoinHorizontal(...)\n" +
-                   "// line2 := lipgloss.JoinHorizontal(...)\n" +
-                   "// ...\n\n" +
-                   "// Build all lines first, join once:\n" +
-                   "lines := []string{\n" +
-                   "    lipgloss.JoinHorizontal(...),\n" +
-                   "    lipgloss.JoinHorizontal(...),\n" +
-                   "    lipgloss.JoinHorizontal(...),\n" +
-                   "}\n" +
-                   "return lipgloss.JoinVertical(lipgloss.Left, lines...)",
-            "code_example": "lipgloss.JoinVertical(lipgloss.Left, lines...)"
-        })
-
-    return bottlenecks
-
-
-def _check_string_operations(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+def _check_string_operations(content: bytes, lines: Sequence[bytes], file_path: str,
+                             index: Optional[_FileIndex] = None) -> Iterator[_Bottleneck]:
     """Check for inefficient string operations."""
-    bottlenecks = []
+    if b'fmt.Sprintf' not in content:
+        return
+    if index is None:
+        index = _FileIndex(content, lines)
+    nl_offsets = index.nl_offsets
+
+    # Lines building a result with fmt.Sprintf, indexed once
+    sprintf_lines = [j for j in _lines_containing(content, nl_offsets, b'fmt.Sprintf')
+                     if b'result' in lines[j]]
+
+    # Check for fmt.Sprintf in loops (within 20 lines of a for)
+    for i in index.for_lines:
+        k = bisect.bisect_left(sprintf_lines, i)
+        if k < len(sprintf_lines) and sprintf_lines[k] < i + 20:
+            j = sprintf_lines[k]
+            yield _Bottleneck(
+                severity="MEDIUM",
+                category="performance",
+                issue="fmt.Sprintf in loop",
+                location=f"{file_path}:{j+1}",
+                time_impact="Allocations on every iteration",
+                explanation="fmt.Sprintf allocates. Use strings.Builder or fmt.Fprintf.",
+                fix_key="sprintf_in_loop"
+            )
 
-    # Check for fmt.Sprintf in loops
-    for i, line in enumerate(lines):
-        if 'for' in line:
-            # Check next 20 lines for fmt.Sprintf
-            for j in range(i, min(i+20, len(lines))):
-                if 'fmt.Sprintf' in lines[j] and 'result' in lines[j]:
-                    bottlenecks.append({
-                        "severity": "MEDIUM",
-                        "category": "performance",
-                        "issue": "fmt.Sprintf in loop",
-                        "location": f"{file_path}:{j+1}",
-                        "time_impact": "Allocations on every iteration",
-                        "explanation": "fmt.Sprintf allocates. Use strings.Builder or fmt.Fprintf.",
-                        "fix": "Use strings.Builder:\n\n" +
-                               "var b strings.Builder\n" +
-                               "for _, item := range items {\n" +
-                               "    fmt.Fprintf(&b, \"Item: %s\\n\", item)\n" +
-                               "}\n" +
-                               "result := b.String()",
-                        "code_example": "fmt.Fprintf(&builder, ...)"
-                    })
-                    break
-
-    return bottlenecks
-
-
-def _check_regex_performance(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+
+def _check_regex_performance(content: bytes, lines: Sequence[bytes], file_path: str,
+                             index: Optional[_FileIndex] = None) -> Iterator[_Bottleneck]:
     """Check for regex performance issues."""
-    bottlenecks = []
+    if b'regexp.MustCompile' not in content:
+        return
 
     # Check for regexp.MustCompile in functions (not at package level)
     in_function = False
     for i, line in enumerate(lines):
-        if re.match(r'^\s*func\s+', line):
+        stripped = line.lstrip()
+        if stripped.startswith(b'func') and stripped[4:5].isspace():
             in_function = True
-        elif in_function and re.match(r'^\s*$', line):
+        elif not stripped:
             in_function = False
 
-        if in_function and 'regexp.MustCompile' in line:
-            bottlenecks.append({
-                "severity": "HIGH",
-                "category": "performance",
-                "issue": "Compiling regex in function",
-                "location": f"{file_path}:{i+1}",
-                "time_impact": "Compiles on every call (1-10ms)",
-                "explanation": "Regex compilation is expensive. Compile once at package level.",
-                "fix": "Move to package level:\n\n" +
-                       "// At package level (outside functions)\n" +
-                       "var (\n" +
-                       "    emailRegex = regexp.MustCompile(`^[a-z]+@[a-z]+\\.[a-z]+$`)\n" +
-                       "    phoneRegex = regexp.MustCompile(`^\\d{3}-\\d{3}-\\d{4}$`)\n" +
-                       ")\n\n" +
-                       "// In function\n" +
-                       "func validate(email string) bool {\n" +
-                       "    return emailRegex.MatchString(email)  // Reuse compiled regex\n" +
-                       "}",
-                "code_example": "var emailRegex = regexp.MustCompile(...)  // Package level"
-            })
-
-    return bottlenecks
-
-
-def _check_loop_efficiency(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+        if in_function and b'regexp.MustCompile' in line:
+            yield _Bottleneck(
+                severity="HIGH",
+                category="performance",
+                issue="Compiling regex in function",
+                location=f"{file_path}:{i+1}",
+                time_impact="Compiles on every call (1-10ms)",
+                explanation="Regex compilation is expensive. Compile once at package level.",
+                fix_key="regex_in_function"
+            )
+
+
+def _check_loop_efficiency(content: bytes, lines: Sequence[bytes], file_path: str,
+                           index: Optional[_FileIndex] = None) -> Iterator[_Bottleneck]:
     """Check for inefficient loops."""
-    bottlenecks = []
+    if b'range' not in content:
+        return
+    if index is None:
+        index = _FileIndex(content, lines)
+
+    # Check for nested loops over large data: a deeper for-range within 30 lines
+    range_lines = index.range_lines
+    for k, i in enumerate(range_lines):
+        outer_indent = _indent(lines[i])
+        for j in range_lines[k+1:]:
+            if j >= i + 30:
+                break
+            if _indent(lines[j]) > outer_indent:
+                yield _Bottleneck(
+                    severity="MEDIUM",
+                    category="performance",
+                    issue="Nested loops detected",
+                    location=f"{file_path}:{i+1}",
+                    time_impact="O(n²) complexity",
+                    explanation="Nested loops can be slow. Consider optimization.",
+                    fix_key="nested_loops"
+                )
+                break
 
-    # Check for nested loops over large data
-    for i, line in enumerate(lines):
-        if re.search(r'for\s+.*range', line):
-            # Look for nested loop within 30 lines
-            for j in range(i+1, min(i+30, len(lines))):
-                if re.search(r'for\s+.*range', lines[j]):
-                    # Check indentation (nested)
-                    if len(lines[j]) - len(lines[j].lstrip()) > len(line) - len(line.lstrip()):
-                        bottlenecks.append({
-                            "severity": "MEDIUM",
-                            "category": "performance",
-                            "issue": "Nested loops detected",
-                            "location": f"{file_path}:{i+1}",
-                            "time_impact": "O(n²) complexity",
-                            "explanation": "Nested loops can be slow. Consider optimization.",
-                            "fix": "Optimization strategies:\n" +
-                                   "1. Use map/set for O(1) lookups instead of nested loop\n" +
-                                   "2. Break early when possible\n" +
-                                   "3. Process data once, cache results\n" +
-                                   "4. Use channels/goroutines for parallel processing\n\n" +
-                                   "Example with map:\n" +
-                                   "// Instead of:\n" +
-                                   "for _, a := range listA {\n" +
-                                   "    for _, b := range listB {\n" +
-                                   "        if a.id == b.id { found = true }\n" +
-                                   "    }\n" +
-                                   "}\n\n" +
-                                   "// Use map:\n" +
-                                   "mapB := make(map[string]bool)\n" +
-                                   "for _, b := range listB {\n" +
-                                   "    mapB[b.id] = true\n" +
-                                   "}\n" +
-                                   "for _, a := range listA {\n" +
-                                   "    if mapB[a.id] { found = true }\n" +
-                                   "}",
-                            "code_example": "Use map for O(1) lookup"
-                        })
-                        break
-
-    return bottlenecks
-
-
-def _check_allocation_patterns(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+
+def _check_allocation_patterns(content: bytes, lines: Sequence[bytes], file_path: str,
+                               index: Optional[_FileIndex] = None) -> Iterator[_Bottleneck]:
     """Check for excessive allocations."""
-    bottlenecks = []
+    if b'append(' not in content:
+        return
+    if index is None:
+        index = _FileIndex(content, lines)
+    nl_offsets = index.nl_offsets
+
+    # Lines that pre-allocate with make(..., len(...)), indexed once
+    make_lines = [j for j in _lines_containing(content, nl_offsets, b'make(')
+                  if b'len(' in lines[j]]
 
     # Check for slice append in loops without pre-allocation
-    for i, line in enumerate(lines):
-        if re.search(r'for\s+.*range', line):
-            # Check next 20 lines for append without make
-            has_append = False
-            for j in range(i, min(i+20, len(lines))):
-                if 'append(' in lines[j]:
-                    has_append = True
-                    break
-
-            # Check if slice was pre-allocated
-            has_make = False
-            for j in range(max(0, i-10), i):
-                if 'make(' in lines[j] and 'len(' in lines[j]:
-                    has_make = True
-                    break
-
-            if has_append and not has_make:
-                bottlenecks.append({
-                    "severity": "LOW",
-                    "category": "memory",
-                    "issue": "Slice append in loop without pre-allocation",
-                    "location": f"{file_path}:{i+1}",
-                    "time_impact": "Multiple reallocations",
-                    "explanation": "Appending without pre-allocation causes slice to grow, reallocate.",
-                    "fix": "Pre-allocate slice:\n\n" +
-                           "// Instead of:\n" +
-                           "var results []string\n" +
-                           "for _, item := range items {\n" +
-                           "    results = append(results, process(item))\n" +
-                           "}\n\n" +
-                           "// Pre-allocate:\n" +
-                           "results := make([]string, 0, len(items))  // Pre-allocate capacity\n" +
-                           "for _, item := range items {\n" +
-                           "    results = append(results, process(item))  // No reallocation\n" +
-                           "}",
-                    "code_example": "results := make([]string, 0, len(items))"
-                })
-
-    return bottlenecks
-
-
-def _check_concurrent_operations(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+    for i in index.range_lines:
+        # Check next 20 lines for append without make
+        window_end = _line_end(nl_offsets, min(i + 19, len(lines) - 1), len(content))
+        has_append = content.find(b'append(', _line_start(nl_offsets, i), window_end) >= 0
+
+        # Check if slice was pre-allocated in the previous 10 lines
+        k = bisect.bisect_left(make_lines, i - 10)
+        has_make = k < len(make_lines) and make_lines[k] < i
+
+        if has_append and not has_make:
+            yield _Bottleneck(
+                severity="LOW",
+                category="memory",
+                issue="Slice append in loop without pre-allocation",
+                location=f"{file_path}:{i+1}",
+                time_impact="Multiple reallocations",
+                explanation="Appending without pre-allocation causes slice to grow, reallocate.",
+                fix_key="append_without_prealloc"
+            )
+
+
+def _check_concurrent_operations(content: bytes, lines: Sequence[bytes], file_path: str,
+                                 index: Optional[_FileIndex] = None) -> Iterator[_Bottleneck]:
     """Check for concurrency issues."""
-    bottlenecks = []
+    if b'go' not in content or not _RE_GO_FUNC.search(content):
+        return
 
     # Check for goroutine leaks
-    has_goroutines = bool(re.search(r'\bgo\s+func', content))
-    has_context = bool(re.search(r'context\.', content))
-    has_waitgroup = bool(re.search(r'sync\.WaitGroup', content))
-
-    if has_goroutines and not (has_context or has_waitgroup):
-        bottlenecks.append({
-            "severity": "HIGH",
-            "category": "memory",
-            "issue": "Goroutines without lifecycle management",
-            "location": file_path,
-            "time_impact": "Goroutine leaks consume memory",
-            "explanation": "Goroutines need proper cleanup to prevent leaks.",
-            "fix": "Use context for cancellation:\n\n" +
-                   "type model struct {\n" +
-                   "    ctx    context.Context\n" +
-                   "    cancel context.CancelFunc\n" +
-                   "}\n\n" +
-                   "func initialModel() model {\n" +
-                   "    ctx, cancel := context.WithCancel(context.Background())\n" +
-                   "    return model{ctx: ctx, cancel: cancel}\n" +
-                   "}\n\n" +
-                   "func worker(ctx context.Context) tea.Msg {\n" +
-                   "    for {\n" +
-                   "        select {\n" +
-                   "        case <-ctx.Done():\n" +
-                   "            return nil  // Stop goroutine\n" +
-                   "        case <-time.After(time.Second):\n" +
-                   "            // Do work\n" +
-                   "        }\n" +
-                   "    }\n" +
-                   "}\n\n" +
-                   "// In Update() on quit:\n" +
-                   "m.cancel()  // Stops all goroutines",
-            "code_example": "ctx, cancel := context.WithCancel(context.Background())"
-        })
-
-    return bottlenecks
-
-
-def _check_io_operations(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+    has_context = b'context.' in content
+    has_waitgroup = b'sync.WaitGroup' in content
+
+    if not (has_context or has_waitgroup):
+        yield _Bottleneck(
+            severity="HIGH",
+            category="memory",
+            issue="Goroutines without lifecycle management",
+            location=file_path,
+            time_impact="Goroutine leaks consume memory",
+            explanation="Goroutines need proper cleanup to prevent leaks.",
+            fix_key="goroutine_lifecycle"
+        )
+
+
+def _check_io_operations(content: bytes, lines: Sequence[bytes], file_path: str,
+                         index: Optional[_FileIndex] = None) -> Iterator[_Bottleneck]:
     """Check for I/O operations that should be async."""
-    bottlenecks = []
+    if index is None:
+        index = _FileIndex(content, lines)
 
     # Check for synchronous file reads
-    file_ops = [
-        (r'os\.ReadFile', "os.ReadFile"),
-        (r'ioutil\.ReadFile', "ioutil.ReadFile"),
-        (r'os\.Open', "os.Open"),
-        (r'io\.ReadAll', "io.ReadAll"),
-    ]
-
-    for pattern, op_name in file_ops:
-        matches = list(re.finditer(pattern, content))
+    for pattern, literal, op_name in _FILE_OPS:
+        if literal not in content:
+            continue
+        nl_offsets = index.nl_offsets
+        matches = list(pattern.finditer(content))
         if matches:
             # Check if in tea.Cmd (good) or in Update/View (bad)
             for match in matches:
-                # Find which function this is in
-                line_num = content[:match.start()].count('\n')
-                context_lines = content.split('\n')[max(0, line_num-10):line_num+1]
-                context_text = '\n'.join(context_lines)
+                # Find which function this is in: search the match's line and
+                # the 10 before it in place, by offset
+                line_num = line_index(nl_offsets, match.start())
+                context_start = _line_start(nl_offsets, max(0, line_num-10))
+                context_end = _line_end(nl_offsets, line_num, len(content))
 
-                in_cmd = bool(re.search(r'func\s+\w+\(\s*\)\s+tea\.Msg', context_text))
-                in_update = bool(re.search(r'func\s+\([^)]+\)\s+Update', context_text))
-                in_view = bool(re.search(r'func\s+\([^)]+\)\s+View', context_text))
+                in_cmd = bool(_RE_CMD_SIG.search(content, context_start, context_end))
+                in_update = bool(_RE_UPDATE_SIG.search(content, context_start, context_end))
+                in_view = bool(_RE_VIEW_SIG.search(content, context_start, context_end))
 
                 if (in_update or in_view) and not in_cmd:
                     severity = "CRITICAL" if in_view else "HIGH"
                     func_name = "View()" if in_view else "Update()"
 
-                    bottlenecks.append({
-                        "severity": severity,
-                        "category": "io",
-                        "issue": f"Synchronous {op_name} in {func_name}",
-                        "location": f"{file_path}:{line_num+1}",
-                        "time_impact": "1-100ms per call",
-                        "explanation": f"{op_name} blocks the event loop",
-                        "fix": f"Move to tea.Cmd:\n\n" +
-                               f"func loadFileCmd() tea.Msg {{\n" +
-                               f"    data, err := {op_name}(\"file.txt\")\n" +
-                               f"    return fileLoadedMsg{{data: data, err: err}}\n" +
-                               f"}}\n\n" +
-                               f"// In Update():\n" +
-                               f"case tea.KeyMsg:\n" +
-                               f"    if key.String() == \"o\" {{\n" +
-                               f"        return m, loadFileCmd  // Non-blocking\n" +
-                               f"    }}",
-                        "code_example": "return m, loadFileCmd  // Async I/O"
-                    })
-
-    return bottlenecks
-
-
-def _generate_performance_recommendations(bottlenecks: List[Dict[str, Any]]) -> List[str]:
+                    yield _Bottleneck(
+                        severity=severity,
+                        category="io",
+                        issue=f"Synchronous {op_name} in {func_name}",
+                        location=f"{file_path}:{line_num+1}",
+                        time_impact="1-100ms per call",
+                        explanation=f"{op_name} blocks the event loop",
+                        fix_key="sync_io",
+                        fix_params={"op_name": op_name}
+                    )
+
+
+_CHECKS = (
+    _check_update_performance,
+    _check_view_performance,
+    _check_string_operations,
+    _check_regex_performance,
+    _check_loop_efficiency,
+    _check_allocation_patterns,
+    _check_concurrent_operations,
+    _check_io_operations,
+)
+
+
+def _render_bottleneck(bottleneck: _Bottleneck) -> Dict[str, Any]:
+    """Convert a bottleneck to its output dict, rendering the fix and code example."""
+    fix, code_example = _FIX_TEMPLATES[bottleneck.fix_key]
+
+    params = bottleneck.fix_params
+    if params:
+        fix = fix.format(**params)
+        code_example = code_example.format(**params)
+
+    return {
+        "severity": bottleneck.severity,
+        "category": bottleneck.category,
+        "issue": bottleneck.issue,
+        "location": bottleneck.location,
+        "time_impact": bottleneck.time_impact,
+        "explanation": bottleneck.explanation,
+        "fix": fix,
+        "code_example": code_example
+    }
+
+
+def _generate_performance_recommendations(bottlenecks: List[_Bottleneck]) -> List[str]:
     """Generate prioritized performance recommendations."""
     recommendations = []
 
     # Group by category
     categories = {}
     for b in bottlenecks:
-        cat = b['category']
+        cat = b.category
         if cat not in categories:
             categories[cat] = []
         categories[cat].append(b)
 
     # Priority recommendations
     if 'performance' in categories:
-        critical = [b for b in categories['performance'] if b['severity'] == 'CRITICAL']
+        critical = [b for b in categories['performance'] if b.severity == 'CRITICAL']
         if critical:
             recommendations.append(
                 f"🔴 CRITICAL: Move {len(critical)} blocking operation(s) to tea.Cmd goroutines"
@@ -648,14 +1017,15 @@ def _generate_performance_recommendations(bottlenecks: List[Dict[str, Any]]) ->
     return recommendations
 
 
-def _estimate_metrics(bottlenecks: List[Dict[str, Any]], files: List[Path]) -> Dict[str, Any]:
+def _estimate_metrics(bottlenecks: List[_Bottleneck], files: List[Path],
+                      skipped: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
     """Estimate performance metrics based on analysis."""
 
     # Estimate Update() time
     critical_in_update = sum(1 for b in bottlenecks
-                            if 'Update()' in b.get('issue', '') and b['severity'] == 'CRITICAL')
+                            if 'Update()' in b.issue and b.severity == 'CRITICAL')
     high_in_update = sum(1 for b in bottlenecks
-                        if 'Update()' in b.get('issue', '') and b['severity'] == 'HIGH')
+                        if 'Update()' in b.issue and b.severity == 'HIGH')
 
     estimated_update_time = "2-5ms (good)"
     if critical_in_update > 0:
@@ -665,9 +1035,9 @@ def _estimate_metrics(bottlenecks: List[Dict[str, Any]], files: List[Path]) -> D
 
     # Estimate View() time
     critical_in_view = sum(1 for b in bottlenecks
-                          if 'View()' in b.get('issue', '') and b['severity'] == 'CRITICAL')
+                          if 'View()' in b.issue and b.severity == 'CRITICAL')
     high_in_view = sum(1 for b in bottlenecks
-                      if 'View()' in b.get('issue', '') and b['severity'] == 'HIGH')
+                      if 'View()' in b.issue and b.severity == 'HIGH')
 
     estimated_view_time = "1-3ms (good)"
     if critical_in_view > 0:
@@ -676,7 +1046,7 @@ def _estimate_metrics(bottlenecks: List[Dict[str, Any]], files: List[Path]) -> D
         estimated_view_time = "10-30ms (slow)"
 
     # Memory estimate
-    goroutine_leaks = sum(1 for b in bottlenecks if 'leak' in b.get('issue', '').lower())
+    goroutine_leaks = sum(1 for b in bottlenecks if 'leak' in b.issue.lower())
     memory_status = "stable"
     if goroutine_leaks > 0:
         memory_status = "growing (leaks detected)"
@@ -686,8 +1056,10 @@ def _estimate_metrics(bottlenecks: List[Dict[str, Any]], files: List[Path]) -> D
         "estimated_view_time": estimated_view_time,
         "memory_status": memory_status,
         "total_bottlenecks": len(bottlenecks),
-        "critical_issues": sum(1 for b in bottlenecks if b['severity'] == 'CRITICAL'),
+        "critical_issues": sum(1 for b in bottlenecks if b.severity == 'CRITICAL'),
         "files_analyzed": len(files),
+        "files_skipped": skipped.get('files', 0) if skipped else 0,
+        "directories_skipped": skipped.get('directories', 0) if skipped else 0,
         "note": "Run actual profiling (pprof, benchmarks) for precise measurements"
     }
 
@@ -701,25 +1073,21 @@ def validate_performance_debug(result: Dict[str, Any]) -> Dict[str, Any]:
     status = validation.get('status', 'unknown')
     summary = validation.get('summary', 'Performance analysis complete')
 
-    checks = [
-        (result.get('bottlenecks') is not None, "Has bottlenecks list"),
-        (result.get('metrics') is not None, "Has metrics"),
-        (result.get('recommendations') is not None, "Has recommendations"),
-    ]
-
-    all_pass = all(check[0] for check in checks)
+    passed = (
+        result.get('bottlenecks') is not None,
+        result.get('metrics') is not None,
+        result.get('recommendations') is not None,
+    )
 
     return {
         "status": status,
         "summary": summary,
-        "checks": {check[1]: check[0] for check in checks},
-        "valid": all_pass
+        "checks": dict(zip(_VALIDATION_CHECKS, passed)),
+        "valid": all(passed)
     }
 
 
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage: debug_performance.py <code_path> [profile_data]")
         sys.exit(1)
@@ -728,4 +1096,4 @@ if __name__ == "__main__":
     profile_data = sys.argv[2] if len(sys.argv) > 2 else ""
 
     result = debug_performance(code_path, profile_data)
-    print(json.dumps(result, indent=2))
+    print(dumps(result))
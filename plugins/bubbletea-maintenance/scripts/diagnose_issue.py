@@ -6,18 +6,241 @@ Identifies common problems: slow event loop, layout issues, memory leaks, etc.
 
 import os
 import re
-import json
+import sys
+from collections import Counter
+from functools import cached_property
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Any
-
-
-def diagnose_issue(code_path: str, description: str = "") -> Dict[str, Any]:
+from typing import Dict, List, Any, Optional, Set
+
+from utils.analysis_cache import FileResultCache, cache_enabled, source_fingerprint
+from utils.go_files import MAX_GO_FILE_SIZE, collect_go_files
+from utils.go_scan import find_model_body, line_index, newline_offsets
+from utils.json_output import dumps
+
+
+# Below this many files, starting worker processes costs more than it saves
+_PARALLEL_MIN_FILES = 32
+
+# Issue fields whose values repeat across issues; interned, along with every
+# key, so all issues with the same value share one string object.
+_SHARED_FIELDS = frozenset({"severity", "category", "issue", "explanation", "fix"})
+
+# Compiled regex patterns, shared by every file and line the checks visit.
+# Patterns run over whole files but must match within a single line, so
+# they use [^\S\n] rather than \s wherever a match could span lines.
+# All regex and substring checks operate on bytes: Go source is scanned as
+# read from disk, and only reported snippets are decoded.
+_RE_UPDATE_FUNC = re.compile(rb'func[^\S\n]+\([^)\n]+\)[^\S\n]+Update[^\S\n]*\(')
+_RE_VIEW_FUNC = re.compile(rb'func[^\S\n]+\([^)\n]+\)[^\S\n]+View[^\S\n]*\(')
+_RE_FUNC_LINE = re.compile(rb'^[^\S\n]*func [^\n]*\S', re.MULTILINE)
+
+# Which function the blocking check is inside (None, "Update()" or "View()")
+# after each kind of line. A View() signature inside Update() leaves the
+# Update() attribution in place; any other func line ends both.
+_FUNC_TRANSITIONS = {
+    "update": {None: "Update()", "Update()": "Update()", "View()": "Update()"},
+    "view": {None: "View()", "Update()": "Update()", "View()": "View()"},
+    "func": {None: None, "Update()": None, "View()": None},
+}
+
+# One alternation per check; the named group that matched identifies the
+# operation or dimension. The dicts give the report order and labels.
+_RE_BLOCKING = re.compile(
+    rb'(?P<sleep>\btime\.Sleep[^\S\n]*\()'
+    rb'|(?P<http>\bhttp\.(?:Get|Post|Do)[^\S\n]*\()'
+    rb'|(?P<file_io>\bos\.Open[^\S\n]*\()'
+    rb'|(?P<read_all>\bio\.ReadAll[^\S\n]*\()'
+    rb'|(?P<command>\bexec\.Command\([^)\n]+\)\.Run\(\))'
+    rb'|(?P<database>\bdb\.Query[^\S\n]*\()'
+)
+
+# Literals at least one of which every _RE_BLOCKING match contains
+_BLOCKING_LITERALS = (b'time.Sleep', b'http.', b'os.Open', b'io.ReadAll', b'exec.Command', b'db.Query')
+
+_BLOCKING_OPERATIONS = {
+    "sleep": "time.Sleep",
+    "http": "HTTP request",
+    "file_io": "File I/O",
+    "read_all": "Blocking read",
+    "command": "Command execution",
+    "database": "Database query",
+}
+
+# Each dimension group wraps an inner group holding the number
+_RE_DIMENSION = re.compile(
+    rb'(?P<width>\.Width[^\S\n]*\([^\S\n]*(\d{2,})[^\S\n]*\))'
+    rb'|(?P<height>\.Height[^\S\n]*\([^\S\n]*(\d{2,})[^\S\n]*\))'
+    rb'|(?P<max_width>MaxWidth[^\S\n]*:[^\S\n]*(\d{2,}))'
+    rb'|(?P<max_height>MaxHeight[^\S\n]*:[^\S\n]*(\d{2,}))'
+)
+
+# Literals at least one of which every _RE_DIMENSION match contains
+_DIMENSION_LITERALS = (b'.Width', b'.Height', b'MaxWidth', b'MaxHeight')
+
+_DIMENSIONS = {
+    "width": "width",
+    "height": "height",
+    "max_width": "MaxWidth",
+    "max_height": "MaxHeight",
+}
+
+# A line that is neither blank nor a // comment
+_RE_FIELD_LINE = re.compile(rb'^[^\S\n]*(?!//)\S', re.MULTILINE)
+
+# Whole-file facts the checks depend on, gathered in one pass. Each pattern
+# sits in a lookahead so a long match (e.g. a defer block) cannot hide a
+# shorter one starting inside it; no two patterns can start at the same
+# offset, so every pattern is seen wherever it matches. The leading class
+# holds every pattern's first character, so most offsets are rejected
+# before any alternative is tried.
+_RE_FILE_FLAGS = re.compile(
+    rb'(?=[dftgc"hHwWl])'
+    rb'(?='
+    rb'(?P<defer_recover>defer\s+func\s*\(\s*\)\s*\{[^}]*recover\(\))'
+    rb'|(?P<main_func>func\s+main\s*\(\s*\))'
+    rb'|(?P<tea_batch>tea\.Batch\s*\()'
+    rb'|(?P<state_machine_type>type\s+\w+State\s+(?:int|string))'
+    rb'|(?P<go_stmt>\bgo\s+)'
+    rb'|(?P<context_cancel>ctx,\s*cancel\s*:=\s*context\.)'
+    rb'|(?P<lipgloss_import>"github\.com/charmbracelet/lipgloss")'
+    rb'|(?P<manual_calc>(?i:height|width)\s*[-+]\s*\d+)'
+    rb'|(?P<lipgloss_helper>lipgloss\.(?:Height|Width|GetVertical|GetHorizontal))'
+    rb')'
+)
+
+_FILE_FLAGS = tuple(_RE_FILE_FLAGS.groupindex)
+
+
+# Fix text for each kind of issue. Blocking operations fill in {operation}
+# and {cmd_name}; the rest are used as-is.
+_FIX_TEMPLATES: Dict[str, str] = {
+    "blocking_operation": (
+        "Move {operation} to tea.Cmd goroutine:\n\n" +
+        "func load{cmd_name}() tea.Msg {{\n" +
+        "    // Your {operation} here\n" +
+        "    return resultMsg{{}}\n" +
+        "}}\n\n" +
+        "// In Update():\n" +
+        "return m, load{cmd_name}"
+    ),
+    "hardcoded_dimension": (
+        "Use dynamic terminal size from tea.WindowSizeMsg:\n\n" +
+        "type model struct {\n" +
+        "    termWidth  int\n" +
+        "    termHeight int\n" +
+        "}\n\n" +
+        "func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {\n" +
+        "    switch msg := msg.(type) {\n" +
+        "    case tea.WindowSizeMsg:\n" +
+        "        m.termWidth = msg.Width\n" +
+        "        m.termHeight = msg.Height\n" +
+        "    }\n" +
+        "    return m, nil\n" +
+        "}"
+    ),
+    "terminal_recovery": (
+        "Add defer recovery:\n\n" +
+        "func main() {\n" +
+        "    defer func() {\n" +
+        "        if r := recover(); r != nil {\n" +
+        "            tea.DisableMouseAllMotion()\n" +
+        "            tea.ShowCursor()\n" +
+        "            fmt.Println(\"Panic:\", r)\n" +
+        "            os.Exit(1)\n" +
+        "        }\n" +
+        "    }()\n\n" +
+        "    // Your program logic\n" +
+        "}"
+    ),
+    "message_ordering": (
+        "Use state machine to track operations:\n\n" +
+        "type model struct {\n" +
+        "    operations map[string]bool  // Track active operations\n" +
+        "}\n\n" +
+        "type opStartMsg struct { id string }\n" +
+        "type opDoneMsg struct { id string, result string }\n\n" +
+        "func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {\n" +
+        "    switch msg := msg.(type) {\n" +
+        "    case opStartMsg:\n" +
+        "        m.operations[msg.id] = true\n" +
+        "    case opDoneMsg:\n" +
+        "        delete(m.operations, msg.id)\n" +
+        "    }\n" +
+        "    return m, nil\n" +
+        "}"
+    ),
+    "model_complexity": (
+        "Refactor to model tree:\n\n" +
+        "type appModel struct {\n" +
+        "    activeView int\n" +
+        "    listView   listModel\n" +
+        "    detailView detailModel\n" +
+        "}\n\n" +
+        "func (m appModel) Update(msg tea.Msg) (tea.Model, tea.Cmd) {\n" +
+        "    switch m.activeView {\n" +
+        "    case 0:\n" +
+        "        m.listView, cmd = m.listView.Update(msg)\n" +
+        "    case 1:\n" +
+        "        m.detailView, cmd = m.detailView.Update(msg)\n" +
+        "    }\n" +
+        "    return m, cmd\n" +
+        "}"
+    ),
+    "goroutine_leak": (
+        "Use context for goroutine lifecycle:\n\n" +
+        "type model struct {\n" +
+        "    ctx    context.Context\n" +
+        "    cancel context.CancelFunc\n" +
+        "}\n\n" +
+        "func initialModel() model {\n" +
+        "    ctx, cancel := context.WithCancel(context.Background())\n" +
+        "    return model{ctx: ctx, cancel: cancel}\n" +
+        "}\n\n" +
+        "// In Update() on quit:\n" +
+        "m.cancel()  // Stops all goroutines"
+    ),
+    "layout_arithmetic": (
+        "Use lipgloss helpers:\n\n" +
+        "// ❌ BAD:\n" +
+        "availableHeight := termHeight - 5  // Magic number!\n\n" +
+        "// ✅ GOOD:\n" +
+        "headerHeight := lipgloss.Height(header)\n" +
+        "footerHeight := lipgloss.Height(footer)\n" +
+        "availableHeight := termHeight - headerHeight - footerHeight"
+    ),
+}
+
+# The blocking-operation fix for each _RE_BLOCKING group, rendered once
+_BLOCKING_FIXES = {
+    group: _FIX_TEMPLATES["blocking_operation"].format(operation=operation,
+                                                       cmd_name=operation.replace(' ', ''))
+    for group, operation in _BLOCKING_OPERATIONS.items()
+}
+
+# Names of the checks validate_diagnosis reports, in order
+_VALIDATION_CHECKS = ("Has issues list", "Has health score", "Has summary", "Issues analyzed")
+
+
+def diagnose_issue(code_path: str, description: str = "",
+                   use_cache: bool = True,
+                   exclude: Optional[List[str]] = None,
+                   include_generated: bool = False,
+                   max_file_size: Optional[int] = MAX_GO_FILE_SIZE) -> Dict[str, Any]:
     """
     Analyze Bubble Tea code to identify common issues.
 
     Args:
         code_path: Path to Go file or directory containing Bubble Tea code
         description: Optional user description of the problem
+        use_cache: Reuse results for files unchanged since the last run
+        exclude: Glob patterns for files to skip when walking a directory,
+            matched against paths relative to code_path
+        include_generated: Also analyze tests, generated code and
+            third_party/testdata directories when walking a directory
+        max_file_size: Skip files larger than this many bytes when walking
+            a directory (None for no limit)
 
     Returns:
         Dictionary containing:
@@ -35,12 +258,9 @@ def diagnose_issue(code_path: str, description: str = "") -> Dict[str, Any]:
         }
 
     # Collect all .go files
-    go_files = []
-    if path.is_file():
-        if path.suffix == '.go':
-            go_files = [path]
-    else:
-        go_files = list(path.glob('**/*.go'))
+    skipped: Dict[str, int] = {}
+    go_files = collect_go_files(path, include_generated, max_file_size,
+                                exclude or (), skipped)
 
     if not go_files:
         return {
@@ -48,16 +268,20 @@ def diagnose_issue(code_path: str, description: str = "") -> Dict[str, Any]:
             "validation": {"status": "error", "summary": "No Go files"}
         }
 
-    # Analyze all files
+    # Analyze all files, tallying severities and categories as issues arrive
     all_issues = []
-    for go_file in go_files:
-        issues = _analyze_go_file(go_file)
+    severity_counts = Counter()
+    categories = set()
+    for issues in _analyze_files(go_files, use_cache):
         all_issues.extend(issues)
+        for issue in issues:
+            severity_counts[issue['severity']] += 1
+            categories.add(issue['category'])
 
     # Calculate health score
-    critical_count = sum(1 for i in all_issues if i['severity'] == 'CRITICAL')
-    warning_count = sum(1 for i in all_issues if i['severity'] == 'WARNING')
-    info_count = sum(1 for i in all_issues if i['severity'] == 'INFO')
+    critical_count = severity_counts['CRITICAL']
+    warning_count = severity_counts['WARNING']
+    info_count = severity_counts['INFO']
 
     health_score = max(0, 100 - (critical_count * 20) - (warning_count * 5) - (info_count * 1))
 
@@ -75,9 +299,9 @@ def diagnose_issue(code_path: str, description: str = "") -> Dict[str, Any]:
         "summary": summary,
         "checks": {
             "has_blocking_operations": critical_count > 0,
-            "has_layout_issues": any(i['category'] == 'layout' for i in all_issues),
-            "has_performance_issues": any(i['category'] == 'performance' for i in all_issues),
-            "has_architecture_issues": any(i['category'] == 'architecture' for i in all_issues)
+            "has_layout_issues": 'layout' in categories,
+            "has_performance_issues": 'performance' in categories,
+            "has_architecture_issues": 'architecture' in categories
         }
     }
 
@@ -90,19 +314,75 @@ def diagnose_issue(code_path: str, description: str = "") -> Dict[str, Any]:
             "critical": critical_count,
             "warnings": warning_count,
             "info": info_count,
-            "files_analyzed": len(go_files)
+            "files_analyzed": len(go_files),
+            "files_skipped": skipped.get('files', 0)
         },
         "validation": validation,
         "user_description": description
     }
 
 
+def _analyze_files(go_files: List[Path], use_cache: bool = True) -> List[List[Dict[str, Any]]]:
+    """
+    Analyze every file, in worker processes when there are enough of them.
+
+    Files whose path, mtime and size match the on-disk cache are not re-read.
+    Read failures are not cached, so they are retried on the next run. Each
+    remaining file is independent and the checks are CPU-bound, so large
+    trees are spread across processes. Falls back to a serial loop if a pool
+    cannot be started.
+    """
+    cache = None
+    if use_cache and cache_enabled():
+        cache = FileResultCache("diagnosis", source_fingerprint(__file__))
+
+    results: List[Optional[List[Dict[str, Any]]]] = [None] * len(go_files)
+    pending = []
+    for i, go_file in enumerate(go_files):
+        if cache is not None:
+            results[i] = cache.get(go_file)
+        if results[i] is None:
+            pending.append(i)
+
+    pending_files = [go_files[i] for i in pending]
+    analyzed = None
+    if len(pending_files) > _PARALLEL_MIN_FILES:
+        try:
+            with ProcessPoolExecutor() as executor:
+                chunksize = max(1, len(pending_files) // (4 * (os.cpu_count() or 1)))
+                analyzed = list(executor.map(_analyze_go_file, pending_files, chunksize=chunksize))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass
+
+    if analyzed is None:
+        analyzed = [_analyze_go_file(go_file) for go_file in pending_files]
+
+    for i, issues in zip(pending, analyzed):
+        results[i] = issues
+        if cache is not None and not any(issue['category'] == 'system' for issue in issues):
+            cache.put(go_files[i], issues)
+
+    if cache is not None:
+        cache.save()
+
+    # Issues from workers or the cache were unpickled with private copies
+    # of each string; collapse repeats onto one shared object.
+    return [
+        [{sys.intern(key): sys.intern(value) if key in _SHARED_FIELDS else value
+          for key, value in issue.items()}
+         for issue in issues]
+        for issues in results
+    ]
+
+
 def _analyze_go_file(file_path: Path) -> List[Dict[str, Any]]:
     """Analyze a single Go file for issues."""
     issues = []
 
     try:
-        content = file_path.read_text()
+        content = file_path.read_bytes()
+        if not content.isascii():
+            content.decode('utf-8')
     except Exception as e:
         return [{
             "severity": "WARNING",
@@ -113,206 +393,227 @@ def _analyze_go_file(file_path: Path) -> List[Dict[str, Any]]:
             "fix": "Check file permissions"
         }]
 
-    lines = content.split('\n')
     rel_path = file_path.name
+    ctx = _FileContext(content)
 
     # Check 1: Blocking operations in Update() or View()
-    issues.extend(_check_blocking_operations(content, lines, rel_path))
+    issues.extend(_check_blocking_operations(content, rel_path, ctx))
 
     # Check 2: Hardcoded dimensions
-    issues.extend(_check_hardcoded_dimensions(content, lines, rel_path))
+    issues.extend(_check_hardcoded_dimensions(content, rel_path, ctx))
 
     # Check 3: Missing terminal recovery
-    issues.extend(_check_terminal_recovery(content, lines, rel_path))
+    issues.extend(_check_terminal_recovery(content, rel_path, ctx))
 
     # Check 4: Message ordering assumptions
-    issues.extend(_check_message_ordering(content, lines, rel_path))
+    issues.extend(_check_message_ordering(content, rel_path, ctx))
 
     # Check 5: Model complexity
-    issues.extend(_check_model_complexity(content, lines, rel_path))
+    issues.extend(_check_model_complexity(content, rel_path, ctx))
 
     # Check 6: Memory leaks (goroutine leaks)
-    issues.extend(_check_goroutine_leaks(content, lines, rel_path))
+    issues.extend(_check_goroutine_leaks(content, rel_path, ctx))
 
     # Check 7: Layout arithmetic issues
-    issues.extend(_check_layout_arithmetic(content, lines, rel_path))
+    issues.extend(_check_layout_arithmetic(content, rel_path, ctx))
 
     return issues
 
 
-def _check_blocking_operations(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+class _FileContext:
+    """
+    Per-file data shared by all checks.
+
+    Each field is built on first use, so a file that no check needs it for
+    never pays for it and no check repeats another's scan.
+    """
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    @cached_property
+    def nl_offsets(self) -> List[int]:
+        return newline_offsets(self.content)
+
+    @cached_property
+    def flags(self) -> Dict[str, bool]:
+        return _collect_file_flags(self.content)
+
+
+def _collect_file_flags(content: bytes) -> Dict[str, bool]:
+    """Record which _RE_FILE_FLAGS patterns occur anywhere in content."""
+    flags = dict.fromkeys(_FILE_FLAGS, False)
+    remaining = len(flags)
+    for match in _RE_FILE_FLAGS.finditer(content):
+        if not flags[match.lastgroup]:
+            flags[match.lastgroup] = True
+            remaining -= 1
+            if not remaining:
+                break
+    return flags
+
+
+def _line_text(content: bytes, nl_offsets: List[int], line: int) -> bytes:
+    """Return the text of a 0-based line, without its newline."""
+    start = nl_offsets[line - 1] + 1 if line else 0
+    end = nl_offsets[line] if line < len(nl_offsets) else len(content)
+    return content[start:end]
+
+
+def _matching_lines(content: bytes, nl_offsets: List[int], pattern: 're.Pattern') -> Set[int]:
+    """Return the 0-based lines on which pattern matches."""
+    return {line_index(nl_offsets, match.start()) for match in pattern.finditer(content)}
+
+
+def _check_blocking_operations(content: bytes, file_path: str,
+                               ctx: Optional['_FileContext'] = None) -> List[Dict[str, Any]]:
     """Check for blocking operations in Update() or View()."""
     issues = []
 
-    # Find Update() and View() function boundaries
-    in_update = False
-    in_view = False
-    func_start_line = 0
-
-    blocking_patterns = [
-        (r'\btime\.Sleep\s*\(', "time.Sleep"),
-        (r'\bhttp\.(Get|Post|Do)\s*\(', "HTTP request"),
-        (r'\bos\.Open\s*\(', "File I/O"),
-        (r'\bio\.ReadAll\s*\(', "Blocking read"),
-        (r'\bexec\.Command\([^)]+\)\.Run\(\)', "Command execution"),
-        (r'\bdb\.Query\s*\(', "Database query"),
-    ]
+    # Most files make no blocking calls at all; skip them without a regex scan
+    if not any(literal in content for literal in _BLOCKING_LITERALS):
+        return issues
 
-    for i, line in enumerate(lines):
-        # Track function boundaries
-        if re.search(r'func\s+\([^)]+\)\s+Update\s*\(', line):
-            in_update = True
-            func_start_line = i
-        elif re.search(r'func\s+\([^)]+\)\s+View\s*\(', line):
-            in_view = True
-            func_start_line = i
-        elif in_update or in_view:
-            if line.strip().startswith('func '):
-                in_update = False
-                in_view = False
+    if ctx is None:
+        ctx = _FileContext(content)
+
+    # Blocking calls in the whole file, grouped by line
+    nl_offsets = ctx.nl_offsets
+    blocking = {}
+    for match in _RE_BLOCKING.finditer(content):
+        blocking.setdefault(line_index(nl_offsets, match.start()), set()).add(match.lastgroup)
+
+    if not blocking:
+        return issues
+
+    # Function boundary events by line; an Update() signature outranks a
+    # View() one, which outranks a plain func line
+    events = dict.fromkeys(_matching_lines(content, nl_offsets, _RE_FUNC_LINE), "func")
+    events.update(dict.fromkeys(_matching_lines(content, nl_offsets, _RE_VIEW_FUNC), "view"))
+    events.update(dict.fromkeys(_matching_lines(content, nl_offsets, _RE_UPDATE_FUNC), "update"))
+
+    # Walk boundary events and blocking calls together in line order
+    func_type = None
+    for i in sorted(events.keys() | blocking.keys()):
+        event = events.get(i)
+        if event is not None:
+            func_type = _FUNC_TRANSITIONS[event][func_type]
 
         # Check for blocking operations
-        if in_update or in_view:
-            for pattern, operation in blocking_patterns:
-                if re.search(pattern, line):
-                    func_type = "Update()" if in_update else "View()"
+        if func_type is not None and i in blocking:
+            found = blocking[i]
+            for group, operation in _BLOCKING_OPERATIONS.items():
+                if group in found:
                     issues.append({
                         "severity": "CRITICAL",
                         "category": "performance",
                         "issue": f"Blocking {operation} in {func_type}",
                         "location": f"{file_path}:{i+1}",
-                        "code_snippet": line.strip(),
+                        "code_snippet": _line_text(content, nl_offsets, i).strip().decode('utf-8', 'replace'),
                         "explanation": f"{operation} blocks the event loop, causing UI to freeze",
-                        "fix": f"Move {operation} to tea.Cmd goroutine:\n\n" +
-                               f"func load{operation.replace(' ', '')}() tea.Msg {{\n" +
-                               f"    // Your {operation} here\n" +
-                               f"    return resultMsg{{}}\n" +
-                               f"}}\n\n" +
-                               f"// In Update():\n" +
-                               f"return m, load{operation.replace(' ', '')}"
+                        "fix": _BLOCKING_FIXES[group]
                     })
 
     return issues
 
 
-def _check_hardcoded_dimensions(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+def _check_hardcoded_dimensions(content: bytes, file_path: str,
+                                ctx: Optional['_FileContext'] = None) -> List[Dict[str, Any]]:
     """Check for hardcoded terminal dimensions."""
     issues = []
 
-    # Look for hardcoded width/height values
-    patterns = [
-        (r'\.Width\s*\(\s*(\d{2,})\s*\)', "width"),
-        (r'\.Height\s*\(\s*(\d{2,})\s*\)', "height"),
-        (r'MaxWidth\s*:\s*(\d{2,})', "MaxWidth"),
-        (r'MaxHeight\s*:\s*(\d{2,})', "MaxHeight"),
-    ]
-
-    for i, line in enumerate(lines):
-        for pattern, dimension in patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                value = match.group(1)
+    if not any(literal in content for literal in _DIMENSION_LITERALS):
+        return issues
+
+    # Look for hardcoded width/height values across the whole file,
+    # grouping the values found on each line by dimension
+    if ctx is None:
+        ctx = _FileContext(content)
+    nl_offsets = ctx.nl_offsets
+    by_line = {}
+    for match in _RE_DIMENSION.finditer(content):
+        found = by_line.setdefault(line_index(nl_offsets, match.start()), {})
+        found.setdefault(match.lastgroup, []).append(match.group(match.lastindex + 1))
+
+    for i, found in by_line.items():
+        for group, dimension in _DIMENSIONS.items():
+            for value in found.get(group, ()):
+                value = value.decode()
                 if int(value) >= 20:  # Likely a terminal dimension, not small padding
                     issues.append({
                         "severity": "WARNING",
                         "category": "layout",
                         "issue": f"Hardcoded {dimension} value: {value}",
                         "location": f"{file_path}:{i+1}",
-                        "code_snippet": line.strip(),
+                        "code_snippet": _line_text(content, nl_offsets, i).strip().decode('utf-8', 'replace'),
                         "explanation": "Hardcoded dimensions don't adapt to terminal size",
-                        "fix": f"Use dynamic terminal size from tea.WindowSizeMsg:\n\n" +
-                               f"type model struct {{\n" +
-                               f"    termWidth  int\n" +
-                               f"    termHeight int\n" +
-                               f"}}\n\n" +
-                               f"func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {{\n" +
-                               f"    switch msg := msg.(type) {{\n" +
-                               f"    case tea.WindowSizeMsg:\n" +
-                               f"        m.termWidth = msg.Width\n" +
-                               f"        m.termHeight = msg.Height\n" +
-                               f"    }}\n" +
-                               f"    return m, nil\n" +
-                               f"}}"
+                        "fix": _FIX_TEMPLATES["hardcoded_dimension"]
                     })
 
     return issues
 
 
-def _check_terminal_recovery(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+def _check_terminal_recovery(content: bytes, file_path: str,
+                             ctx: Optional['_FileContext'] = None) -> List[Dict[str, Any]]:
     """Check for panic recovery and terminal cleanup."""
     issues = []
 
-    has_defer_recover = bool(re.search(r'defer\s+func\s*\(\s*\)\s*\{[^}]*recover\(\)', content, re.DOTALL))
-    has_main = bool(re.search(r'func\s+main\s*\(\s*\)', content))
+    # Only files defining main() can be missing its recovery
+    if b'main' not in content:
+        return issues
+
+    if ctx is None:
+        ctx = _FileContext(content)
+    flags = ctx.flags
 
-    if has_main and not has_defer_recover:
+    if flags['main_func'] and not flags['defer_recover']:
         issues.append({
             "severity": "WARNING",
             "category": "reliability",
             "issue": "Missing panic recovery in main()",
             "location": file_path,
             "explanation": "Panics can leave terminal in broken state (mouse mode enabled, cursor hidden)",
-            "fix": "Add defer recovery:\n\n" +
-                   "func main() {\n" +
-                   "    defer func() {\n" +
-                   "        if r := recover(); r != nil {\n" +
-                   "            tea.DisableMouseAllMotion()\n" +
-                   "            tea.ShowCursor()\n" +
-                   "            fmt.Println(\"Panic:\", r)\n" +
-                   "            os.Exit(1)\n" +
-                   "        }\n" +
-                   "    }()\n\n" +
-                   "    // Your program logic\n" +
-                   "}"
+            "fix": _FIX_TEMPLATES["terminal_recovery"]
         })
 
     return issues
 
 
-def _check_message_ordering(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+def _check_message_ordering(content: bytes, file_path: str,
+                            ctx: Optional['_FileContext'] = None) -> List[Dict[str, Any]]:
     """Check for assumptions about message ordering from concurrent commands."""
     issues = []
+    if ctx is None:
+        ctx = _FileContext(content)
+    flags = ctx.flags
 
     # Look for concurrent command patterns without order handling
-    has_batch = bool(re.search(r'tea\.Batch\s*\(', content))
-    has_state_machine = bool(re.search(r'type\s+\w+State\s+(int|string)', content))
-
-    if has_batch and not has_state_machine:
+    if flags['tea_batch'] and not flags['state_machine_type']:
         issues.append({
             "severity": "INFO",
             "category": "architecture",
             "issue": "Using tea.Batch without explicit state tracking",
             "location": file_path,
             "explanation": "Messages from tea.Batch arrive in unpredictable order",
-            "fix": "Use state machine to track operations:\n\n" +
-                   "type model struct {\n" +
-                   "    operations map[string]bool  // Track active operations\n" +
-                   "}\n\n" +
-                   "type opStartMsg struct { id string }\n" +
-                   "type opDoneMsg struct { id string, result string }\n\n" +
-                   "func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {\n" +
-                   "    switch msg := msg.(type) {\n" +
-                   "    case opStartMsg:\n" +
-                   "        m.operations[msg.id] = true\n" +
-                   "    case opDoneMsg:\n" +
-                   "        delete(m.operations, msg.id)\n" +
-                   "    }\n" +
-                   "    return m, nil\n" +
-                   "}"
+            "fix": _FIX_TEMPLATES["message_ordering"]
         })
 
     return issues
 
 
-def _check_model_complexity(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+def _check_model_complexity(content: bytes, file_path: str,
+                            ctx: Optional['_FileContext'] = None) -> List[Dict[str, Any]]:
     """Check if model is too complex and should use model tree."""
     issues = []
 
+    # The struct pattern needs both literals; most files have no model type
+    if b'struct' not in content or b'odel' not in content:
+        return issues
+
     # Count fields in model struct
-    model_match = re.search(r'type\s+(\w*[Mm]odel)\s+struct\s*\{([^}]+)\}', content, re.DOTALL)
-    if model_match:
-        model_body = model_match.group(2)
-        field_count = len([line for line in model_body.split('\n') if line.strip() and not line.strip().startswith('//')])
+    model_body = find_model_body(content)
+    if model_body:
+        field_count = sum(1 for _ in _RE_FIELD_LINE.finditer(model_body))
 
         if field_count > 15:
             issues.append({
@@ -321,80 +622,51 @@ def _check_model_complexity(content: str, lines: List[str], file_path: str) -> L
                 "issue": f"Model has {field_count} fields (complex)",
                 "location": file_path,
                 "explanation": "Large models are hard to maintain. Consider model tree pattern.",
-                "fix": "Refactor to model tree:\n\n" +
-                       "type appModel struct {\n" +
-                       "    activeView int\n" +
-                       "    listView   listModel\n" +
-                       "    detailView detailModel\n" +
-                       "}\n\n" +
-                       "func (m appModel) Update(msg tea.Msg) (tea.Model, tea.Cmd) {\n" +
-                       "    switch m.activeView {\n" +
-                       "    case 0:\n" +
-                       "        m.listView, cmd = m.listView.Update(msg)\n" +
-                       "    case 1:\n" +
-                       "        m.detailView, cmd = m.detailView.Update(msg)\n" +
-                       "    }\n" +
-                       "    return m, cmd\n" +
-                       "}"
+                "fix": _FIX_TEMPLATES["model_complexity"]
             })
 
     return issues
 
 
-def _check_goroutine_leaks(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+def _check_goroutine_leaks(content: bytes, file_path: str,
+                           ctx: Optional['_FileContext'] = None) -> List[Dict[str, Any]]:
     """Check for potential goroutine leaks."""
     issues = []
+    if ctx is None:
+        ctx = _FileContext(content)
+    flags = ctx.flags
 
     # Look for goroutines without cleanup
-    has_go_statements = bool(re.search(r'\bgo\s+', content))
-    has_context_cancel = bool(re.search(r'ctx,\s*cancel\s*:=\s*context\.', content))
-
-    if has_go_statements and not has_context_cancel:
+    if flags['go_stmt'] and not flags['context_cancel']:
         issues.append({
             "severity": "WARNING",
             "category": "reliability",
             "issue": "Goroutines without context cancellation",
             "location": file_path,
             "explanation": "Goroutines may leak if not properly cancelled",
-            "fix": "Use context for goroutine lifecycle:\n\n" +
-                   "type model struct {\n" +
-                   "    ctx    context.Context\n" +
-                   "    cancel context.CancelFunc\n" +
-                   "}\n\n" +
-                   "func initialModel() model {\n" +
-                   "    ctx, cancel := context.WithCancel(context.Background())\n" +
-                   "    return model{ctx: ctx, cancel: cancel}\n" +
-                   "}\n\n" +
-                   "// In Update() on quit:\n" +
-                   "m.cancel()  // Stops all goroutines"
+            "fix": _FIX_TEMPLATES["goroutine_leak"]
         })
 
     return issues
 
 
-def _check_layout_arithmetic(content: str, lines: List[str], file_path: str) -> List[Dict[str, Any]]:
+def _check_layout_arithmetic(content: bytes, file_path: str,
+                             ctx: Optional['_FileContext'] = None) -> List[Dict[str, Any]]:
     """Check for layout arithmetic issues."""
     issues = []
+    if ctx is None:
+        ctx = _FileContext(content)
+    flags = ctx.flags
 
     # Look for manual height/width calculations instead of lipgloss helpers
-    uses_lipgloss = bool(re.search(r'"github\.com/charmbracelet/lipgloss"', content))
-    has_manual_calc = bool(re.search(r'(height|width)\s*[-+]\s*\d+', content, re.IGNORECASE))
-    has_lipgloss_helpers = bool(re.search(r'lipgloss\.(Height|Width|GetVertical|GetHorizontal)', content))
-
-    if uses_lipgloss and has_manual_calc and not has_lipgloss_helpers:
+    if flags['lipgloss_import'] and flags['manual_calc'] and not flags['lipgloss_helper']:
         issues.append({
             "severity": "WARNING",
             "category": "layout",
             "issue": "Manual layout calculations without lipgloss helpers",
             "location": file_path,
             "explanation": "Manual calculations are error-prone. Use lipgloss.Height() and lipgloss.Width()",
-            "fix": "Use lipgloss helpers:\n\n" +
-                   "// ❌ BAD:\n" +
-                   "availableHeight := termHeight - 5  // Magic number!\n\n" +
-                   "// ✅ GOOD:\n" +
-                   "headerHeight := lipgloss.Height(header)\n" +
-                   "footerHeight := lipgloss.Height(footer)\n" +
-                   "availableHeight := termHeight - headerHeight - footerHeight"
+            "fix": _FIX_TEMPLATES["layout_arithmetic"]
         })
 
     return issues
@@ -410,26 +682,22 @@ def validate_diagnosis(result: Dict[str, Any]) -> Dict[str, Any]:
     status = validation.get('status', 'unknown')
     summary = validation.get('summary', 'Diagnosis complete')
 
-    checks = [
-        (result.get('issues') is not None, "Has issues list"),
-        (result.get('health_score') is not None, "Has health score"),
-        (result.get('summary') is not None, "Has summary"),
-        (len(result.get('issues', [])) >= 0, "Issues analyzed"),
-    ]
-
-    all_pass = all(check[0] for check in checks)
+    passed = (
+        result.get('issues') is not None,
+        result.get('health_score') is not None,
+        result.get('summary') is not None,
+        len(result.get('issues', [])) >= 0,
+    )
 
     return {
         "status": status,
         "summary": summary,
-        "checks": {check[1]: check[0] for check in checks},
-        "valid": all_pass
+        "checks": dict(zip(_VALIDATION_CHECKS, passed)),
+        "valid": all(passed)
     }
 
 
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage: diagnose_issue.py <code_path> [description]")
         sys.exit(1)
@@ -438,4 +706,4 @@ if __name__ == "__main__":
     description = sys.argv[2] if len(sys.argv) > 2 else ""
 
     result = diagnose_issue(code_path, description)
-    print(json.dumps(result, indent=2))
+    print(dumps(result))
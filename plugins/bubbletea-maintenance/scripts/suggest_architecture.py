@@ -6,360 +6,94 @@ Analyzes complexity and recommends patterns like model trees, composable views,
 
 import os
 import re
-import json
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
-
-
-def suggest_architecture(code_path: str, complexity_level: str = "auto") -> Dict[str, Any]:
-    """
-    Analyze code and suggest architectural improvements.
-
-    Args:
-        code_path: Path to Go file or directory
-        complexity_level: "auto" (detect), "simple", "medium", "complex"
-
-    Returns:
-        Dictionary containing:
-        - current_pattern: Detected architectural pattern
-        - complexity_score: 0-100 (higher = more complex)
-        - recommended_pattern: Suggested pattern for improvement
-        - refactoring_steps: List of steps to implement
-        - code_templates: Example code for new pattern
-        - validation: Validation report
-    """
-    path = Path(code_path)
-
-    if not path.exists():
-        return {
-            "error": f"Path not found: {code_path}",
-            "validation": {"status": "error", "summary": "Invalid path"}
-        }
-
-    # Collect all .go files
-    go_files = []
-    if path.is_file():
-        if path.suffix == '.go':
-            go_files = [path]
-    else:
-        go_files = list(path.glob('**/*.go'))
-
-    if not go_files:
-        return {
-            "error": "No .go files found",
-            "validation": {"status": "error", "summary": "No Go files"}
-        }
-
-    # Read all code
-    all_content = ""
-    for go_file in go_files:
-        try:
-            all_content += go_file.read_text() + "\n"
-        except Exception:
-            pass
-
-    # Analyze current architecture
-    current_pattern = _detect_current_pattern(all_content)
-    complexity_score = _calculate_complexity(all_content, go_files)
-
-    # Auto-detect complexity level if needed
-    if complexity_level == "auto":
-        if complexity_score < 30:
-            complexity_level = "simple"
-        elif complexity_score < 70:
-            complexity_level = "medium"
-        else:
-            complexity_level = "complex"
-
-    # Generate recommendations
-    recommended_pattern = _recommend_pattern(current_pattern, complexity_score, complexity_level)
-    refactoring_steps = _generate_refactoring_steps(current_pattern, recommended_pattern, all_content)
-    code_templates = _generate_code_templates(recommended_pattern, all_content)
-
-    # Summary
-    if recommended_pattern == current_pattern:
-        summary = f"✅ Current architecture ({current_pattern}) is appropriate for complexity level"
-    else:
-        summary = f"💡 Recommend refactoring from {current_pattern} to {recommended_pattern}"
-
-    # Validation
-    validation = {
-        "status": "pass" if recommended_pattern == current_pattern else "info",
-        "summary": summary,
-        "checks": {
-            "complexity_analyzed": complexity_score >= 0,
-            "pattern_detected": current_pattern != "unknown",
-            "has_recommendations": len(refactoring_steps) > 0,
-            "has_templates": len(code_templates) > 0
-        }
-    }
-
-    return {
-        "current_pattern": current_pattern,
-        "complexity_score": complexity_score,
-        "complexity_level": complexity_level,
-        "recommended_pattern": recommended_pattern,
-        "refactoring_steps": refactoring_steps,
-        "code_templates": code_templates,
-        "summary": summary,
-        "analysis": {
-            "files_analyzed": len(go_files),
-            "model_count": _count_models(all_content),
-            "view_functions": _count_view_functions(all_content),
-            "state_fields": _count_state_fields(all_content)
-        },
-        "validation": validation
-    }
-
-
-def _detect_current_pattern(content: str) -> str:
-    """Detect the current architectural pattern."""
-
-    # Check for various patterns
-    patterns_detected = []
-
-    # Pattern 1: Flat Model (single model struct, no child models)
-    has_model = bool(re.search(r'type\s+\w*[Mm]odel\s+struct', content))
-    has_child_models = bool(re.search(r'\w+Model\s+\w+Model', content))
-
-    if has_model and not has_child_models:
-        patterns_detected.append("flat_model")
-
-    # Pattern 2: Model Tree (parent model with child models)
-    if has_child_models:
-        patterns_detected.append("model_tree")
-
-    # Pattern 3: Multi-view (multiple view rendering based on state)
-    has_view_switcher = bool(re.search(r'switch\s+m\.\w*(view|mode|screen|state)', content, re.IGNORECASE))
-    if has_view_switcher:
-        patterns_detected.append("multi_view")
-
-    # Pattern 4: Component-based (using Bubble Tea components like list, viewport, etc.)
-    bubbletea_components = [
-        'list.Model',
-        'viewport.Model',
-        'textinput.Model',
-        'textarea.Model',
-        'table.Model',
-        'progress.Model',
-        'spinner.Model'
-    ]
-    component_count = sum(1 for comp in bubbletea_components if comp in content)
-
-    if component_count >= 3:
-        patterns_detected.append("component_based")
-    elif component_count >= 1:
-        patterns_detected.append("uses_components")
-
-    # Pattern 5: State Machine (explicit state enums/constants)
-    has_state_enum = bool(re.search(r'type\s+\w*State\s+(int|string)', content))
-    has_iota_states = bool(re.search(r'const\s+\(\s*\w+State\s+\w*State\s+=\s+iota', content))
-
-    if has_state_enum or has_iota_states:
-        patterns_detected.append("state_machine")
-
-    # Pattern 6: Event-driven (heavy use of custom messages)
-    custom_msg_count = len(re.findall(r'type\s+\w+Msg\s+struct', content))
-    if custom_msg_count >= 5:
-        patterns_detected.append("event_driven")
-
-    # Return the most dominant pattern
-    if "model_tree" in patterns_detected:
-        return "model_tree"
-    elif "state_machine" in patterns_detected and "multi_view" in patterns_detected:
-        return "state_machine_multi_view"
-    elif "component_based" in patterns_detected:
-        return "component_based"
-    elif "multi_view" in patterns_detected:
-        return "multi_view"
-    elif "flat_model" in patterns_detected:
-        return "flat_model"
-    elif has_model:
-        return "basic_model"
-    else:
-        return "unknown"
-
-
-def _calculate_complexity(content: str, files: List[Path]) -> int:
-    """Calculate complexity score (0-100)."""
-
-    score = 0
-
-    # Factor 1: Number of files (10 points max)
-    file_count = len(files)
-    score += min(10, file_count * 2)
-
-    # Factor 2: Model field count (20 points max)
-    model_match = re.search(r'type\s+(\w*[Mm]odel)\s+struct\s*\{([^}]+)\}', content, re.DOTALL)
-    if model_match:
-        model_body = model_match.group(2)
-        field_count = len([line for line in model_body.split('\n')
-                          if line.strip() and not line.strip().startswith('//')])
-        score += min(20, field_count)
-
-    # Factor 3: Number of Update() branches (20 points max)
-    update_match = re.search(r'func\s+\([^)]+\)\s+Update\s*\([^)]+\)\s*\([^)]+\)\s*\{(.+?)^func\s',
-                            content, re.DOTALL | re.MULTILINE)
-    if update_match:
-        update_body = update_match.group(1)
-        case_count = len(re.findall(r'case\s+', update_body))
-        score += min(20, case_count * 2)
-
-    # Factor 4: View() complexity (15 points max)
-    view_match = re.search(r'func\s+\([^)]+\)\s+View\s*\(\s*\)\s+string\s*\{(.+?)^func\s',
-                          content, re.DOTALL | re.MULTILINE)
-    if view_match:
-        view_body = view_match.group(1)
-        view_lines = len(view_body.split('\n'))
-        score += min(15, view_lines // 2)
-
-    # Factor 5: Custom message types (10 points max)
-    custom_msg_count = len(re.findall(r'type\s+\w+Msg\s+struct', content))
-    score += min(10, custom_msg_count * 2)
-
-    # Factor 6: Number of views/screens (15 points max)
-    view_count = len(re.findall(r'func\s+\([^)]+\)\s+render\w+', content, re.IGNORECASE))
-    score += min(15, view_count * 3)
-
-    # Factor 7: Use of channels/goroutines (10 points max)
-    has_channels = len(re.findall(r'make\s*\(\s*chan\s+', content))
-    has_goroutines = len(re.findall(r'\bgo\s+func', content))
-    score += min(10, (has_channels + has_goroutines) * 2)
-
-    return min(100, score)
-
-
-def _recommend_pattern(current: str, complexity: int, level: str) -> str:
-    """Recommend architectural pattern based on current state and complexity."""
-
-    # Simple apps (< 30 complexity)
-    if complexity < 30:
-        if current in ["unknown", "basic_model"]:
-            return "flat_model"  # Simple flat model is fine
-        return current  # Keep current pattern
-
-    # Medium complexity (30-70)
-    elif complexity < 70:
-        if current == "flat_model":
-            return "multi_view"  # Evolve to multi-view
-        elif current == "basic_model":
-            return "component_based"  # Start using components
-        return current
-
-    # High complexity (70+)
-    else:
-        if current in ["flat_model", "multi_view"]:
-            return "model_tree"  # Need hierarchy
-        elif current == "component_based":
-            return "model_tree_with_components"  # Combine patterns
-        return current
-
-
-def _count_models(content: str) -> int:
-    """Count model structs."""
-    return len(re.findall(r'type\s+\w*[Mm]odel\s+struct', content))
-
-
-def _count_view_functions(content: str) -> int:
-    """Count view rendering functions."""
-    return len(re.findall(r'func\s+\([^)]+\)\s+(View|render\w+)', content, re.IGNORECASE))
-
-
-def _count_state_fields(content: str) -> int:
-    """Count state fields in model."""
-    model_match = re.search(r'type\s+(\w*[Mm]odel)\s+struct\s*\{([^}]+)\}', content, re.DOTALL)
-    if not model_match:
-        return 0
-
-    model_body = model_match.group(2)
-    return len([line for line in model_body.split('\n')
-               if line.strip() and not line.strip().startswith('//')])
-
-
-def _generate_refactoring_steps(current: str, recommended: str, content: str) -> List[str]:
-    """Generate step-by-step refactoring guide."""
-
-    if current == recommended:
-        return ["No refactoring needed - current architecture is appropriate"]
-
-    steps = []
-
-    # Flat Model → Multi-view
-    if current == "flat_model" and recommended == "multi_view":
-        steps = [
-            "1. Add view state enum to model",
-            "2. Create separate render functions for each view",
-            "3. Add view switching logic in Update()",
-            "4. Implement switch statement in View() to route to render functions",
-            "5. Add keyboard shortcuts for view navigation"
-        ]
-
-    # Flat Model → Model Tree
-    elif current == "flat_model" and recommended == "model_tree":
-        steps = [
-            "1. Identify logical groupings of fields in current model",
-            "2. Create child model structs for each grouping",
-            "3. Add Init() methods to child models",
-            "4. Create parent model with child model fields",
-            "5. Implement message routing in parent's Update()",
-            "6. Delegate rendering to child models in View()",
-            "7. Test each child model independently"
-        ]
-
-    # Multi-view → Model Tree
-    elif current == "multi_view" and recommended == "model_tree":
-        steps = [
-            "1. Convert each view into a separate child model",
-            "2. Extract view-specific state into child models",
-            "3. Create parent router model with activeView field",
-            "4. Implement message routing based on activeView",
-            "5. Move view rendering logic into child models",
-            "6. Add inter-model communication via custom messages"
-        ]
-
-    # Component-based → Model Tree with Components
-    elif current == "component_based" and recommended == "model_tree_with_components":
-        steps = [
-            "1. Group related components into logical views",
-            "2. Create view models that own related components",
-            "3. Create parent model to manage view models",
-            "4. Implement message routing to active view",
-            "5. Keep component updates within their view models",
-            "6. Compose final view from view model renders"
-        ]
-
-    # Basic Model → Component-based
-    elif current == "basic_model" and recommended == "component_based":
-        steps = [
-            "1. Identify UI patterns that match Bubble Tea components",
-            "2. Replace custom text input with textinput.Model",
-            "3. Replace custom list with list.Model",
-            "4. Replace custom scrolling with viewport.Model",
-            "5. Update Init() to initialize components",
-            "6. Route messages to components in Update()",
-            "7. Compose View() using component.View() calls"
-        ]
-
-    # Generic fallback
-    else:
-        steps = [
-            f"1. Analyze current {current} pattern",
-            f"2. Study {recommended} pattern examples",
-            "3. Plan gradual migration strategy",
-            "4. Implement incrementally with tests",
-            "5. Validate each step before proceeding"
-        ]
-
-    return steps
-
-
-def _generate_code_templates(pattern: str, existing_code: str) -> Dict[str, str]:
-    """Generate code templates for recommended pattern."""
-
-    templates = {}
+from typing import Dict, List, Any, Tuple, Optional, Set
+
+from utils.analysis_cache import cache_enabled
+from utils.go_files import MAX_GO_FILE_SIZE, collect_go_files
+from utils.go_scan import find_model_body
+from utils.json_output import dumps
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Below this many files, starting worker processes costs more than it saves
+_PARALLEL_MIN_FILES = 32
+
+# Compiled regex patterns, shared by every analysis call. Files are scanned
+# as bytes, so \w, \s and case folding only cover ASCII.
+_RE_CHILD_MODEL = re.compile(rb'\w+Model\s+\w+Model')
+# A function body runs to the next top-level func, or to the end of its file
+_RE_UPDATE_FUNC = re.compile(rb'func\s+\([^)]+\)\s+Update\s*\([^)]+\)\s*\([^)]+\)\s*\{(.+?)(?:^func\s|\Z)',
+                             re.DOTALL | re.MULTILINE)
+_RE_VIEW_FUNC = re.compile(rb'func\s+\([^)]+\)\s+View\s*\(\s*\)\s+string\s*\{(.+?)(?:^func\s|\Z)',
+                           re.DOTALL | re.MULTILINE)
+_RE_CASE = re.compile(rb'case\s+')
+# Start of a line that is neither blank nor a // comment, matched up to its
+# first non-space character so each such line matches once
+_RE_FIELD_LINE = re.compile(rb'^[^\S\n]*(?!//)\S', re.MULTILINE)
+
+# Declarations and calls counted across the source, all matched in a single
+# pass. Each kind sits in its own lookahead, so a match of one kind never
+# hides a match of another, and no two kinds can match at the same position.
+# The leading class lets positions that can't start any kind fail at once.
+# state_machine matches either a State type or an iota block of States.
+# render_func only matches within a view_func match.
+_RE_CONSTRUCT_SCAN = re.compile(
+    rb'(?=[tscmgfFS])'
+    rb'(?='
+    rb'(?P<model>type\s+\w*[Mm]odel\s+struct)'
+    rb'|(?P<custom_msg>type\s+\w+Msg\s+struct)'
+    rb'|(?P<state_machine>type\s+\w*State\s+(?:int|string)'
+    rb'|const\s+\(\s*\w+State\s+\w*State\s+=\s+iota)'
+    rb'|(?P<view_switcher>(?i:switch\s+m\.\w*(?:view|mode|screen|state)))'
+    rb'|(?P<make_chan>make\s*\(\s*chan\s+)'
+    rb'|(?P<go_func>\bgo\s+func)'
+    rb'|(?P<view_func>(?i:func\s+\([^)]+\)\s+(?:View|(?P<render_func>render)\w+)))'
+    rb')'
+)
+_CONSTRUCT_KINDS = ('model', 'custom_msg', 'state_machine', 'view_switcher',
+                    'make_chan', 'go_func', 'view_func', 'render_func')
+
+# Bubble Tea component types whose use marks a component-based design
+_BUBBLETEA_COMPONENTS = (
+    'list.Model',
+    'viewport.Model',
+    'textinput.Model',
+    'textarea.Model',
+    'table.Model',
+    'progress.Model',
+    'spinner.Model',
+)
 
-    if pattern == "model_tree":
-        templates["parent_model"] = '''// Parent model manages child models
+# Without pyahocorasick, each '.Model' in the source is found once and the
+# package name in front of it looked up, instead of one search per name
+_COMPONENT_SUFFIX = b'.Model'
+_COMPONENT_PACKAGES = tuple((comp[:-len('.Model')].encode(), comp) for comp in _BUBBLETEA_COMPONENTS)
+
+# With pyahocorasick installed, every component name is found in a single
+# pass over the source instead of one substring search per name
+if ahocorasick is not None:
+    _COMPONENT_AUTOMATON = ahocorasick.Automaton()
+    for _component in _BUBBLETEA_COMPONENTS:
+        _COMPONENT_AUTOMATON.add_word(_component, _component)
+    _COMPONENT_AUTOMATON.make_automaton()
+    del _component
+else:
+    _COMPONENT_AUTOMATON = None
+
+
+# Example code for each recommended pattern, keyed by pattern name
+_CODE_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "model_tree": {
+        "parent_model": '''// Parent model manages child models
 type appModel struct {
     activeView int
 
@@ -418,9 +152,9 @@ func (m appModel) View() string {
         return m.searchView.View()
     }
     return ""
-}'''
+}''',
 
-        templates["child_model"] = '''// Child model handles its own state and rendering
+        "child_model": '''// Child model handles its own state and rendering
 type listViewModel struct {
     items    []string
     cursor   int
@@ -464,9 +198,9 @@ func (m listViewModel) View() string {
         s += fmt.Sprintf("%s [%s] %s\\n", cursor, checked, item)
     }
     return s
-}'''
+}''',
 
-        templates["message_passing"] = '''// Custom message for inter-model communication
+        "message_passing": '''// Custom message for inter-model communication
 type itemSelectedMsg struct {
     itemID string
 }
@@ -497,10 +231,11 @@ func (m appModel) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
 
     // Route to children...
     return m, nil
-}'''
+}''',
+    },
 
-    elif pattern == "multi_view":
-        templates["view_state"] = '''type viewState int
+    "multi_view": {
+        "view_state": '''type viewState int
 
 const (
     listView viewState = iota
@@ -516,9 +251,9 @@ type model struct {
     listCursor  int
     detailItem  string
     searchQuery string
-}'''
+}''',
 
-        templates["view_switching"] = '''func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
+        "view_switching": '''func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
     switch msg := msg.(type) {
     case tea.KeyMsg:
         // Global navigation
@@ -557,10 +292,11 @@ func (m model) View() string {
         return m.renderSearchView()
     }
     return ""
-}'''
+}''',
+    },
 
-    elif pattern == "component_based":
-        templates["using_components"] = '''import (
+    "component_based": {
+        "using_components": '''import (
     "github.com/charmbracelet/bubbles/list"
     "github.com/charmbracelet/bubbles/textinput"
     "github.com/charmbracelet/bubbles/viewport"
@@ -621,10 +357,11 @@ func (m model) View() string {
         m.list.View(),
         m.viewer.View(),
     )
-}'''
+}''',
+    },
 
-    elif pattern == "state_machine_multi_view":
-        templates["state_machine"] = '''type appState int
+    "state_machine_multi_view": {
+        "state_machine": '''type appState int
 
 const (
     loadingState appState = iota
@@ -691,9 +428,456 @@ func (m model) View() string {
         return fmt.Sprintf("Error: %v\\nPress ESC to continue", m.error)
     }
     return ""
-}'''
+}''',
+    },
+}
+
 
-    return templates
+def suggest_architecture(code_path: str, complexity_level: str = "auto",
+                         use_cache: bool = True, include_generated: bool = False,
+                         max_file_size: Optional[int] = MAX_GO_FILE_SIZE,
+                         exclude: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Analyze code and suggest architectural improvements.
+
+    Args:
+        code_path: Path to Go file or directory
+        complexity_level: "auto" (detect), "simple", "medium", "complex"
+        use_cache: Reuse the result of an earlier call in this process if
+            no file has changed since
+        include_generated: Also analyze tests, generated code and
+            third_party/testdata directories when walking a directory
+        max_file_size: Skip files larger than this many bytes when walking
+            a directory (None for no limit)
+        exclude: Glob patterns for files to skip when walking a directory,
+            matched against paths relative to code_path
+
+    Returns:
+        Dictionary containing:
+        - current_pattern: Detected architectural pattern
+        - complexity_score: 0-100 (higher = more complex)
+        - recommended_pattern: Suggested pattern for improvement
+        - refactoring_steps: List of steps to implement
+        - code_templates: Example code for new pattern
+        - validation: Validation report
+    """
+    path = Path(code_path)
+
+    if not path.exists():
+        return {
+            "error": f"Path not found: {code_path}",
+            "validation": {"status": "error", "summary": "Invalid path"}
+        }
+
+    # Collect all .go files
+    skipped = {}
+    go_files = collect_go_files(path, include_generated, max_file_size,
+                                exclude or (), skipped)
+
+    if not go_files:
+        return {
+            "error": "No .go files found",
+            "validation": {"status": "error", "summary": "No Go files"}
+        }
+
+    result = None
+    if use_cache and cache_enabled():
+        signature = _files_signature(go_files)
+        if signature is not None:
+            # Copied so callers can't change the cached result
+            result = copy.deepcopy(_suggest_for_signature(signature, complexity_level))
+    if result is None:
+        result = _suggest_for_files(go_files, complexity_level)
+
+    # Files left out when collected, plus those that couldn't be read
+    if 'analysis' in result:
+        analysis = result['analysis']
+        analysis['files_skipped'] = (skipped.get('files', 0) + len(go_files)
+                                     - analysis['files_analyzed'])
+    return result
+
+
+def _files_signature(go_files: List[Path]) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+    """Return (absolute path, mtime_ns, size) for each file, or None if one can't be read."""
+    signature = []
+    for go_file in go_files:
+        try:
+            st = os.stat(go_file)
+        except OSError:
+            return None
+        signature.append((os.path.abspath(go_file), st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+@lru_cache(maxsize=64)
+def _suggest_for_signature(signature: Tuple[Tuple[str, int, int], ...],
+                           complexity_level: str) -> Dict[str, Any]:
+    """Analyze the files in signature, remembering the result for unchanged files."""
+    return _suggest_for_files([Path(path) for path, _, _ in signature], complexity_level)
+
+
+def _suggest_for_files(go_files: List[Path], complexity_level: str) -> Dict[str, Any]:
+    """Analyze the given Go files and build the suggestion result."""
+    # Analyze current architecture
+    stats = _merge_stats(_analyze_files(go_files))
+    if stats['file_count'] == 0:
+        return {
+            "error": "No .go files found",
+            "validation": {"status": "error", "summary": "No Go files"}
+        }
+
+    current_pattern = _detect_current_pattern(stats)
+    complexity_score = _calculate_complexity(stats)
+
+    # Auto-detect complexity level if needed
+    if complexity_level == "auto":
+        if complexity_score < 30:
+            complexity_level = "simple"
+        elif complexity_score < 70:
+            complexity_level = "medium"
+        else:
+            complexity_level = "complex"
+
+    # Generate recommendations
+    recommended_pattern = _recommend_pattern(current_pattern, complexity_score, complexity_level)
+    refactoring_steps = _generate_refactoring_steps(current_pattern, recommended_pattern)
+    code_templates = _generate_code_templates(recommended_pattern)
+
+    # Summary
+    if recommended_pattern == current_pattern:
+        summary = f"✅ Current architecture ({current_pattern}) is appropriate for complexity level"
+    else:
+        summary = f"💡 Recommend refactoring from {current_pattern} to {recommended_pattern}"
+
+    # Validation
+    validation = {
+        "status": "pass" if recommended_pattern == current_pattern else "info",
+        "summary": summary,
+        "checks": {
+            "complexity_analyzed": complexity_score >= 0,
+            "pattern_detected": current_pattern != "unknown",
+            "has_recommendations": len(refactoring_steps) > 0,
+            "has_templates": len(code_templates) > 0
+        }
+    }
+
+    return {
+        "current_pattern": current_pattern,
+        "complexity_score": complexity_score,
+        "complexity_level": complexity_level,
+        "recommended_pattern": recommended_pattern,
+        "refactoring_steps": refactoring_steps,
+        "code_templates": code_templates,
+        "summary": summary,
+        "analysis": {
+            "files_analyzed": stats['file_count'],
+            "model_count": stats['model'],
+            "view_functions": stats['view_func'],
+            "state_fields": stats['state_fields']
+        },
+        "validation": validation
+    }
+
+
+def _analyze_files(go_files: List[Path]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Gather each file's statistics, in worker processes when there are
+    enough files. Falls back to a serial loop if a pool cannot be started.
+    """
+    if len(go_files) > _PARALLEL_MIN_FILES:
+        try:
+            with ProcessPoolExecutor() as executor:
+                chunksize = max(1, len(go_files) // (4 * (os.cpu_count() or 1)))
+                return list(executor.map(_analyze_file, go_files, chunksize=chunksize))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass
+
+    return [_analyze_file(go_file) for go_file in go_files]
+
+
+def _analyze_file(go_file: Path) -> Optional[Dict[str, Any]]:
+    """Gather one file's statistics, or None if it can't be read."""
+    # Files are scanned as bytes and never decoded. Files that aren't valid
+    # UTF-8 are still skipped, but pure ASCII needs no decode to tell.
+    try:
+        content = go_file.read_bytes()
+        if not content.isascii():
+            content.decode('utf-8')
+    except Exception:
+        return None
+
+    # Same newline handling as reading in text mode
+    if b'\r' in content:
+        content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+    # Files are analyzed newline-terminated, so a construct on an
+    # unterminated last line still ends in whitespace
+    return _analyze_content(content + b"\n")
+
+
+def _analyze_content(content: bytes) -> Dict[str, Any]:
+    """
+    Gather one file's statistics for pattern detection and complexity
+    scoring.
+
+    Each regex runs over content once. Construct counts are the same as
+    running findall with each kind's pattern on its own: a match starting
+    inside the previous match of its kind is skipped. The model field,
+    Update() case and View() line counts are None if content has no such
+    struct or function.
+    """
+    stats: Dict[str, Any] = dict.fromkeys(_CONSTRUCT_KINDS, 0)
+    ends = dict.fromkeys(_CONSTRUCT_KINDS, 0)
+
+    for match in _RE_CONSTRUCT_SCAN.finditer(content):
+        kind = match.lastgroup
+        start, end = match.span(kind)
+        if start < ends[kind]:
+            continue
+        ends[kind] = end
+        stats[kind] += 1
+        if kind == 'view_func' and match.start('render_func') != -1:
+            stats['render_func'] += 1
+
+    stats['has_child_models'] = bool(_RE_CHILD_MODEL.search(content))
+    stats['components'] = _find_components(content)
+
+    # Fields of the first model struct
+    stats['state_fields'] = None
+    model_body = find_model_body(content)
+    if model_body:
+        stats['state_fields'] = len(_RE_FIELD_LINE.findall(model_body))
+
+    # Branches in the first Update()
+    stats['update_cases'] = None
+    update_match = _RE_UPDATE_FUNC.search(content)
+    if update_match:
+        stats['update_cases'] = len(_RE_CASE.findall(update_match.group(1)))
+
+    # Lines in the first View()
+    stats['view_lines'] = None
+    view_match = _RE_VIEW_FUNC.search(content)
+    if view_match:
+        stats['view_lines'] = view_match.group(1).count(b'\n') + 1
+
+    return stats
+
+
+def _merge_stats(file_stats: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Combine per-file statistics, in file order, into the project's.
+
+    Counts are summed. The model, Update() and View() figures come from
+    the first file that has one, and are 0 if none does. Files that were
+    skipped (None) are not counted in file_count.
+    """
+    stats: Dict[str, Any] = dict.fromkeys(_CONSTRUCT_KINDS, 0)
+    stats['file_count'] = 0
+    stats['has_child_models'] = False
+    components: Set[str] = set()
+    firsts = dict.fromkeys(('state_fields', 'update_cases', 'view_lines'))
+
+    for single in file_stats:
+        if single is None:
+            continue
+        stats['file_count'] += 1
+        for kind in _CONSTRUCT_KINDS:
+            stats[kind] += single[kind]
+        stats['has_child_models'] = stats['has_child_models'] or single['has_child_models']
+        components.update(single['components'])
+        for key, value in firsts.items():
+            if value is None:
+                firsts[key] = single[key]
+
+    stats['component_count'] = len(components)
+    for key, value in firsts.items():
+        stats[key] = value or 0
+
+    return stats
+
+
+def _find_components(content: bytes) -> Set[str]:
+    """Return the Bubble Tea component types used in content."""
+    found = set()
+
+    if _COMPONENT_AUTOMATON is None:
+        pos = content.find(_COMPONENT_SUFFIX)
+        while pos >= 0:
+            for package, component in _COMPONENT_PACKAGES:
+                if content.endswith(package, 0, pos):
+                    found.add(component)
+            if len(found) == len(_BUBBLETEA_COMPONENTS):
+                break
+            pos = content.find(_COMPONENT_SUFFIX, pos + len(_COMPONENT_SUFFIX))
+        return found
+
+    # The automaton only takes str. Latin-1 maps each byte to one character,
+    # so the ASCII names match exactly where they appear in the bytes.
+    for _, component in _COMPONENT_AUTOMATON.iter(content.decode('latin-1')):
+        found.add(component)
+        if len(found) == len(_BUBBLETEA_COMPONENTS):
+            break
+    return found
+
+
+def _detect_current_pattern(stats: Dict[str, Any]) -> str:
+    """
+    Detect the current architectural pattern from _merge_stats stats.
+
+    Patterns are tried from most to least dominant and the first that
+    applies is returned.
+    """
+
+    # Model Tree (parent model with child models)
+    if stats['has_child_models']:
+        return "model_tree"
+
+    # Multi-view (multiple view rendering based on state), driven by a
+    # state machine (explicit state enums/constants)
+    has_view_switcher = stats['view_switcher'] > 0
+    has_state_machine = stats['state_machine'] > 0
+    if has_view_switcher and has_state_machine:
+        return "state_machine_multi_view"
+
+    # Component-based (using Bubble Tea components like list, viewport, etc.)
+    if stats['component_count'] >= 3:
+        return "component_based"
+
+    if has_view_switcher:
+        return "multi_view"
+
+    # Flat Model (single model struct, no child models)
+    if stats['model'] > 0:
+        return "flat_model"
+
+    return "unknown"
+
+
+def _calculate_complexity(stats: Dict[str, Any]) -> int:
+    """Calculate complexity score (0-100) from _merge_stats stats."""
+    return min(100,
+               # Factor 1: Number of files (10 points max)
+               min(10, stats['file_count'] * 2)
+               # Factor 2: Model field count (20 points max)
+               + min(20, stats['state_fields'])
+               # Factor 3: Number of Update() branches (20 points max)
+               + min(20, stats['update_cases'] * 2)
+               # Factor 4: View() complexity (15 points max)
+               + min(15, stats['view_lines'] // 2)
+               # Factor 5: Custom message types (10 points max)
+               + min(10, stats['custom_msg'] * 2)
+               # Factor 6: Number of views/screens (15 points max)
+               + min(15, stats['render_func'] * 3)
+               # Factor 7: Use of channels/goroutines (10 points max)
+               + min(10, (stats['make_chan'] + stats['go_func']) * 2))
+
+
+def _recommend_pattern(current: str, complexity: int, level: str) -> str:
+    """Recommend architectural pattern based on current state and complexity."""
+
+    # Simple apps (< 30 complexity)
+    if complexity < 30:
+        if current in ["unknown", "basic_model"]:
+            return "flat_model"  # Simple flat model is fine
+        return current  # Keep current pattern
+
+    # Medium complexity (30-70)
+    elif complexity < 70:
+        if current == "flat_model":
+            return "multi_view"  # Evolve to multi-view
+        elif current == "basic_model":
+            return "component_based"  # Start using components
+        return current
+
+    # High complexity (70+)
+    else:
+        if current in ["flat_model", "multi_view"]:
+            return "model_tree"  # Need hierarchy
+        elif current == "component_based":
+            return "model_tree_with_components"  # Combine patterns
+        return current
+
+
+def _generate_refactoring_steps(current: str, recommended: str) -> List[str]:
+    """Generate step-by-step refactoring guide."""
+
+    if current == recommended:
+        return ["No refactoring needed - current architecture is appropriate"]
+
+    steps = []
+
+    # Flat Model → Multi-view
+    if current == "flat_model" and recommended == "multi_view":
+        steps = [
+            "1. Add view state enum to model",
+            "2. Create separate render functions for each view",
+            "3. Add view switching logic in Update()",
+            "4. Implement switch statement in View() to route to render functions",
+            "5. Add keyboard shortcuts for view navigation"
+        ]
+
+    # Flat Model → Model Tree
+    elif current == "flat_model" and recommended == "model_tree":
+        steps = [
+            "1. Identify logical groupings of fields in current model",
+            "2. Create child model structs for each grouping",
+            "3. Add Init() methods to child models",
+            "4. Create parent model with child model fields",
+            "5. Implement message routing in parent's Update()",
+            "6. Delegate rendering to child models in View()",
+            "7. Test each child model independently"
+        ]
+
+    # Multi-view → Model Tree
+    elif current == "multi_view" and recommended == "model_tree":
+        steps = [
+            "1. Convert each view into a separate child model",
+            "2. Extract view-specific state into child models",
+            "3. Create parent router model with activeView field",
+            "4. Implement message routing based on activeView",
+            "5. Move view rendering logic into child models",
+            "6. Add inter-model communication via custom messages"
+        ]
+
+    # Component-based → Model Tree with Components
+    elif current == "component_based" and recommended == "model_tree_with_components":
+        steps = [
+            "1. Group related components into logical views",
+            "2. Create view models that own related components",
+            "3. Create parent model to manage view models",
+            "4. Implement message routing to active view",
+            "5. Keep component updates within their view models",
+            "6. Compose final view from view model renders"
+        ]
+
+    # Basic Model → Component-based
+    elif current == "basic_model" and recommended == "component_based":
+        steps = [
+            "1. Identify UI patterns that match Bubble Tea components",
+            "2. Replace custom text input with textinput.Model",
+            "3. Replace custom list with list.Model",
+            "4. Replace custom scrolling with viewport.Model",
+            "5. Update Init() to initialize components",
+            "6. Route messages to components in Update()",
+            "7. Compose View() using component.View() calls"
+        ]
+
+    # Generic fallback
+    else:
+        steps = [
+            f"1. Analyze current {current} pattern",
+            f"2. Study {recommended} pattern examples",
+            "3. Plan gradual migration strategy",
+            "4. Implement incrementally with tests",
+            "5. Validate each step before proceeding"
+        ]
+
+    return steps
+
+
+def _generate_code_templates(pattern: str) -> Dict[str, str]:
+    """Generate code templates for recommended pattern."""
+    return dict(_CODE_TEMPLATES.get(pattern, {}))
 
 
 def validate_architecture_suggestion(result: Dict[str, Any]) -> Dict[str, Any]:
@@ -733,4 +917,4 @@ if __name__ == "__main__":
     complexity_level = sys.argv[2] if len(sys.argv) > 2 else "auto"
 
     result = suggest_architecture(code_path, complexity_level)
-    print(json.dumps(result, indent=2))
+    print(dumps(result))
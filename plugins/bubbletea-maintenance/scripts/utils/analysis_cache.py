@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Persistent per-file result cache for Bubble Tea maintenance agent.
+Lets repeated runs skip Go files that have not changed since the last analysis.
+"""
+
+import os
+import pickle
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+# Set this environment variable to any non-empty value to disable caching
+NO_CACHE_ENV = "BUBBLETEA_MAINTENANCE_NO_CACHE"
+
+# Most files one cache keeps; the least recently used are dropped beyond this
+MAX_CACHE_ENTRIES = 4096
+
+
+def cache_enabled() -> bool:
+    """Check whether result caching is enabled for this process."""
+    return not os.environ.get(NO_CACHE_ENV)
+
+
+def cache_dir() -> Path:
+    """Return the directory that holds the analyzer caches."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "bubbletea-maintenance"
+
+
+def source_fingerprint(source_file: str) -> str:
+    """Hash an analyzer's source so its cached results expire when it changes."""
+    try:
+        return hashlib.sha1(Path(source_file).read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+class FileResultCache:
+    """
+    Analysis results keyed on (path, mtime_ns, size), persisted with pickle.
+
+    The whole cache is discarded on load if it was written by a different
+    analyzer version. Entries for files that no longer exist are dropped
+    on save, as are the least recently used beyond MAX_CACHE_ENTRIES.
+    Unreadable or unwritable cache files are ignored.
+    """
+
+    def __init__(self, name: str, version: str):
+        self.path = cache_dir() / f"{name}.pkl"
+        self.version = version
+        self._entries: Dict[str, Tuple[int, int, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            return
+
+        if isinstance(data, dict) and data.get("version") == self.version:
+            self._entries = data.get("entries", {})
+
+    @staticmethod
+    def _key(file_path: Path) -> Tuple[str, int, int]:
+        st = os.stat(file_path)
+        return os.path.abspath(file_path), st.st_mtime_ns, st.st_size
+
+    def get(self, file_path: Path) -> Optional[Any]:
+        """Return the cached result for file_path, or None if stale or missing."""
+        try:
+            path, mtime_ns, size = self._key(file_path)
+        except OSError:
+            return None
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == mtime_ns and entry[1] == size:
+            # Move to the end, which holds the most recently used
+            del self._entries[path]
+            self._entries[path] = entry
+            return entry[2]
+        return None
+
+    def put(self, file_path: Path, result: Any):
+        """Store the result for file_path under its current mtime and size."""
+        try:
+            path, mtime_ns, size = self._key(file_path)
+        except OSError:
+            return
+
+        self._entries.pop(path, None)
+        self._entries[path] = (mtime_ns, size, result)
+        self._dirty = True
+
+    def save(self):
+        """Write the cache back to disk if anything changed."""
+        if not self._dirty:
+            return
+
+        self._entries = {path: entry for path, entry in self._entries.items()
+                         if os.path.exists(path)}
+        if len(self._entries) > MAX_CACHE_ENTRIES:
+            self._entries = dict(list(self._entries.items())[-MAX_CACHE_ENTRIES:])
+
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": self.version, "entries": self._entries}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Go source discovery for Bubble Tea maintenance agent.
+Walks a tree with os.scandir instead of Path.glob('**/*.go').
+"""
+
+import os
+import re
+import fnmatch
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Directories that never hold the project's own Go sources
+SKIP_DIR_NAMES = frozenset({'.git', 'node_modules', 'vendor'})
+
+# Third-party copies, test fixtures, tests and generated code: rarely where
+# user-fixable issues live, and often most of a large repository
+GENERATED_DIR_NAMES = frozenset({'third_party', 'testdata'})
+GENERATED_FILE_SUFFIXES = ('.pb.go', '_generated.go', '_test.go', '.gen.go')
+
+# Files over this size are skipped unread when walking a tree: a Go file this
+# large is almost always generated, and would dominate a run on its own
+MAX_GO_FILE_SIZE = 256 * 1024
+
+# Go's marker for generated sources, looked for at the top of each file
+GENERATED_MARKER = b'// Code generated '
+GENERATED_HEADER_SIZE = 1024
+
+
+@lru_cache(maxsize=64)
+def compile_globs(patterns: Tuple[str, ...]) -> 're.Pattern':
+    """Compile glob patterns once into a single regex matching any of them."""
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def iter_go_files(root: Path, skip_dirs: Iterable[str] = SKIP_DIR_NAMES,
+                  skip_suffixes: Tuple[str, ...] = (),
+                  skipped: Optional[Dict[str, int]] = None,
+                  exclude: Tuple[str, ...] = ()) -> Iterator[Path]:
+    """
+    Yield every .go file under root.
+
+    Uses the file type cached in each directory entry, so only directories
+    cost a syscall and no Path is built for skipped entries. Files in a
+    directory are yielded before its subdirectories are entered, matching
+    the order of Path.glob('**/*.go'). Unreadable directories are skipped.
+
+    Args:
+        root: Directory to walk
+        skip_dirs: Directory names that are not descended into
+        skip_suffixes: File name endings (e.g. '_test.go') to leave out
+        skipped: If given, counts of pruned 'directories' and 'files' are
+            added to it
+        exclude: Glob patterns (e.g. 'internal/gen/*') for files to leave
+            out, matched against the path relative to root
+    """
+    skip_dirs = frozenset(skip_dirs)
+    excluded = compile_globs(tuple(exclude)).match if exclude else None
+    prefix_len = len(os.path.join(str(root), ''))
+    skipped_dirs = 0
+    skipped_files = 0
+
+    stack = [str(root)]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in skip_dirs:
+                            skipped_dirs += 1
+                        else:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.go'):
+                        if skip_suffixes and entry.name.endswith(skip_suffixes):
+                            skipped_files += 1
+                        elif excluded is not None and excluded(entry.path[prefix_len:]):
+                            skipped_files += 1
+                        else:
+                            yield Path(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+    if skipped is not None:
+        skipped['directories'] = skipped.get('directories', 0) + skipped_dirs
+        skipped['files'] = skipped.get('files', 0) + skipped_files
+
+
+def is_skipped_go_file(path: Path, max_file_size: Optional[int] = None,
+                       skip_generated: bool = False) -> bool:
+    """
+    Check whether a Go file is over max_file_size or, with skip_generated,
+    carries a "// Code generated" header.
+
+    At most the header is read. Files that can't be opened are not
+    skipped here, so the caller's own read reports or drops them.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if max_file_size is not None and os.fstat(f.fileno()).st_size > max_file_size:
+                return True
+            return skip_generated and GENERATED_MARKER in f.read(GENERATED_HEADER_SIZE)
+    except OSError:
+        return False
+
+
+def collect_go_files(path: Path, include_generated: bool = False,
+                     max_file_size: Optional[int] = MAX_GO_FILE_SIZE,
+                     exclude: Iterable[str] = (),
+                     skipped: Optional[Dict[str, int]] = None) -> List[Path]:
+    """
+    Return the Go files an analyzer should read for path.
+
+    The analyzers' entry points all take these options, so they choose
+    files the same way. A .go file named explicitly is always returned.
+    Under a directory, SKIP_DIR_NAMES are never entered; unless
+    include_generated, tests, generated code and third_party/testdata are
+    left out too, including files with a "// Code generated" header.
+
+    Args:
+        path: Go file or directory
+        include_generated: Keep tests and generated code
+        max_file_size: Leave out files larger than this many bytes (None
+            for no limit)
+        exclude: Glob patterns for files to leave out, matched against the
+            path relative to path
+        skipped: If given, counts of pruned 'directories' and 'files' are
+            added to it
+    """
+    if path.is_file():
+        return [path] if path.suffix == '.go' else []
+
+    if include_generated:
+        go_files = iter_go_files(path, skipped=skipped, exclude=tuple(exclude))
+    else:
+        go_files = iter_go_files(path, SKIP_DIR_NAMES | GENERATED_DIR_NAMES,
+                                 GENERATED_FILE_SUFFIXES, skipped, tuple(exclude))
+    if max_file_size is None and include_generated:
+        return list(go_files)
+
+    kept = []
+    dropped = 0
+    for go_file in go_files:
+        if is_skipped_go_file(go_file, max_file_size, not include_generated):
+            dropped += 1
+        else:
+            kept.append(go_file)
+    if skipped is not None:
+        skipped['files'] = skipped.get('files', 0) + dropped
+    return kept
+
+
+def prefetch_files(paths: Iterable[Path]):
+    """
+    Ask the kernel to start reading files into the page cache.
+
+    Only a hint: reads queued this way proceed in the background while
+    the caller gets on with other work, so later reads of cold files do
+    not each block in turn. Does nothing where posix_fadvise is not
+    available; files that can't be opened are skipped.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
@@ -4,17 +4,61 @@ Go code parser utilities for Bubble Tea maintenance agent.
 Extracts models, functions, types, and code structure.
 """
 
+import os
 import re
-from typing import Dict, List, Tuple, Optional
+import copy
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Set, Tuple
 from pathlib import Path
 
-
-def extract_model_struct(content: str) -> Optional[Dict[str, any]]:
+from utils.analysis_cache import cache_enabled
+
+
+# Compiled regex patterns, shared by every call
+_RE_MODEL_STRUCT = re.compile(r'type\s+(\w*[Mm]odel)\s+struct\s*\{([^}]+)\}', re.DOTALL)
+# Field declarations (name type [tag]), one per line. A field name can't
+# start with '/', so blank and // comment lines never match.
+_RE_MODEL_FIELD = re.compile(r'^[^\S\n]*(\w+)[^\S\n]+([^\s`]+)(?:[^\S\n]+`([^`\n]+)`)?', re.MULTILINE)
+_RE_UPDATE_FUNC = re.compile(
+    r'func\s+\((\w+)\s+(\*?)(\w+)\)\s+Update\s*\([^)]*\)\s*\([^)]*\)\s*\{(.+?)(?=\nfunc\s|\Z)',
+    re.DOTALL | re.MULTILINE)
+_RE_VIEW_FUNC = re.compile(
+    r'func\s+\((\w+)\s+(\*?)(\w+)\)\s+View\s*\(\s*\)\s+string\s*\{(.+?)(?=\nfunc\s|\Z)',
+    re.DOTALL | re.MULTILINE)
+_RE_INIT_FUNC = re.compile(
+    r'func\s+\((\w+)\s+(\*?)(\w+)\)\s+Init\s*\(\s*\)\s+tea\.Cmd\s*\{(.+?)(?=\nfunc\s|\Z)',
+    re.DOTALL | re.MULTILINE)
+_RE_CASE = re.compile(r'\bcase\s+')
+_RE_CASE_MSG = re.compile(r'case\s+(\w+\.?\w*):')
+_RE_STRING_CONCAT = re.compile(r'\+\s*"')
+_RE_LIPGLOSS_CALL = re.compile(r'lipgloss\.')
+_RE_CUSTOM_MSG = re.compile(r'type\s+(\w+Msg)\s+struct\s*\{([^}]*)\}', re.DOTALL)
+_RE_MSG_FIELD = re.compile(r'^[^\S\n]*(\w+)[^\S\n]+(\S+)', re.MULTILINE)
+_RE_TEA_CMD = re.compile(r'func\s+(\w+)\s*\(\s*\)\s+tea\.Msg\s*\{(.+?)^\}', re.DOTALL | re.MULTILINE)
+# Blocking calls in a command body, all found in a single pass
+_RE_BLOCKING_CALL = re.compile(
+    r'(?P<http>\bhttp\.(?:Get|Post|Do))'
+    r'|(?P<sleep>time\.Sleep)'
+    r'|(?P<io>\bos\.(?:Open|Read|Write))'
+)
+_RE_SINGLE_IMPORT = re.compile(r'import\s+"([^"]+)"')
+_RE_IMPORT_BLOCK = re.compile(r'import\s+\(([^)]+)\)', re.DOTALL)
+_RE_QUOTED = re.compile(r'"([^"]+)"')
+_RE_STATE_TYPE = re.compile(r'type\s+(\w+State)\s+(int|string)')
+_RE_CONST_BLOCK = re.compile(r'const\s+\(([^)]+)\)', re.DOTALL)
+
+# Bubble Tea components, whose types are '<name>.Model'. No name ends with
+# another, so each '.Model' belongs to at most one component.
+_COMPONENT_NAMES = ("list", "viewport", "textinput", "textarea", "table", "progress",
+                    "spinner", "timer", "stopwatch", "filepicker", "paginator")
+_COMPONENT_SUFFIX = '.Model'
+
+
+def extract_model_struct(content: str) -> Optional[Dict[str, Any]]:
     """Extract the main model struct from Go code."""
 
     # Pattern: type XxxModel struct { ... }
-    pattern = r'type\s+(\w*[Mm]odel)\s+struct\s*\{([^}]+)\}'
-    match = re.search(pattern, content, re.DOTALL)
+    match = _RE_MODEL_STRUCT.search(content)
 
     if not match:
         return None
@@ -22,21 +66,15 @@ def extract_model_struct(content: str) -> Optional[Dict[str, any]]:
     model_name = match.group(1)
     model_body = match.group(2)
 
-    # Parse fields
-    fields = []
-    for line in model_body.split('\n'):
-        line = line.strip()
-        if not line or line.startswith('//'):
-            continue
-
-        # Parse field: name type [tag]
-        field_match = re.match(r'(\w+)\s+([^\s`]+)(?:\s+`([^`]+)`)?', line)
-        if field_match:
-            fields.append({
-                "name": field_match.group(1),
-                "type": field_match.group(2),
-                "tag": field_match.group(3) if field_match.group(3) else None
-            })
+    # Parse fields: name type [tag]
+    fields = [
+        {
+            "name": field_match.group(1),
+            "type": field_match.group(2),
+            "tag": field_match.group(3)
+        }
+        for field_match in _RE_MODEL_FIELD.finditer(model_body)
+    ]
 
     return {
         "name": model_name,
@@ -46,12 +84,13 @@ def extract_model_struct(content: str) -> Optional[Dict[str, any]]:
     }
 
 
-def extract_update_function(content: str) -> Optional[Dict[str, any]]:
+def extract_update_function(content: str) -> Optional[Dict[str, Any]]:
     """Extract the Update() function."""
 
-    # Find Update function
-    pattern = r'func\s+\((\w+)\s+(\*?)(\w+)\)\s+Update\s*\([^)]*\)\s*\([^)]*\)\s*\{(.+?)(?=\nfunc\s|\Z)'
-    match = re.search(pattern, content, re.DOTALL | re.MULTILINE)
+    # Find Update function, skipping the regex when the name never appears
+    if 'Update' not in content:
+        return None
+    match = _RE_UPDATE_FUNC.search(content)
 
     if not match:
         return None
@@ -62,27 +101,28 @@ def extract_update_function(content: str) -> Optional[Dict[str, any]]:
     function_body = match.group(4)
 
     # Count cases in switch statements
-    case_count = len(re.findall(r'\bcase\s+', function_body))
+    case_count = len(_RE_CASE.findall(function_body))
 
     # Find message types handled
-    handled_messages = re.findall(r'case\s+(\w+\.?\w*):', function_body)
+    handled_messages = _RE_CASE_MSG.findall(function_body)
 
     return {
         "receiver_name": receiver_name,
         "receiver_type": receiver_type,
         "is_pointer_receiver": is_pointer,
-        "body_lines": len(function_body.split('\n')),
+        "body_lines": function_body.count('\n') + 1,
         "case_count": case_count,
         "handled_messages": list(set(handled_messages)),
         "raw_body": function_body
     }
 
 
-def extract_view_function(content: str) -> Optional[Dict[str, any]]:
+def extract_view_function(content: str) -> Optional[Dict[str, Any]]:
     """Extract the View() function."""
 
-    pattern = r'func\s+\((\w+)\s+(\*?)(\w+)\)\s+View\s*\(\s*\)\s+string\s*\{(.+?)(?=\nfunc\s|\Z)'
-    match = re.search(pattern, content, re.DOTALL | re.MULTILINE)
+    if 'View' not in content:
+        return None
+    match = _RE_VIEW_FUNC.search(content)
 
     if not match:
         return None
@@ -93,25 +133,26 @@ def extract_view_function(content: str) -> Optional[Dict[str, any]]:
     function_body = match.group(4)
 
     # Analyze complexity
-    string_concat_count = len(re.findall(r'\+\s*"', function_body))
-    lipgloss_calls = len(re.findall(r'lipgloss\.', function_body))
+    string_concat_count = len(_RE_STRING_CONCAT.findall(function_body))
+    lipgloss_calls = len(_RE_LIPGLOSS_CALL.findall(function_body))
 
     return {
         "receiver_name": receiver_name,
         "receiver_type": receiver_type,
         "is_pointer_receiver": is_pointer,
-        "body_lines": len(function_body.split('\n')),
+        "body_lines": function_body.count('\n') + 1,
         "string_concatenations": string_concat_count,
         "lipgloss_calls": lipgloss_calls,
         "raw_body": function_body
     }
 
 
-def extract_init_function(content: str) -> Optional[Dict[str, any]]:
+def extract_init_function(content: str) -> Optional[Dict[str, Any]]:
     """Extract the Init() function."""
 
-    pattern = r'func\s+\((\w+)\s+(\*?)(\w+)\)\s+Init\s*\(\s*\)\s+tea\.Cmd\s*\{(.+?)(?=\nfunc\s|\Z)'
-    match = re.search(pattern, content, re.DOTALL | re.MULTILINE)
+    if 'Init' not in content:
+        return None
+    match = _RE_INIT_FUNC.search(content)
 
     if not match:
         return None
@@ -125,17 +166,16 @@ def extract_init_function(content: str) -> Optional[Dict[str, any]]:
         "receiver_name": receiver_name,
         "receiver_type": receiver_type,
         "is_pointer_receiver": is_pointer,
-        "body_lines": len(function_body.split('\n')),
+        "body_lines": function_body.count('\n') + 1,
         "raw_body": function_body
     }
 
 
-def extract_custom_messages(content: str) -> List[Dict[str, any]]:
+def extract_custom_messages(content: str) -> List[Dict[str, Any]]:
     """Extract custom message type definitions."""
 
     # Pattern: type xxxMsg struct { ... }
-    pattern = r'type\s+(\w+Msg)\s+struct\s*\{([^}]*)\}'
-    matches = re.finditer(pattern, content, re.DOTALL)
+    matches = _RE_CUSTOM_MSG.finditer(content)
 
     messages = []
     for match in matches:
@@ -143,18 +183,13 @@ def extract_custom_messages(content: str) -> List[Dict[str, any]]:
         msg_body = match.group(2)
 
         # Parse fields
-        fields = []
-        for line in msg_body.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('//'):
-                continue
-
-            field_match = re.match(r'(\w+)\s+([^\s]+)', line)
-            if field_match:
-                fields.append({
-                    "name": field_match.group(1),
-                    "type": field_match.group(2)
-                })
+        fields = [
+            {
+                "name": field_match.group(1),
+                "type": field_match.group(2)
+            }
+            for field_match in _RE_MSG_FIELD.finditer(msg_body)
+        ]
 
         messages.append({
             "name": msg_name,
@@ -165,12 +200,11 @@ def extract_custom_messages(content: str) -> List[Dict[str, any]]:
     return messages
 
 
-def extract_tea_commands(content: str) -> List[Dict[str, any]]:
+def extract_tea_commands(content: str) -> List[Dict[str, Any]]:
     """Extract tea.Cmd functions."""
 
     # Pattern: func xxxCmd() tea.Msg { ... }
-    pattern = r'func\s+(\w+)\s*\(\s*\)\s+tea\.Msg\s*\{(.+?)^\}'
-    matches = re.finditer(pattern, content, re.DOTALL | re.MULTILINE)
+    matches = _RE_TEA_CMD.finditer(content)
 
     commands = []
     for match in matches:
@@ -178,96 +212,166 @@ def extract_tea_commands(content: str) -> List[Dict[str, any]]:
         cmd_body = match.group(2)
 
         # Check for blocking operations
-        has_http = bool(re.search(r'\bhttp\.(Get|Post|Do)', cmd_body))
-        has_sleep = bool(re.search(r'time\.Sleep', cmd_body))
-        has_io = bool(re.search(r'\bos\.(Open|Read|Write)', cmd_body))
+        found: Set[Optional[str]] = set()
+        for call in _RE_BLOCKING_CALL.finditer(cmd_body):
+            found.add(call.lastgroup)
+            if len(found) == 3:
+                break
 
         commands.append({
             "name": cmd_name,
-            "body_lines": len(cmd_body.split('\n')),
-            "has_http": has_http,
-            "has_sleep": has_sleep,
-            "has_io": has_io,
-            "is_blocking": has_http or has_io  # sleep is expected in commands
+            "body_lines": cmd_body.count('\n') + 1,
+            "has_http": 'http' in found,
+            "has_sleep": 'sleep' in found,
+            "has_io": 'io' in found,
+            "is_blocking": 'http' in found or 'io' in found  # sleep is expected in commands
         })
 
     return commands
 
 
 def extract_imports(content: str) -> List[str]:
-    """Extract import statements."""
+    """Extract import statements, each once, in the order first seen."""
 
-    imports = []
+    # Keys of a dict serve as an ordered set
+    imports: Dict[str, None] = {}
 
     # Single import
-    single_pattern = r'import\s+"([^"]+)"'
-    imports.extend(re.findall(single_pattern, content))
+    for match in _RE_SINGLE_IMPORT.finditer(content):
+        imports[match.group(1)] = None
 
     # Multi-line import block
-    block_pattern = r'import\s+\(([^)]+)\)'
-    block_matches = re.finditer(block_pattern, content, re.DOTALL)
-    for match in block_matches:
-        block_content = match.group(1)
+    for match in _RE_IMPORT_BLOCK.finditer(content):
         # Extract quoted imports
-        quoted = re.findall(r'"([^"]+)"', block_content)
-        imports.extend(quoted)
+        for quoted in _RE_QUOTED.findall(match.group(1)):
+            imports[quoted] = None
 
-    return list(set(imports))
+    return list(imports)
 
 
-def find_bubbletea_components(content: str) -> List[Dict[str, any]]:
+def find_bubbletea_components(content: str) -> List[Dict[str, Any]]:
     """Find usage of Bubble Tea components (list, viewport, etc.)."""
 
-    components = []
-
-    component_patterns = {
-        "list": r'list\.Model',
-        "viewport": r'viewport\.Model',
-        "textinput": r'textinput\.Model',
-        "textarea": r'textarea\.Model',
-        "table": r'table\.Model',
-        "progress": r'progress\.Model',
-        "spinner": r'spinner\.Model',
-        "timer": r'timer\.Model',
-        "stopwatch": r'stopwatch\.Model',
-        "filepicker": r'filepicker\.Model',
-        "paginator": r'paginator\.Model',
-    }
-
-    for comp_name, pattern in component_patterns.items():
-        if re.search(pattern, content):
-            # Count occurrences
-            count = len(re.findall(pattern, content))
-            components.append({
-                "component": comp_name,
-                "occurrences": count
-            })
-
-    return components
-
-
-def analyze_code_structure(file_path: Path) -> Dict[str, any]:
-    """Comprehensive code structure analysis."""
-
+    # Count occurrences in one pass: find each '.Model' and look up the
+    # component name in front of it. As with counting each type on its own,
+    # an occurrence overlapping the last one of the same type is skipped
+    # (e.g. the second list.Model in 'list.Modelist.Model').
+    counts: Dict[str, int] = {}
+    ends: Dict[str, int] = {}
+    pos = content.find(_COMPONENT_SUFFIX)
+    while pos >= 0:
+        if content.endswith(_COMPONENT_NAMES, 0, pos):
+            for comp_name in _COMPONENT_NAMES:
+                if content.endswith(comp_name, 0, pos):
+                    if pos - len(comp_name) >= ends.get(comp_name, 0):
+                        counts[comp_name] = counts.get(comp_name, 0) + 1
+                        ends[comp_name] = pos + len(_COMPONENT_SUFFIX)
+                    break
+        pos = content.find(_COMPONENT_SUFFIX, pos + len(_COMPONENT_SUFFIX))
+
+    return [
+        {
+            "component": comp_name,
+            "occurrences": counts[comp_name]
+        }
+        for comp_name in _COMPONENT_NAMES if comp_name in counts
+    ]
+
+
+# Fields of analyze_code_structure's result, in order, with the function
+# that computes each from the file content
+_ANALYSIS_FIELDS: Dict[str, Callable[[str], Any]] = {
+    "model": extract_model_struct,
+    "update": extract_update_function,
+    "view": extract_view_function,
+    "init": extract_init_function,
+    "custom_messages": extract_custom_messages,
+    "tea_commands": extract_tea_commands,
+    "imports": extract_imports,
+    "components": find_bubbletea_components,
+    "file_size": len,
+    "line_count": lambda content: content.count('\n') + 1,
+    "uses_lipgloss": lambda content: '"github.com/charmbracelet/lipgloss"' in content,
+    "uses_bubbletea": lambda content: '"github.com/charmbracelet/bubbletea"' in content,
+}
+
+
+class LazyAnalysis(Mapping[str, Any]):
+    """
+    Read-only mapping of a file's code structure, computing each field
+    on first access.
+
+    Callers that only look at a few fields don't pay for the rest. A view
+    of a shared analysis takes its fields from there, copied, so each is
+    still computed only once. Use dict() on it where a real dict is needed,
+    e.g. for json.dumps or item assignment.
+    """
+
+    def __init__(self, content: str, shared: Optional['LazyAnalysis'] = None):
+        self._content = content
+        self._shared = shared
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        if self._shared is not None:
+            # Copied so callers can't change the shared result
+            value = copy.deepcopy(self._shared[key])
+        else:
+            value = _ANALYSIS_FIELDS[key](self._content)
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_ANALYSIS_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_ANALYSIS_FIELDS)
+
+
+def analyze_code_structure(file_path: Path, use_cache: bool = True) -> Mapping[str, Any]:
+    """
+    Comprehensive code structure analysis.
+
+    Returns a LazyAnalysis, whose fields are only computed when read, or
+    a dict with an error if the file can't be read. Use dict() on the
+    result to compute every field.
+
+    With use_cache, the analysis from an earlier call in this process is
+    reused if the file's mtime and size haven't changed since.
+    """
+    if use_cache and cache_enabled():
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            pass
+        else:
+            shared = _analyze_file_version(os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+            if isinstance(shared, LazyAnalysis):
+                return LazyAnalysis(shared._content, shared)
+            return copy.deepcopy(shared)
+
+    return _analyze_code_structure(file_path)
+
+
+@lru_cache(maxsize=256)
+def _analyze_file_version(path: str, mtime_ns: int, size: int) -> Mapping[str, Any]:
+    """Analyze path, remembering the result for this mtime and size."""
+    return _analyze_code_structure(Path(path))
+
+
+def _analyze_code_structure(file_path: Path) -> Mapping[str, Any]:
+    """Read one file for analysis."""
     try:
         content = file_path.read_text()
     except Exception as e:
         return {"error": str(e)}
 
-    return {
-        "model": extract_model_struct(content),
-        "update": extract_update_function(content),
-        "view": extract_view_function(content),
-        "init": extract_init_function(content),
-        "custom_messages": extract_custom_messages(content),
-        "tea_commands": extract_tea_commands(content),
-        "imports": extract_imports(content),
-        "components": find_bubbletea_components(content),
-        "file_size": len(content),
-        "line_count": len(content.split('\n')),
-        "uses_lipgloss": '"github.com/charmbracelet/lipgloss"' in content,
-        "uses_bubbletea": '"github.com/charmbracelet/bubbletea"' in content
-    }
+    return LazyAnalysis(content)
 
 
 def find_function_by_name(content: str, func_name: str) -> Optional[str]:
@@ -281,12 +385,11 @@ def find_function_by_name(content: str, func_name: str) -> Optional[str]:
     return None
 
 
-def extract_state_machine_states(content: str) -> Optional[Dict[str, any]]:
+def extract_state_machine_states(content: str) -> Optional[Dict[str, Any]]:
     """Extract state machine enum if present."""
 
     # Pattern: type xxxState int; const ( state1 state2 = iota ... )
-    state_type_pattern = r'type\s+(\w+State)\s+(int|string)'
-    state_type_match = re.search(state_type_pattern, content)
+    state_type_match = _RE_STATE_TYPE.search(content)
 
     if not state_type_match:
         return None
@@ -294,8 +397,7 @@ def extract_state_machine_states(content: str) -> Optional[Dict[str, any]]:
     state_type = state_type_match.group(1)
 
     # Find const block with iota
-    const_pattern = rf'const\s+\(([^)]+)\)'
-    const_matches = re.finditer(const_pattern, content, re.DOTALL)
+    const_matches = _RE_CONST_BLOCK.finditer(content)
 
     states = []
     for const_match in const_matches:
@@ -325,4 +427,4 @@ if __name__ == "__main__":
     result = analyze_code_structure(file_path)
 
     import json
-    print(json.dumps(result, indent=2))
+    print(json.dumps(dict(result), indent=2))
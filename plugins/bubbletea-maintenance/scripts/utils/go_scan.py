@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Byte-level Go source scanning for Bubble Tea maintenance agent.
+Helpers shared by the analyzers that scan files as bytes.
+"""
+
+import re
+import bisect
+from typing import List, Optional
+
+
+# Opening of a model struct declaration, up to and including its '{'
+_RE_MODEL_HEADER = re.compile(rb'type\s+\w*[Mm]odel\s+struct\s*\{')
+
+
+def find_model_body(content: bytes) -> Optional[bytes]:
+    """
+    Return the body of the first non-empty model struct in content.
+
+    Braces are balanced, so nested struct types and struct literals in
+    field tags do not end the body early.
+    """
+    for header in _RE_MODEL_HEADER.finditer(content):
+        start = header.end()
+        depth = 1
+        pos = start
+        while depth:
+            close = content.find(b'}', pos)
+            if close < 0:
+                return None
+            nested = content.find(b'{', pos, close)
+            if nested >= 0:
+                depth += 1
+                pos = nested + 1
+            else:
+                depth -= 1
+                pos = close + 1
+
+        if close > start:
+            return content[start:close]
+
+    return None
+
+
+def newline_offsets(content: bytes) -> List[int]:
+    """Return the offset of every newline in content, in ascending order."""
+    offsets = []
+    idx = content.find(b'\n')
+    while idx >= 0:
+        offsets.append(idx)
+        idx = content.find(b'\n', idx + 1)
+    return offsets
+
+
+def line_index(nl_offsets: List[int], pos: int) -> int:
+    """Return the 0-based line number containing offset pos."""
+    return bisect.bisect_left(nl_offsets, pos)
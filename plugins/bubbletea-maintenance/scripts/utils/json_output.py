@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+JSON output for Bubble Tea maintenance agent scripts.
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(result: Any) -> str:
+    """
+    Serialize a result dict as JSON indented by two spaces.
+
+    Both paths give the same text: non-ASCII characters such as the emoji
+    in summaries are written as-is, and non-string keys become strings.
+    """
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(result, indent=2, ensure_ascii=False)
@@ -6,6 +6,26 @@ Common validation utilities for Bubble Tea maintenance agent.
 from typing import Dict, List, Any, Optional
 
 
+# Allowed values, built once for every validation call
+_VALID_ISSUE_SEVERITIES = frozenset({"CRITICAL", "HIGH", "MEDIUM", "WARNING", "LOW", "INFO"})
+_VALID_BOTTLENECK_SEVERITIES = frozenset({"CRITICAL", "HIGH", "MEDIUM", "LOW"})
+_VALID_BOTTLENECK_CATEGORIES = frozenset({"performance", "memory", "io", "rendering"})
+_VALID_TIP_STATUSES = frozenset({"pass", "fail", "warning", "info"})
+
+
+def _is_one_of(value: Any, allowed: frozenset) -> bool:
+    """
+    Check value is one of the allowed strings.
+
+    Plain strings are looked up in the set. Anything else is compared with
+    == against each member, as a list lookup would, so values that merely
+    equal a member still pass and unhashable values don't raise.
+    """
+    if type(value) is str:
+        return value in allowed
+    return any(value == member for member in allowed)
+
+
 def validate_result_structure(result: Dict[str, Any], required_keys: List[str]) -> Dict[str, Any]:
     """
     Validate that a result dictionary has required keys.
@@ -41,7 +61,7 @@ def validate_result_structure(result: Dict[str, Any], required_keys: List[str])
     }
 
 
-def validate_issue_list(issues: List[Dict[str, Any]]) -> Dict[str, Any]:
+def validate_issue_list(issues: List[Dict[str, Any]], fast_fail: bool = False) -> Dict[str, Any]:
     """
     Validate a list of issues has proper structure.
 
@@ -52,6 +72,9 @@ def validate_issue_list(issues: List[Dict[str, Any]]) -> Dict[str, Any]:
     - location: File path and line number
     - explanation: Why it's a problem
     - fix: How to fix it
+
+    With fast_fail, checking stops after the first malformed issue, so
+    checks only cover the issues up to it.
     """
     if not isinstance(issues, list):
         return {
@@ -61,7 +84,6 @@ def validate_issue_list(issues: List[Dict[str, Any]]) -> Dict[str, Any]:
         }
 
     required_fields = ["severity", "issue", "location", "explanation"]
-    valid_severities = ["CRITICAL", "HIGH", "MEDIUM", "WARNING", "LOW", "INFO"]
 
     checks = {
         "is_list": True,
@@ -73,13 +95,16 @@ def validate_issue_list(issues: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
     for issue in issues:
+        if fast_fail and not all(checks.values()):
+            break
+
         if not isinstance(issue, dict):
             checks["is_list"] = False
             continue
 
         if "severity" not in issue:
             checks["all_have_severity"] = False
-        elif issue["severity"] not in valid_severities:
+        elif not _is_one_of(issue["severity"], _VALID_ISSUE_SEVERITIES):
             checks["valid_severity_values"] = False
 
         if "issue" not in issue or not issue["issue"]:
@@ -165,7 +190,6 @@ def validate_best_practices_compliance(compliance: Dict[str, Dict[str, Any]]) ->
         }
 
     required_tip_fields = ["status", "score", "message"]
-    valid_statuses = ["pass", "fail", "warning", "info"]
 
     checks = {
         "has_tips": len(compliance) > 0,
@@ -183,7 +207,7 @@ def validate_best_practices_compliance(compliance: Dict[str, Dict[str, Any]]) ->
             if field not in tip_data:
                 checks["all_tips_valid"] = False
 
-        if tip_data.get("status") not in valid_statuses:
+        if not _is_one_of(tip_data.get("status"), _VALID_TIP_STATUSES):
             checks["valid_statuses"] = False
 
         if not validate_score(tip_data.get("score", -1)):
@@ -201,8 +225,13 @@ def validate_best_practices_compliance(compliance: Dict[str, Dict[str, Any]]) ->
     }
 
 
-def validate_bottlenecks(bottlenecks: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Validate performance bottleneck list."""
+def validate_bottlenecks(bottlenecks: List[Dict[str, Any]], fast_fail: bool = False) -> Dict[str, Any]:
+    """
+    Validate performance bottleneck list.
+
+    With fast_fail, checking stops after the first malformed bottleneck,
+    so checks only cover the bottlenecks up to it.
+    """
     if not isinstance(bottlenecks, list):
         return {
             "status": "error",
@@ -211,8 +240,6 @@ def validate_bottlenecks(bottlenecks: List[Dict[str, Any]]) -> Dict[str, Any]:
         }
 
     required_fields = ["severity", "category", "issue", "location", "explanation", "fix"]
-    valid_severities = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
-    valid_categories = ["performance", "memory", "io", "rendering"]
 
     checks = {
         "is_list": True,
@@ -224,18 +251,21 @@ def validate_bottlenecks(bottlenecks: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
     for bottleneck in bottlenecks:
+        if fast_fail and not all(checks.values()):
+            break
+
         if not isinstance(bottleneck, dict):
             checks["is_list"] = False
             continue
 
         if "severity" not in bottleneck:
             checks["all_have_severity"] = False
-        elif bottleneck["severity"] not in valid_severities:
+        elif not _is_one_of(bottleneck["severity"], _VALID_BOTTLENECK_SEVERITIES):
             checks["valid_severities"] = False
 
         if "category" not in bottleneck:
             checks["all_have_category"] = False
-        elif bottleneck["category"] not in valid_categories:
+        elif not _is_one_of(bottleneck["category"], _VALID_BOTTLENECK_CATEGORIES):
             checks["valid_categories"] = False
 
         if "fix" not in bottleneck or not bottleneck["fix"]:
@@ -284,8 +314,13 @@ def validate_architecture_analysis(result: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def validate_layout_fixes(fixes: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Validate layout fix list."""
+def validate_layout_fixes(fixes: List[Dict[str, Any]], fast_fail: bool = False) -> Dict[str, Any]:
+    """
+    Validate layout fix list.
+
+    With fast_fail, checking stops after the first malformed fix, so
+    checks only cover the fixes up to it.
+    """
     if not isinstance(fixes, list):
         return {
             "status": "error",
@@ -303,6 +338,9 @@ def validate_layout_fixes(fixes: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
     for fix in fixes:
+        if fast_fail and not all(checks.values()):
+            break
+
         if not isinstance(fix, dict):
             checks["is_list"] = False
             continue
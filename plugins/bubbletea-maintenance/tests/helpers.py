@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for the Bubble Tea maintenance tests.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+# An Update() that blocks on time.Sleep
+SLOW_CODE = 'package main\n\nfunc (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {\n    time.Sleep(time.Second)\n    return m, nil\n}\n'
+
+
+@contextmanager
+def isolated_cache_home():
+    """
+    Point XDG_CACHE_HOME at a temporary directory while the block runs, so
+    analyzers called with their default cache never write to the real one.
+
+    Yields the analyzers' cache directory inside it.
+    """
+    old_cache_home = os.environ.get('XDG_CACHE_HOME')
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['XDG_CACHE_HOME'] = tmp
+        try:
+            yield Path(tmp) / 'bubbletea-maintenance'
+        finally:
+            if old_cache_home is None:
+                os.environ.pop('XDG_CACHE_HOME', None)
+            else:
+                os.environ['XDG_CACHE_HOME'] = old_cache_home
+
+
+# How the file-analyzer checks below call an analyzer and read its result:
+# analyze(path, **options) -> result, findings(result) -> list of findings,
+# file_counts(result) -> dict holding files_analyzed
+Analyze = Callable[..., Dict[str, Any]]
+Findings = Callable[[Dict[str, Any]], List[Any]]
+
+
+def check_parallel_matches_serial(analyze: Analyze, findings: Findings, file_counts: Callable,
+                                  code: str, file_count: int = 40) -> Dict[str, Any]:
+    """
+    Analyze a tree large enough to go to worker processes, and check that
+    every file gives the findings it gives on its own. Returns the result.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        single = Path(tmp) / "single.go"
+        single.write_text(code)
+        expected = len(findings(analyze(str(single), use_cache=False)))
+
+        tree = Path(tmp) / "tree"
+        tree.mkdir()
+        for i in range(file_count):
+            (tree / f"file{i}.go").write_text(code)
+
+        result = analyze(str(tree), use_cache=False)
+
+    assert expected > 0, "Fixture should produce findings"
+    assert len(findings(result)) == expected * file_count, "Every file should be analyzed once"
+    assert file_counts(result)['files_analyzed'] == file_count
+
+    return result
+
+
+def check_vendor_skipped(analyze: Analyze, findings: Findings, file_counts: Callable,
+                         code: str) -> Dict[str, Any]:
+    """Check that a vendored copy of code is not analyzed. Returns the result."""
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "main.go").write_text(code)
+        vendor = Path(tmp) / "vendor" / "lib"
+        vendor.mkdir(parents=True)
+        (vendor / "lib.go").write_text(code)
+
+        result = analyze(tmp, use_cache=False)
+
+    assert file_counts(result)['files_analyzed'] == 1, "vendor/ should be skipped"
+    assert all(f['location'].startswith('main.go') for f in findings(result))
+
+    return result
+
+
+def check_cache_reuses_unchanged_files(analyze: Analyze, findings: Findings, cache_name: str,
+                                       code: str, changed_code: str) -> List[Any]:
+    """
+    Check that cached findings for code are reused, and dropped once the
+    file changes to changed_code. Returns the cached findings.
+    """
+    with tempfile.TemporaryDirectory() as tmp, isolated_cache_home() as cache:
+        test_file = Path(tmp) / "main.go"
+        test_file.write_text(code)
+
+        first = analyze(str(test_file))
+        assert (cache / f'{cache_name}.pkl').exists(), "Cache should be written"
+
+        second = analyze(str(test_file))
+        assert second == first, "Cached run should match"
+
+        test_file.write_text(changed_code)
+        third = analyze(str(test_file))
+        expected = analyze(str(test_file), use_cache=False)
+        assert findings(third) != findings(first), "Fixtures should give different findings"
+        assert third == expected, "Changed file should be re-analyzed"
+
+    return findings(first)
@@ -4,12 +4,17 @@ Tests for diagnose_issue.py
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
 # Add scripts to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
 
-from diagnose_issue import diagnose_issue, _check_blocking_operations, _check_hardcoded_dimensions
+from diagnose_issue import diagnose_issue, _check_blocking_operations, _check_hardcoded_dimensions, _check_model_complexity
+from helpers import (
+    SLOW_CODE, check_cache_reuses_unchanged_files, check_parallel_matches_serial,
+    check_vendor_skipped, isolated_cache_home,
+)
 
 
 def test_diagnose_issue_basic():
@@ -39,7 +44,8 @@ func (m model) View() string {
     test_file = Path("/tmp/test_bubbletea_app.go")
     test_file.write_text(test_code)
 
-    result = diagnose_issue(str(test_file))
+    with isolated_cache_home():
+        result = diagnose_issue(str(test_file))
 
     assert 'issues' in result, "Missing 'issues' key"
     assert 'health_score' in result, "Missing 'health_score' key"
@@ -71,8 +77,8 @@ func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
 }
 '''
 
-    lines = test_code.split('\n')
-    issues = _check_blocking_operations(test_code, lines, "test.go")
+    content = test_code.encode()
+    issues = _check_blocking_operations(content, "test.go")
 
     assert len(issues) > 0, "Should detect blocking HTTP request"
     assert issues[0]['severity'] == 'CRITICAL', "Should be CRITICAL severity"
@@ -98,8 +104,8 @@ func (m model) View() string {
 }
 '''
 
-    lines = test_code.split('\n')
-    issues = _check_hardcoded_dimensions(test_code, lines, "test.go")
+    content = test_code.encode()
+    issues = _check_hardcoded_dimensions(content, "test.go")
 
     assert len(issues) >= 2, "Should detect both Width and Height"
     assert any('Width' in i['issue'] for i in issues), "Should detect hardcoded Width"
@@ -110,6 +116,27 @@ func (m model) View() string {
     return True
 
 
+def test_model_complexity_nested_struct():
+    """Test that fields after a nested struct are still counted."""
+    print("\n✓ Testing model complexity with a nested struct...")
+
+    fields = ''.join(f"    field{i} int\n" for i in range(14))
+    test_code = ('type model struct {\n'
+                 '    size struct {\n        width, height int\n    }\n' +
+                 fields +
+                 '}\n')
+
+    content = test_code.encode()
+    issues = _check_model_complexity(content, "test.go")
+
+    assert len(issues) == 1, "Fields after the nested struct should be counted"
+    assert 'complex' in issues[0]['issue']
+
+    print(f"  ✓ {issues[0]['issue']}")
+
+    return True
+
+
 def test_no_issues_clean_code():
     """Test with clean code that has no issues."""
     print("\n✓ Testing with clean code...")
@@ -151,7 +178,8 @@ func fetchDataCmd() tea.Msg {
     test_file = Path("/tmp/test_clean_app.go")
     test_file.write_text(test_code)
 
-    result = diagnose_issue(str(test_file))
+    with isolated_cache_home():
+        result = diagnose_issue(str(test_file))
 
     assert result['health_score'] >= 80, "Clean code should have high health score"
     print(f"  ✓ Health score: {result['health_score']}/100 (expected >=80)")
@@ -166,7 +194,8 @@ def test_invalid_path():
     """Test with invalid file path."""
     print("\n✓ Testing with invalid path...")
 
-    result = diagnose_issue("/nonexistent/path/file.go")
+    with isolated_cache_home():
+        result = diagnose_issue("/nonexistent/path/file.go")
 
     assert 'error' in result, "Should return error for invalid path"
     assert result['validation']['status'] == 'error', "Validation should be error"
@@ -176,6 +205,84 @@ def test_invalid_path():
     return True
 
 
+def test_cache_reuses_unchanged_files():
+    """Test that cached diagnoses are reused until the file changes."""
+    print("\n✓ Testing result cache...")
+
+    clean_code = 'package main\n\nfunc add(a, b int) int {\n    return a + b\n}\n'
+
+    cached = check_cache_reuses_unchanged_files(diagnose_issue, lambda r: r['issues'],
+                                                'diagnosis', SLOW_CODE, clean_code)
+
+    print(f"  ✓ {len(cached)} cached issue(s) invalidated on change")
+
+    return True
+
+
+def test_vendor_skipped():
+    """Test that vendored dependencies are not diagnosed."""
+    print("\n✓ Testing vendor directory skipping...")
+
+    check_vendor_skipped(diagnose_issue, lambda r: r['issues'], lambda r: r['statistics'], SLOW_CODE)
+
+    print("  ✓ Only main.go diagnosed")
+
+    return True
+
+
+def test_parallel_matches_serial():
+    """Test that large trees analyzed in worker processes match single files."""
+    print("\n✓ Testing parallel diagnosis of a large tree...")
+
+    result = check_parallel_matches_serial(diagnose_issue, lambda r: r['issues'],
+                                           lambda r: r['statistics'], SLOW_CODE)
+
+    print(f"  ✓ {len(result['issues'])} issue(s) across {result['statistics']['files_analyzed']} files")
+
+    return True
+
+
+def test_exclude_globs():
+    """Test that files matching exclude globs are not diagnosed."""
+    print("\n✓ Testing exclude globs...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "main.go").write_text(SLOW_CODE)
+        gen = Path(tmp) / "internal" / "gen"
+        gen.mkdir(parents=True)
+        (gen / "api.go").write_text(SLOW_CODE)
+        (Path(tmp) / "mock_client.go").write_text(SLOW_CODE)
+
+        result = diagnose_issue(tmp, use_cache=False, exclude=["internal/gen/*", "mock_*.go"])
+
+    assert result['statistics']['files_analyzed'] == 1, "Excluded files should be skipped"
+    assert all(i['location'].startswith('main.go') for i in result['issues'])
+
+    print("  ✓ Only main.go diagnosed")
+
+    return True
+
+
+def test_invalid_utf8_reported():
+    """Test that a file that is not valid UTF-8 is reported, not analyzed."""
+    print("\n✓ Testing invalid UTF-8 file...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_file = Path(tmp) / "main.go"
+        test_file.write_bytes(SLOW_CODE.encode() + b'// \xff\xfe\n')
+
+        result = diagnose_issue(str(test_file), use_cache=False)
+
+    issues = result['issues']
+    assert len(issues) == 1, "Only the read error should be reported"
+    assert issues[0]['severity'] == 'WARNING'
+    assert issues[0]['issue'].startswith("Could not read file: 'utf-8' codec can't decode")
+
+    print(f"  ✓ {issues[0]['issue'][:40]}...")
+
+    return True
+
+
 def main():
     """Run all tests."""
     print("="*70)
@@ -186,8 +293,14 @@ def main():
         ("Basic diagnosis", test_diagnose_issue_basic),
         ("Blocking operations", test_blocking_operations_detection),
         ("Hardcoded dimensions", test_hardcoded_dimensions_detection),
+        ("Nested model struct", test_model_complexity_nested_struct),
         ("Clean code", test_no_issues_clean_code),
         ("Invalid path", test_invalid_path),
+        ("Result cache", test_cache_reuses_unchanged_files),
+        ("Vendor skipping", test_vendor_skipped),
+        ("Parallel analysis", test_parallel_matches_serial),
+        ("Exclude globs", test_exclude_globs),
+        ("Invalid UTF-8", test_invalid_utf8_reported),
     ]
 
     results = []
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Tests for fix_layout_issues.py
+"""
+
+import sys
+import pickle
+import tempfile
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import fix_layout_issues as fli
+from fix_layout_issues import fix_layout_issues, worker_pool
+from helpers import (
+    check_cache_reuses_unchanged_files, check_parallel_matches_serial, check_vendor_skipped,
+    isolated_cache_home,
+)
+
+
+LAYOUT_CODE = '''package main
+
+import (
+    tea "github.com/charmbracelet/bubbletea"
+    "github.com/charmbracelet/lipgloss"
+)
+
+func (m model) View() string {
+    return lipgloss.NewStyle().Width(80).Render(m.content)
+}
+'''
+
+
+def test_hardcoded_width_fix():
+    """Test that a hardcoded width is reported with a dynamic replacement."""
+    print("\n✓ Testing hardcoded width fix...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_file = Path(tmp) / "main.go"
+        test_file.write_text(LAYOUT_CODE)
+
+        result = fix_layout_issues(str(test_file), use_cache=False)
+
+    fixes = [f for f in result['code_fixes'] if f['location'] == "main.go:9"]
+    assert any(i['type'] == 'hardcoded_dimensions' for i in result['layout_issues'])
+    assert fixes and fixes[0]['fixed'] == "return lipgloss.NewStyle().Width(m.termWidth).Render(m.content)"
+
+    print(f"  ✓ {fixes[0]['fixed']}")
+
+    return True
+
+
+def test_parallel_matches_serial():
+    """Test that large trees analyzed in worker processes match single files."""
+    print("\n✓ Testing parallel analysis of a large tree...")
+
+    result = check_parallel_matches_serial(fix_layout_issues, lambda r: r['layout_issues'],
+                                           lambda r: r, LAYOUT_CODE)
+
+    print(f"  ✓ {len(result['layout_issues'])} issue(s) across {result['files_analyzed']} files")
+
+    return True
+
+
+def test_pool_lifecycle():
+    """Test that worker processes live only as long as the caller needs them."""
+    print("\n✓ Testing worker pool lifecycle...")
+
+    class _FailingPool:
+        """Stands in for a pool whose map fails with an unexpected error."""
+        shut_down = False
+
+        def map(self, *args, **kwargs):
+            raise ValueError("worker failed")
+
+        def shutdown(self, wait=True):
+            self.shut_down = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(40):
+            (Path(tmp) / f"file{i}.go").write_text(LAYOUT_CODE)
+
+        fix_layout_issues(tmp, use_cache=False)
+        assert fli._pool is None, "A plain call should not leave workers behind"
+
+        with worker_pool():
+            fix_layout_issues(tmp, use_cache=False)
+            pool = fli._pool
+            assert pool is not None, "Workers should stay up inside worker_pool()"
+            fix_layout_issues(tmp, use_cache=False)
+            assert fli._pool is pool, "Calls inside worker_pool() should share one pool"
+        assert fli._pool is None, "Leaving worker_pool() should stop the workers"
+
+        failing = _FailingPool()
+        with worker_pool():
+            fli._pool = failing
+            try:
+                fix_layout_issues(tmp, use_cache=False)
+                assert False, "The error from map should propagate"
+            except ValueError:
+                pass
+            assert fli._pool is None, "A failed pool should not be kept"
+            assert failing.shut_down
+
+    print("  ✓ Pool stopped after each call, kept inside worker_pool(), dropped on error")
+
+    return True
+
+
+def test_vendor_skipped():
+    """Test that vendored dependencies are not analyzed."""
+    print("\n✓ Testing vendor directory skipping...")
+
+    check_vendor_skipped(fix_layout_issues, lambda r: r['layout_issues'], lambda r: r, LAYOUT_CODE)
+
+    print("  ✓ Only main.go analyzed")
+
+    return True
+
+
+def test_cache_reuses_unchanged_files():
+    """Test that cached results are reused until the file changes."""
+    print("\n✓ Testing result cache...")
+
+    fixed_code = LAYOUT_CODE.replace("Width(80)", "Width(m.termWidth)")
+
+    cached = check_cache_reuses_unchanged_files(fix_layout_issues, lambda r: r['layout_issues'],
+                                                'layout', LAYOUT_CODE, fixed_code)
+
+    print(f"  ✓ {len(cached)} cached issue(s) invalidated on change")
+
+    return True
+
+
+def test_generated_and_large_files_skipped():
+    """Test that generated and oversized files are skipped unless asked for."""
+    print("\n✓ Testing generated and oversized file skipping...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "main.go").write_text(LAYOUT_CODE)
+        (Path(tmp) / "styles.go").write_text("// Code generated by stylegen. DO NOT EDIT.\n\n" + LAYOUT_CODE)
+        (Path(tmp) / "api.pb.go").write_text(LAYOUT_CODE)
+        (Path(tmp) / "big.go").write_text(LAYOUT_CODE + "// padding\n" * 30000)
+
+        result = fix_layout_issues(tmp, use_cache=False)
+        everything = fix_layout_issues(tmp, use_cache=False, include_generated=True, max_file_size=None)
+
+    assert all(i['location'].startswith('main.go') for i in result['layout_issues']), "Only main.go should be analyzed"
+    assert result['files_analyzed'] == 1 and result['files_skipped'] == 3, "Skipped files should be counted apart"
+    locations = {i['location'].split(':')[0] for i in everything['layout_issues']}
+    assert locations == {'main.go', 'styles.go', 'api.pb.go', 'big.go'}, locations
+
+    print("  ✓ Skipped files analyzed only on request")
+
+    return True
+
+
+def test_cache_shared_across_options():
+    """Test that calls with different skip options share one cache."""
+    print("\n✓ Testing cache across skip options...")
+
+    with tempfile.TemporaryDirectory() as tmp, isolated_cache_home() as cache:
+        (Path(tmp) / "main.go").write_text(LAYOUT_CODE)
+        styles = Path(tmp) / "styles.go"
+        styles.write_text("// Code generated by stylegen. DO NOT EDIT.\n\n" + LAYOUT_CODE)
+
+        fix_layout_issues(tmp)
+        fix_layout_issues(str(styles))
+
+        with open(cache / 'layout.pkl', 'rb') as f:
+            entries = pickle.load(f)['entries']
+
+    assert sorted(Path(p).name for p in entries) == ['main.go', 'styles.go'], "Directory entries should survive a single-file call"
+
+    print(f"  ✓ {len(entries)} entries kept")
+
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("="*70)
+    print("UNIT TESTS - fix_layout_issues.py")
+    print("="*70)
+
+    tests = [
+        ("Hardcoded width fix", test_hardcoded_width_fix),
+        ("Parallel analysis", test_parallel_matches_serial),
+        ("Worker pool lifecycle", test_pool_lifecycle),
+        ("Vendor skipping", test_vendor_skipped),
+        ("Result cache", test_cache_reuses_unchanged_files),
+        ("Generated and large files", test_generated_and_large_files_skipped),
+        ("Cache across options", test_cache_shared_across_options),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((test_name, passed))
+        except Exception as e:
+            print(f"\n  ❌ FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((test_name, False))
+
+    # Summary
+    print("\n" + "="*70)
+    print("SUMMARY")
+    print("="*70)
+
+    for test_name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status}: {test_name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+
+    print(f"\nResults: {passed_count}/{total_count} passed")
+
+    return passed_count == total_count
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
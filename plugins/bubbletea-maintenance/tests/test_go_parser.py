@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Tests for utils/go_parser.py
+"""
+
+import sys
+import json
+import tempfile
+import subprocess
+import importlib.util
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from utils import go_parser
+from utils.go_parser import (
+    LazyAnalysis, analyze_code_structure, extract_custom_messages, extract_imports,
+    extract_init_function, extract_model_struct, extract_tea_commands,
+    extract_update_function, extract_view_function, find_bubbletea_components,
+)
+
+SCRIPTS_DIR = Path(__file__).parent.parent / 'scripts'
+
+PARSER_CODE = '''package main
+
+import (
+    "time"
+
+    "github.com/charmbracelet/bubbles/list"
+    tea "github.com/charmbracelet/bubbletea"
+    "github.com/charmbracelet/lipgloss"
+)
+
+type model struct {
+    items list.Model
+    width int
+}
+
+type tickMsg struct {
+    at time.Time
+}
+
+func tick() tea.Msg {
+    return tickMsg{at: time.Now()}
+}
+
+func (m model) Init() tea.Cmd {
+    return tick
+}
+
+func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
+    switch msg := msg.(type) {
+    case tea.WindowSizeMsg:
+        m.width = msg.Width
+    case tickMsg:
+        return m, tick
+    }
+    return m, nil
+}
+
+func (m model) View() string {
+    return lipgloss.NewStyle().Width(m.width).Render("hi")
+}
+'''
+
+
+def _eager_analysis(content):
+    """The result analyze_code_structure built before it became lazy."""
+    return {
+        "model": extract_model_struct(content),
+        "update": extract_update_function(content),
+        "view": extract_view_function(content),
+        "init": extract_init_function(content),
+        "custom_messages": extract_custom_messages(content),
+        "tea_commands": extract_tea_commands(content),
+        "imports": extract_imports(content),
+        "components": find_bubbletea_components(content),
+        "file_size": len(content),
+        "line_count": content.count('\n') + 1,
+        "uses_lipgloss": '"github.com/charmbracelet/lipgloss"' in content,
+        "uses_bubbletea": '"github.com/charmbracelet/bubbletea"' in content
+    }
+
+
+def _count_field_calls():
+    """Wrap every field extractor to count its calls; returns (counts, restore)."""
+    original = dict(go_parser._ANALYSIS_FIELDS)
+    counts = {}
+
+    def counted(name, func):
+        def wrapper(content):
+            counts[name] = counts.get(name, 0) + 1
+            return func(content)
+        return wrapper
+
+    for name, func in original.items():
+        go_parser._ANALYSIS_FIELDS[name] = counted(name, func)
+    return counts, lambda: go_parser._ANALYSIS_FIELDS.update(original)
+
+
+def test_type_checks_for_mypyc():
+    """Test that go_parser still type-checks the way mypyc builds it."""
+    print("\n✓ Testing mypy check of go_parser...")
+
+    if importlib.util.find_spec('mypy') is None:
+        print("  ⚠️  mypy not installed, skipped")
+        return True
+
+    # Same invocation mypyc uses: utils is a package, so build from scripts/
+    proc = subprocess.run([sys.executable, '-m', 'mypy', 'utils/go_parser.py'],
+                          cwd=SCRIPTS_DIR, capture_output=True, text=True)
+
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    print(f"  ✓ {proc.stdout.strip()}")
+
+    return True
+
+
+def test_fields_computed_lazily():
+    """Test that only the fields read are computed, each once."""
+    print("\n✓ Testing lazy field computation...")
+
+    counts, restore = _count_field_calls()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            test_file = Path(tmp) / "main.go"
+            test_file.write_text(PARSER_CODE)
+
+            result = analyze_code_structure(test_file, use_cache=False)
+            assert isinstance(result, LazyAnalysis)
+            assert counts == {}, "Nothing should be computed up front"
+
+            model = result['model']
+            assert result['model'] is model, "A field should be kept once computed"
+            assert result.get('imports') is not None
+            assert not isinstance(result, dict), "Use dict() for a real dict"
+    finally:
+        restore()
+
+    assert counts == {'model': 1, 'imports': 1}, counts
+
+    print(f"  ✓ Computed only {sorted(counts)}")
+
+    return True
+
+
+def test_dict_matches_eager_result():
+    """Test that dict() of the lazy result equals the old eager result."""
+    print("\n✓ Testing full evaluation...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_file = Path(tmp) / "main.go"
+        test_file.write_text(PARSER_CODE)
+
+        expected = _eager_analysis(PARSER_CODE)
+        uncached = dict(analyze_code_structure(test_file, use_cache=False))
+        cached = dict(analyze_code_structure(test_file))
+
+    assert list(uncached) == list(expected), "Field order should be unchanged"
+    assert uncached == expected
+    assert cached == expected
+    assert json.loads(json.dumps(cached)) == json.loads(json.dumps(expected))
+
+    print(f"  ✓ {len(expected)} fields match")
+
+    return True
+
+
+def test_cached_views_isolated():
+    """Test that cached views share computation but not mutable results."""
+    print("\n✓ Testing cached views...")
+
+    counts, restore = _count_field_calls()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            test_file = Path(tmp) / "main.go"
+            test_file.write_text(PARSER_CODE)
+
+            first = analyze_code_structure(test_file)
+            first['model']['fields'].append({"name": "extra", "type": "int", "tag": None})
+            first['imports'].clear()
+
+            second = analyze_code_structure(test_file)
+            assert second is not first
+            assert len(second['model']['fields']) == 2, "Mutating one view should not reach the cache"
+            assert second['imports'], "Mutating one view should not reach the cache"
+    finally:
+        restore()
+
+    assert counts == {'model': 1, 'imports': 1}, "Views should share one computation per field"
+
+    print("  ✓ Views are independent copies of one analysis")
+
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("="*70)
+    print("UNIT TESTS - go_parser.py")
+    print("="*70)
+
+    tests = [
+        ("mypyc type check", test_type_checks_for_mypyc),
+        ("Lazy fields", test_fields_computed_lazily),
+        ("Full evaluation", test_dict_matches_eager_result),
+        ("Cached views", test_cached_views_isolated),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((test_name, passed))
+        except Exception as e:
+            print(f"\n  ❌ FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((test_name, False))
+
+    # Summary
+    print("\n" + "="*70)
+    print("SUMMARY")
+    print("="*70)
+
+    for test_name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status}: {test_name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+
+    print(f"\nResults: {passed_count}/{total_count} passed")
+
+    return passed_count == total_count
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
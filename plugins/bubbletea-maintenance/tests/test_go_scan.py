@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for utils/go_scan.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from utils.go_scan import find_model_body, line_index, newline_offsets
+
+
+def test_model_body_nested_braces():
+    """Test that nested structs and braces in tags don't end the body early."""
+    print("\n✓ Testing model body with nested braces...")
+
+    content = (b'type model struct {\n'
+               b'    size struct {\n        width, height int\n    }\n'
+               b'    opts map[string]struct{} `json:"{opts}"`\n'
+               b'    cursor int\n'
+               b'}\n\nfunc (m model) View() string { return "" }\n')
+
+    body = find_model_body(content)
+
+    assert body is not None
+    assert body.rstrip().endswith(b'cursor int'), body
+    assert b'View' not in body
+
+    print(f"  ✓ Body of {len(body.splitlines())} line(s)")
+
+    return True
+
+
+def test_model_body_empty_and_missing():
+    """Test that empty models are passed over and absent ones give None."""
+    print("\n✓ Testing empty, unterminated and missing models...")
+
+    content = b'type emptyModel struct{}\n\ntype appModel struct {\n    count int\n}\n'
+    assert find_model_body(content) == b'\n    count int\n', "Empty model should be skipped"
+
+    assert find_model_body(b'type model struct {\n    count int\n') is None, "Unterminated body"
+    assert find_model_body(b'type state struct {\n    count int\n}\n') is None, "No model struct"
+
+    print("  ✓ Handled")
+
+    return True
+
+
+def test_line_index_from_offsets():
+    """Test that offsets map to the 0-based line holding them."""
+    print("\n✓ Testing newline offsets and line lookup...")
+
+    content = b'package main\n\nfunc main() {\n}'
+    nl_offsets = newline_offsets(content)
+
+    assert nl_offsets == [12, 13, 27]
+    assert newline_offsets(b'') == []
+    for pos in range(len(content)):
+        expected = content[:pos].count(b'\n')
+        assert line_index(nl_offsets, pos) == expected, pos
+
+    print(f"  ✓ {len(content)} offsets mapped to {len(nl_offsets) + 1} lines")
+
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("="*70)
+    print("UNIT TESTS - go_scan.py")
+    print("="*70)
+
+    tests = [
+        ("Nested model struct", test_model_body_nested_braces),
+        ("Empty and missing models", test_model_body_empty_and_missing),
+        ("Line lookup", test_line_index_from_offsets),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((test_name, passed))
+        except Exception as e:
+            print(f"\n  ❌ FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((test_name, False))
+
+    # Summary
+    print("\n" + "="*70)
+    print("SUMMARY")
+    print("="*70)
+
+    for test_name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status}: {test_name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+
+    print(f"\nResults: {passed_count}/{total_count} passed")
+
+    return passed_count == total_count
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -5,6 +5,7 @@ Tests complete workflows combining multiple functions.
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
 # Add scripts to path
@@ -16,6 +17,7 @@ from debug_performance import debug_performance
 from suggest_architecture import suggest_architecture
 from fix_layout_issues import fix_layout_issues
 from comprehensive_bubbletea_analysis import comprehensive_bubbletea_analysis
+from helpers import isolated_cache_home
 
 
 # Test fixture: Complete Bubble Tea app
@@ -109,7 +111,8 @@ def test_full_workflow():
     test_file.write_text(TEST_APP_CODE)
 
     # Run comprehensive analysis
-    result = comprehensive_bubbletea_analysis(str(test_dir), detail_level="standard")
+    with isolated_cache_home():
+        result = comprehensive_bubbletea_analysis(str(test_dir), detail_level="standard")
 
     # Validations
     assert 'overall_health' in result, "Missing overall_health"
@@ -151,7 +154,8 @@ def test_issue_diagnosis_finds_problems():
     test_file = test_dir / "main.go"
     test_file.write_text(TEST_APP_CODE)
 
-    result = diagnose_issue(str(test_dir))
+    with isolated_cache_home():
+        result = diagnose_issue(str(test_dir))
 
     # Should find:
     # 1. Blocking HTTP request in Update()
@@ -184,7 +188,8 @@ def test_performance_finds_bottlenecks():
     test_file = test_dir / "main.go"
     test_file.write_text(TEST_APP_CODE)
 
-    result = debug_performance(str(test_dir))
+    with isolated_cache_home():
+        result = debug_performance(str(test_dir))
 
     # Should find:
     # 1. Blocking HTTP in Update()
@@ -216,7 +221,8 @@ def test_layout_finds_issues():
     test_file = test_dir / "main.go"
     test_file.write_text(TEST_APP_CODE)
 
-    result = fix_layout_issues(str(test_dir))
+    with isolated_cache_home():
+        result = fix_layout_issues(str(test_dir))
 
     # Should find:
     # 1. Hardcoded dimensions or missing resize handling
@@ -247,7 +253,8 @@ def test_architecture_analysis():
     test_file = test_dir / "main.go"
     test_file.write_text(TEST_APP_CODE)
 
-    result = suggest_architecture(str(test_dir))
+    with isolated_cache_home():
+        result = suggest_architecture(str(test_dir))
 
     # Should detect pattern and provide recommendations
     assert 'current_pattern' in result, "Missing current_pattern"
@@ -279,13 +286,14 @@ def test_all_functions_return_valid_structure():
     test_file.write_text(TEST_APP_CODE)
 
     # Test all functions
-    results = {
-        "diagnose_issue": diagnose_issue(str(test_dir)),
-        "apply_best_practices": apply_best_practices(str(test_dir)),
-        "debug_performance": debug_performance(str(test_dir)),
-        "suggest_architecture": suggest_architecture(str(test_dir)),
-        "fix_layout_issues": fix_layout_issues(str(test_dir)),
-    }
+    with isolated_cache_home():
+        results = {
+            "diagnose_issue": diagnose_issue(str(test_dir)),
+            "apply_best_practices": apply_best_practices(str(test_dir)),
+            "debug_performance": debug_performance(str(test_dir)),
+            "suggest_architecture": suggest_architecture(str(test_dir)),
+            "fix_layout_issues": fix_layout_issues(str(test_dir)),
+        }
 
     for func_name, result in results.items():
         # Each should have validation
@@ -302,6 +310,40 @@ def test_all_functions_return_valid_structure():
     return True
 
 
+def test_skip_options_shared():
+    """Test that every analyzer takes the same file-skipping options."""
+    print("\n✓ Testing shared skip options...")
+
+    # Where each analyzer reports its file counts
+    counts = {
+        "diagnose_issue": (diagnose_issue, lambda r: r['statistics']),
+        "debug_performance": (debug_performance, lambda r: r['metrics']),
+        "fix_layout_issues": (fix_layout_issues, lambda r: r),
+        "suggest_architecture": (suggest_architecture, lambda r: r['analysis']),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "main.go").write_text(TEST_APP_CODE)
+        (Path(tmp) / "styles.go").write_text("// Code generated by stylegen. DO NOT EDIT.\n\n" + TEST_APP_CODE)
+        (Path(tmp) / "main_test.go").write_text(TEST_APP_CODE)
+        (Path(tmp) / "big.go").write_text(TEST_APP_CODE + "// padding\n" * 30000)
+        (Path(tmp) / "mock_client.go").write_text(TEST_APP_CODE)
+
+        for name, (analyze, file_counts) in counts.items():
+            default = file_counts(analyze(tmp, use_cache=False, exclude=["mock_*.go"]))
+            everything = file_counts(analyze(tmp, use_cache=False, include_generated=True,
+                                             max_file_size=None))
+
+            assert default['files_analyzed'] == 1, (name, default)
+            assert default['files_skipped'] == 4, (name, default)
+            assert everything['files_analyzed'] == 5, (name, everything)
+            assert everything['files_skipped'] == 0, (name, everything)
+
+            print(f"  ✓ {name}: same files analyzed and skipped")
+
+    return True
+
+
 def main():
     """Run all integration tests."""
     print("="*70)
@@ -315,6 +357,7 @@ def main():
         ("Layout analysis", test_layout_finds_issues),
         ("Architecture analysis", test_architecture_analysis),
         ("Result structure validity", test_all_functions_return_valid_structure),
+        ("Shared skip options", test_skip_options_shared),
     ]
 
     results = []
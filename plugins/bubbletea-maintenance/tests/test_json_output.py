@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for utils/json_output.py
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from utils import json_output
+from utils.json_output import dumps
+
+
+RESULT = {
+    "summary": "🚨 Found 2 critical issue(s)",
+    "issues": [{"severity": "CRITICAL", "location": "main.go:12", "line": 12}],
+    "by_line": {12: "time.Sleep"},
+    "health_score": 72.5,
+    "valid": True,
+    "fix": None,
+}
+
+
+def test_dumps_format():
+    """Test that output keeps non-ASCII text and accepts non-string keys."""
+    print("\n✓ Testing JSON output format...")
+
+    text = dumps(RESULT)
+
+    assert "🚨" in text, "Emoji should not be escaped"
+    assert "\\u" not in text
+    assert text.startswith('{\n  "summary"'), "Indented by two spaces"
+    assert json.loads(text)["by_line"] == {"12": "time.Sleep"}
+
+    print(f"  ✓ {len(text)} characters")
+
+    return True
+
+
+def test_orjson_matches_json():
+    """Test that the orjson and standard library paths print the same text."""
+    print("\n✓ Testing orjson against the fallback...")
+
+    if json_output.orjson is None:
+        print("  ⚠️  orjson not installed, skipped")
+        return True
+
+    with_orjson = dumps(RESULT)
+    orjson = json_output.orjson
+    try:
+        json_output.orjson = None
+        fallback = dumps(RESULT)
+    finally:
+        json_output.orjson = orjson
+
+    assert with_orjson == fallback, (with_orjson, fallback)
+
+    print("  ✓ Identical output")
+
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("="*70)
+    print("UNIT TESTS - json_output.py")
+    print("="*70)
+
+    tests = [
+        ("Output format", test_dumps_format),
+        ("orjson and json agree", test_orjson_matches_json),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((test_name, passed))
+        except Exception as e:
+            print(f"\n  ❌ FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((test_name, False))
+
+    # Summary
+    print("\n" + "="*70)
+    print("SUMMARY")
+    print("="*70)
+
+    for test_name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status}: {test_name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+
+    print(f"\nResults: {passed_count}/{total_count} passed")
+
+    return passed_count == total_count
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
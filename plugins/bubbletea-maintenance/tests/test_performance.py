@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Tests for debug_performance.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from debug_performance import debug_performance, _check_update_performance, _check_view_performance, _LINE_VIEW_MIN_SIZE
+from helpers import (
+    SLOW_CODE, check_cache_reuses_unchanged_files, check_parallel_matches_serial,
+    isolated_cache_home,
+)
+
+
+def test_blocking_line_numbers():
+    """Test that blocking calls in Update() report their own line."""
+    print("\n✓ Testing blocking operation line numbers...")
+
+    test_code = '''package main
+
+func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
+    switch msg := msg.(type) {
+    case tea.KeyMsg:
+        time.Sleep(time.Second)
+        resp, _ := http.Get("https://example.com")
+        m.data = resp.Status
+    }
+    return m, nil
+}
+'''
+
+    content = test_code.encode()
+    bottlenecks = list(_check_update_performance(content, content.split(b'\n'), "test.go"))
+
+    locations = {b.issue: b.location for b in bottlenecks}
+    assert locations.get("Blocking Sleep call in Update()") == "test.go:6", "Sleep should be on line 6"
+    assert locations.get("Blocking HTTP request in Update()") == "test.go:7", "HTTP request should be on line 7"
+
+    print(f"  ✓ Located {len(bottlenecks)} blocking operation(s)")
+
+    return True
+
+
+def test_view_style_creation():
+    """Test detection of lipgloss styles created inside View()."""
+    print("\n✓ Testing style creation in View()...")
+
+    test_code = '''package main
+
+func (m model) View() string {
+    a := lipgloss.NewStyle().Bold(true)
+    b := lipgloss.NewStyle().Italic(true)
+    c := lipgloss.NewStyle().Faint(true)
+    d := lipgloss.NewStyle().Underline(true)
+    return a.Render("a") + b.Render("b") + c.Render("c") + d.Render("d")
+}
+
+func other() {
+    e := lipgloss.NewStyle()
+}
+'''
+
+    content = test_code.encode()
+    bottlenecks = list(_check_view_performance(content, content.split(b'\n'), "test.go"))
+
+    styles = [b for b in bottlenecks if 'lipgloss styles' in b.issue]
+    assert len(styles) == 1, "Should flag style creation in View()"
+    assert "(4 times)" in styles[0].issue, "Should only count styles inside View()"
+
+    print(f"  ✓ {styles[0].issue}")
+
+    return True
+
+
+def test_large_loop_in_update():
+    """Test that only loops with large bodies in Update() are flagged."""
+    print("\n✓ Testing large loop detection...")
+
+    body = "        if item.ok {\n            total += weigh(item)\n        }\n" * 4
+    test_code = ('package main\n\n'
+                 'func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {\n'
+                 '    for _, item := range items {\n' + body + '    }\n'
+                 '    for _, s := range small {\n        count++\n    }\n'
+                 '    return m, nil\n'
+                 '}\n')
+
+    content = test_code.encode()
+    bottlenecks = list(_check_update_performance(content, content.split(b'\n'), "test.go"))
+
+    loops = [b.location for b in bottlenecks if 'Large loop' in b.issue]
+    assert loops == ["test.go:4"], "Only the loop with a large nested body should be flagged"
+
+    print(f"  ✓ Large loop at {loops[0]}")
+
+    return True
+
+
+def test_debug_performance_clean_file():
+    """Test with a file that has no performance issues."""
+    print("\n✓ Testing with clean code...")
+
+    test_file = Path("/tmp/test_perf_clean.go")
+    test_file.write_text('package main\n\nfunc add(a, b int) int {\n    return a + b\n}\n')
+
+    result = debug_performance(str(test_file), use_cache=False)
+
+    assert result['bottlenecks'] == [], "Clean code should have no bottlenecks"
+    assert result['validation']['status'] == 'pass', "Validation should pass"
+
+    print("  ✓ No bottlenecks reported")
+
+    # Cleanup
+    test_file.unlink()
+
+    return True
+
+
+def test_parallel_matches_serial():
+    """Test that large trees analyzed in worker processes match single files."""
+    print("\n✓ Testing parallel analysis of a large tree...")
+
+    result = check_parallel_matches_serial(debug_performance, lambda r: r['bottlenecks'],
+                                           lambda r: r['metrics'], SLOW_CODE)
+
+    print(f"  ✓ {len(result['bottlenecks'])} bottleneck(s) across {result['metrics']['files_analyzed']} files")
+
+    return True
+
+
+def test_max_bottlenecks_keeps_most_severe():
+    """Test that limiting the result keeps the most severe bottlenecks."""
+    print("\n✓ Testing max_bottlenecks...")
+
+    test_code = '''package main
+
+func process(items []string) []string {
+    var out []string
+    for _, item := range items {
+        out = append(out, item)
+    }
+    return out
+}
+
+func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
+    time.Sleep(time.Second)
+    return m, nil
+}
+'''
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_file = Path(tmp) / "main.go"
+        test_file.write_text(test_code)
+
+        full = debug_performance(str(test_file), use_cache=False)
+        limited = debug_performance(str(test_file), use_cache=False, max_bottlenecks=1)
+
+    assert len(full['bottlenecks']) > 1, "Fixture should produce several bottlenecks"
+    assert limited['bottlenecks'] == full['bottlenecks'][:1], "Should keep the most severe bottleneck"
+    assert limited['bottlenecks'][0]['severity'] == 'CRITICAL'
+
+    print(f"  ✓ Kept {limited['bottlenecks'][0]['issue']}")
+
+    return True
+
+
+def test_large_file_matches_small_file():
+    """Test that large files read through a line view give the same findings."""
+    print("\n✓ Testing large file analysis...")
+
+    test_code = '''package main
+
+func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
+    time.Sleep(time.Second)
+    for _, item := range m.items {
+        for _, tag := range item.tags {
+            m.out = append(m.out, tag)
+        }
+    }
+    return m, nil
+}
+'''
+
+    filler = "// generated\n" * (_LINE_VIEW_MIN_SIZE // 12)
+    offset = filler.count("\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        small = Path(tmp) / "small.go"
+        small.write_text(test_code)
+        large = Path(tmp) / "large.go"
+        large.write_text(filler + test_code)
+
+        small_issues = debug_performance(str(small), use_cache=False)['bottlenecks']
+        large_issues = debug_performance(str(large), use_cache=False)['bottlenecks']
+
+    expected = [f"large.go:{int(b['location'].split(':')[1]) + offset}" for b in small_issues]
+    assert small_issues, "Fixture should produce bottlenecks"
+    assert [b['location'] for b in large_issues] == expected, "Line numbers should be preserved"
+    assert [b['issue'] for b in large_issues] == [b['issue'] for b in small_issues]
+
+    print(f"  ✓ {len(large_issues)} bottleneck(s) found after {offset} generated lines")
+
+    return True
+
+
+def test_cache_reuses_unchanged_files():
+    """Test that cached results are reused until the file changes."""
+    print("\n✓ Testing result cache...")
+
+    clean_code = 'package main\n\nfunc add(a, b int) int {\n    return a + b\n}\n'
+
+    cached = check_cache_reuses_unchanged_files(debug_performance, lambda r: r['bottlenecks'],
+                                                'perf', SLOW_CODE, clean_code)
+
+    print(f"  ✓ {len(cached)} cached bottleneck(s) invalidated on change")
+
+    return True
+
+
+def test_cache_drops_deleted_files():
+    """Test that the cache forgets deleted files and stays within its size limit."""
+    print("\n✓ Testing result cache pruning...")
+
+    import pickle
+    from utils import analysis_cache
+
+    old_max_entries = analysis_cache.MAX_CACHE_ENTRIES
+    with tempfile.TemporaryDirectory() as tmp, isolated_cache_home() as cache:
+        try:
+            for i in range(3):
+                (Path(tmp) / f"file{i}.go").write_text(SLOW_CODE)
+            debug_performance(tmp)
+
+            (Path(tmp) / "file0.go").unlink()
+            (Path(tmp) / "file1.go").write_text(SLOW_CODE + "\n")
+            analysis_cache.MAX_CACHE_ENTRIES = 1
+            debug_performance(tmp)
+        finally:
+            analysis_cache.MAX_CACHE_ENTRIES = old_max_entries
+
+        with open(cache / 'perf.pkl', 'rb') as f:
+            entries = pickle.load(f)['entries']
+
+    assert [Path(path).name for path in entries] == ["file1.go"], "Only the most recently stored live file should remain"
+
+    print("  ✓ Deleted and least recently used entries dropped")
+
+    return True
+
+
+def test_vendor_and_generated_skipped():
+    """Test that vendored, test and generated sources are skipped by default."""
+    print("\n✓ Testing vendor and generated file skipping...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "main.go").write_text(SLOW_CODE)
+        (Path(tmp) / "main_test.go").write_text(SLOW_CODE)
+        (Path(tmp) / "api.pb.go").write_text(SLOW_CODE)
+        vendor = Path(tmp) / "vendor" / "lib"
+        vendor.mkdir(parents=True)
+        (vendor / "lib.go").write_text(SLOW_CODE)
+
+        result = debug_performance(tmp, use_cache=False)
+        with_generated = debug_performance(tmp, use_cache=False, include_generated=True)
+
+    assert result['metrics']['files_analyzed'] == 1, "vendor/, tests and generated code should be skipped"
+    assert result['metrics']['files_skipped'] == 2
+    assert all(b['location'].startswith('main.go') for b in result['bottlenecks'])
+    assert with_generated['metrics']['files_analyzed'] == 3, "vendor/ is skipped even with include_generated"
+
+    print("  ✓ Only main.go analyzed by default")
+
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("="*70)
+    print("UNIT TESTS - debug_performance.py")
+    print("="*70)
+
+    tests = [
+        ("Blocking line numbers", test_blocking_line_numbers),
+        ("View style creation", test_view_style_creation),
+        ("Large loop detection", test_large_loop_in_update),
+        ("Clean code", test_debug_performance_clean_file),
+        ("Parallel analysis", test_parallel_matches_serial),
+        ("Max bottlenecks", test_max_bottlenecks_keeps_most_severe),
+        ("Large file", test_large_file_matches_small_file),
+        ("Result cache", test_cache_reuses_unchanged_files),
+        ("Cache pruning", test_cache_drops_deleted_files),
+        ("Vendor and generated skipping", test_vendor_and_generated_skipped),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((test_name, passed))
+        except Exception as e:
+            print(f"\n  ❌ FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((test_name, False))
+
+    # Summary
+    print("\n" + "="*70)
+    print("SUMMARY")
+    print("="*70)
+
+    for test_name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status}: {test_name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+
+    print(f"\nResults: {passed_count}/{total_count} passed")
+
+    return passed_count == total_count
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
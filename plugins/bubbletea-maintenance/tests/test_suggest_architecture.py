@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Tests for suggest_architecture.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import suggest_architecture as sa
+from suggest_architecture import suggest_architecture
+
+
+ARCH_CODE = '''package main
+
+import (
+    "github.com/charmbracelet/bubbles/list"
+    tea "github.com/charmbracelet/bubbletea"
+)
+
+type model struct {
+    items  list.Model
+    cursor int
+}
+
+func (m model) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
+    switch msg := msg.(type) {
+    case tea.KeyMsg:
+        m.cursor++
+    case tea.WindowSizeMsg:
+        m.items.SetWidth(msg.Width)
+    }
+    return m, nil
+}
+
+func (m model) View() string {
+    return m.items.View()
+}
+
+func main() {
+    tea.NewProgram(model{}).Run()
+}
+'''
+
+
+def test_cache_reuses_unchanged_files():
+    """Test that results are reused until a file's mtime changes."""
+    print("\n✓ Testing result cache...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_file = Path(tmp) / "main.go"
+        test_file.write_text(ARCH_CODE)
+
+        before = sa._suggest_for_signature.cache_info()
+        first = suggest_architecture(tmp)
+        second = suggest_architecture(tmp)
+        after = sa._suggest_for_signature.cache_info()
+
+        assert second == first, "Cached run should match"
+        assert after.misses == before.misses + 1, "First call should analyze"
+        assert after.hits == before.hits + 1, "Second call should be a hit"
+
+        # Same size, new mtime: the file must be analyzed again
+        st = test_file.stat()
+        os.utime(test_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        third = suggest_architecture(tmp)
+        assert sa._suggest_for_signature.cache_info().misses == after.misses + 1, "Changed mtime should miss"
+        assert third == first
+
+        uncached = suggest_architecture(tmp, use_cache=False)
+        assert sa._suggest_for_signature.cache_info().misses == after.misses + 1, "use_cache=False should bypass the cache"
+        assert uncached == first
+
+    print(f"  ✓ {first['analysis']['files_analyzed']} file(s), hit then invalidated on mtime change")
+
+    return True
+
+
+def test_cached_result_is_copy():
+    """Test that changing a returned result doesn't change the cached one."""
+    print("\n✓ Testing cached result copies...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "main.go").write_text(ARCH_CODE)
+
+        first = suggest_architecture(tmp)
+        steps = list(first['refactoring_steps'])
+        first['refactoring_steps'].append("changed")
+        first['analysis']['files_analyzed'] = 99
+
+        second = suggest_architecture(tmp)
+
+    assert second['refactoring_steps'] == steps
+    assert second['analysis']['files_analyzed'] == 1
+
+    print("  ✓ Cached result unchanged")
+
+    return True
+
+
+def test_generated_and_large_files_skipped():
+    """Test that generated, test and oversized files are skipped and counted."""
+    print("\n✓ Testing generated and oversized file skipping...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "main.go").write_text(ARCH_CODE)
+        (Path(tmp) / "model_gen.go").write_text("// Code generated by modelgen. DO NOT EDIT.\n\n" + ARCH_CODE)
+        (Path(tmp) / "main_test.go").write_text(ARCH_CODE)
+        (Path(tmp) / "big.go").write_text(ARCH_CODE + "// padding\n" * 30000)
+        vendor = Path(tmp) / "vendor" / "lib"
+        vendor.mkdir(parents=True)
+        (vendor / "lib.go").write_text(ARCH_CODE)
+
+        result = suggest_architecture(tmp, use_cache=False)
+        everything = suggest_architecture(tmp, use_cache=False, include_generated=True, max_file_size=None)
+
+    assert result['analysis']['files_analyzed'] == 1, result['analysis']
+    assert result['analysis']['files_skipped'] == 3, "Test, generated and oversized files should be counted"
+    assert everything['analysis']['files_analyzed'] == 4, everything['analysis']
+    assert everything['analysis']['files_skipped'] == 0, "vendor/ is pruned as a directory, not counted per file"
+
+    print(f"  ✓ {result['analysis']['files_skipped']} file(s) skipped")
+
+    return True
+
+
+def test_only_skipped_files():
+    """Test that a tree whose files are all skipped reports no Go files."""
+    print("\n✓ Testing tree with only generated files...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "model_gen.go").write_text("// Code generated by modelgen. DO NOT EDIT.\n\n" + ARCH_CODE)
+
+        result = suggest_architecture(tmp, use_cache=False)
+
+    assert result.get('error') == "No .go files found", result
+    assert result['validation']['status'] == 'error'
+
+    print("  ✓ Reported as an error")
+
+    return True
+
+
+def test_function_ending_file_counted():
+    """Test that an Update() or View() that ends its file is still measured."""
+    print("\n✓ Testing functions at the end of a file...")
+
+    # ARCH_CODE with main() dropped, so View() ends the file
+    trailing = ARCH_CODE[:ARCH_CODE.index("func main()")].rstrip() + "\n"
+    update_last = trailing[:trailing.index("func (m model) Update")] + \
+        trailing[trailing.index("func (m model) View"):] + \
+        trailing[trailing.index("func (m model) Update"):trailing.index("func (m model) View")]
+
+    for content in (ARCH_CODE, trailing, update_last):
+        stats = sa._analyze_content(content.encode() + b"\n")
+        assert stats['update_cases'] == 2, stats['update_cases']
+        assert stats['view_lines'] >= 2, stats['view_lines']
+
+    print("  ✓ Measured whether or not another func follows")
+
+    return True
+
+
+def test_merge_per_file_stats():
+    """Test that per-file statistics merge into the project's."""
+    print("\n✓ Testing per-file merge...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "a.go").write_text(ARCH_CODE)
+        sub = Path(tmp) / "views"
+        sub.mkdir()
+        (sub / "b.go").write_text(ARCH_CODE.replace("type model", "type listModel"))
+
+        result = suggest_architecture(tmp, use_cache=False)
+        single = suggest_architecture(str(Path(tmp) / "a.go"), use_cache=False)
+
+    assert result['analysis']['files_analyzed'] == 2
+    assert result['analysis']['model_count'] == 2 * single['analysis']['model_count'], "Counts should be summed"
+    assert result['analysis']['view_functions'] == 2 * single['analysis']['view_functions']
+    assert result['analysis']['state_fields'] == single['analysis']['state_fields'], "Taken from the first file"
+
+    print(f"  ✓ {result['analysis']['model_count']} models across 2 files")
+
+    return True
+
+
+def test_component_finders_agree():
+    """Test that the Aho-Corasick and '.Model' fallback finders agree."""
+    print("\n✓ Testing component finders...")
+
+    samples = [
+        ARCH_CODE.encode(),
+        b'var a list.Model\nvar b viewport.Model\nvar c textinput.Model\n',
+        b'x := spinner.Modelist.Model // overlapping names\n',
+        b'mylist.Model notacomponent.Model table.Models\n',
+        b'no components here\n',
+    ]
+    expected = [{'list.Model'}, {'list.Model', 'viewport.Model', 'textinput.Model'},
+                {'spinner.Model', 'list.Model'}, {'list.Model', 'table.Model'}, set()]
+
+    automaton = sa._COMPONENT_AUTOMATON
+    try:
+        sa._COMPONENT_AUTOMATON = None
+        fallback = [sa._find_components(content) for content in samples]
+    finally:
+        sa._COMPONENT_AUTOMATON = automaton
+
+    assert fallback == expected, fallback
+    if automaton is None:
+        print("  ⚠️  pyahocorasick not installed, fallback only")
+    else:
+        assert [sa._find_components(content) for content in samples] == fallback
+
+    print(f"  ✓ {len(samples)} samples agree")
+
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("="*70)
+    print("UNIT TESTS - suggest_architecture.py")
+    print("="*70)
+
+    tests = [
+        ("Result cache", test_cache_reuses_unchanged_files),
+        ("Cached result copies", test_cached_result_is_copy),
+        ("Generated and large files", test_generated_and_large_files_skipped),
+        ("Only skipped files", test_only_skipped_files),
+        ("Functions ending a file", test_function_ending_file_counted),
+        ("Per-file merge", test_merge_per_file_stats),
+        ("Component finders", test_component_finders_agree),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((test_name, passed))
+        except Exception as e:
+            print(f"\n  ❌ FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((test_name, False))
+
+    # Summary
+    print("\n" + "="*70)
+    print("SUMMARY")
+    print("="*70)
+
+    for test_name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status}: {test_name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+
+    print(f"\nResults: {passed_count}/{total_count} passed")
+
+    return passed_count == total_count
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for utils/validators/common.py
+"""
+
+import sys
+from enum import Enum
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from utils.validators.common import (
+    validate_best_practices_compliance, validate_bottlenecks, validate_issue_list,
+    validate_layout_fixes,
+)
+
+
+def _issue(severity="CRITICAL"):
+    return {
+        "severity": severity,
+        "category": "performance",
+        "issue": "Blocking operation",
+        "location": "main.go:45",
+        "explanation": "HTTP call blocks event loop",
+        "fix": "Move to tea.Cmd"
+    }
+
+
+def _bottleneck(severity="HIGH", category="performance"):
+    return {
+        "severity": severity,
+        "category": category,
+        "issue": "Sleep in Update()",
+        "location": "main.go:10",
+        "explanation": "Blocks the event loop",
+        "fix": "Use tea.Tick"
+    }
+
+
+def _fix(fixed="Width(m.width)"):
+    return {
+        "location": "main.go:12",
+        "original": "Width(80)",
+        "fixed": fixed,
+        "explanation": "Use the terminal width"
+    }
+
+
+class _Severity(str, Enum):
+    CRITICAL = "CRITICAL"
+
+
+class _LooseEqual:
+    """Equal to one string without being a string, nor hashing like it."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def __eq__(self, other):
+        return other == self.text
+
+    __hash__ = object.__hash__
+
+
+def test_enum_values_match_by_equality():
+    """Test that severities, categories and statuses match as the list lookup did."""
+    print("\n✓ Testing enum value matching...")
+
+    assert validate_issue_list([_issue("CRITICAL")])['valid']
+    assert not validate_issue_list([_issue("SEVERE")])['valid']
+    assert validate_issue_list([_issue(_Severity.CRITICAL)])['valid'], "str subclass should match"
+    assert validate_issue_list([_issue(_LooseEqual("WARNING"))])['valid'], "Value equal to a member should match"
+
+    # Unhashable values are rejected, not raised
+    result = validate_bottlenecks([_bottleneck(severity=["HIGH"]), _bottleneck(category={"io": 1})])
+    assert not result['checks']['valid_severities']
+    assert not result['checks']['valid_categories']
+
+    compliance = {"tip": {"status": _LooseEqual("pass"), "score": 90, "message": "ok"},
+                  "other": {"status": None, "score": 90, "message": "ok"}}
+    checks = validate_best_practices_compliance(compliance)['checks']
+    assert not checks['valid_statuses'], "None is not a status"
+    del compliance["other"]
+    assert validate_best_practices_compliance(compliance)['checks']['valid_statuses']
+
+    print("  ✓ Matched by equality, unhashables rejected")
+
+    return True
+
+
+def test_fast_fail_same_status():
+    """Test that fast_fail gives the same status as the full scan."""
+    print("\n✓ Testing fast_fail...")
+
+    cases = [
+        (validate_issue_list, _issue, [_issue("SEVERE"), {"severity": "INFO"}, "not a dict"]),
+        (validate_bottlenecks, _bottleneck, [_bottleneck(category="cpu"), {"severity": "LOW"}, 42]),
+        (validate_layout_fixes, _fix, [_fix(fixed=""), {"location": "main.go:1"}, None]),
+    ]
+
+    checked = 0
+    for validate, make, malformed in cases:
+        valid = [make() for _ in range(50)]
+        inputs = [valid, []]
+        for bad in malformed:
+            inputs.append([bad] + valid)                  # malformed entry first
+            inputs.append(valid[:10] + [bad] + valid)     # early
+            inputs.append(valid + [bad])                  # last
+
+        for items in inputs:
+            full = validate(items)
+            fast = validate(items, fast_fail=True)
+            assert fast['status'] == full['status'], (validate.__name__, items[:1])
+            assert fast['valid'] == full['valid']
+            checked += 1
+
+        assert validate(valid, fast_fail=True)['status'] == 'pass'
+        assert validate([malformed[0]] + valid, fast_fail=True)['status'] == 'warning'
+
+    print(f"  ✓ {checked} inputs give the same status")
+
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("="*70)
+    print("UNIT TESTS - validators/common.py")
+    print("="*70)
+
+    tests = [
+        ("Enum value matching", test_enum_values_match_by_equality),
+        ("fast_fail status", test_fast_fail_same_status),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((test_name, passed))
+        except Exception as e:
+            print(f"\n  ❌ FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((test_name, False))
+
+    # Summary
+    print("\n" + "="*70)
+    print("SUMMARY")
+    print("="*70)
+
+    for test_name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status}: {test_name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+
+    print(f"\nResults: {passed_count}/{total_count} passed")
+
+    return passed_count == total_count
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)